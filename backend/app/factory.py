@@ -0,0 +1,111 @@
+#app/factory.py
+
+from flask import Flask
+from flask_cors import CORS
+from dotenv import load_dotenv
+import os
+
+from app.routes.auth_routes import auth_bp
+from app.routes.stock_routes import stock_bp
+from app.routes.sentiment_routes import sentiment_bp
+from app.routes.recommendation_routes import recommendation_bp
+from app.routes.live_stock_routes import live_stock_bp
+from app.routes.admin_routes import admin_bp
+from app.models.db import init_db, create_schema
+from app.utils.cache import StockCache, NotFoundCache, PrincipalCache, RecommendationCache, register_cache_invalidation
+from app.utils.scheduler import start_periodic_job
+from app.utils.db_pool import build_engine_options
+from app.utils.database import build_database_uri
+from app.utils.db_routing import ReplicaRouter, build_replica_binds
+
+# Load environment variables
+load_dotenv()
+
+def create_app():
+    # Keep backend/ as the root and instance path base, as when the app lived in app.py
+    app = Flask(__name__, root_path=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    
+    # Configure database
+    app.config['SQLALCHEMY_DATABASE_URI'] = build_database_uri()
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = build_engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+    app.config['SQLALCHEMY_BINDS'] = build_replica_binds()  # read replicas from DATABASE_REPLICA_URLS
+    app.config['DB_REPLICA_MAX_LAG_SECONDS'] = float(os.environ.get('DB_REPLICA_MAX_LAG_SECONDS', 5))
+    app.config['DB_AUTO_CREATE'] = os.environ.get('DB_AUTO_CREATE', 'false').lower() in ('1', 'true', 'yes')  # create_all at startup
+    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-key-change-in-production')
+    app.config['STOCK_CACHE_MAX_SIZE'] = int(os.environ.get('STOCK_CACHE_MAX_SIZE', 1024))
+    app.config['STOCK_CACHE_TTL_SECONDS'] = float(os.environ.get('STOCK_CACHE_TTL_SECONDS', 15 * 60))
+    app.config['STOCK_CACHE_STALE_SECONDS'] = float(os.environ.get('STOCK_CACHE_STALE_SECONDS', 5 * 60))
+    app.config['STOCK_CACHE_REFRESH_AHEAD_HITS'] = int(os.environ.get('STOCK_CACHE_REFRESH_AHEAD_HITS', 0))
+    app.config['NOT_FOUND_CACHE_TTL_SECONDS'] = float(os.environ.get('NOT_FOUND_CACHE_TTL_SECONDS', 5 * 60))
+    app.config['NOT_FOUND_CACHE_MAX_SIZE'] = int(os.environ.get('NOT_FOUND_CACHE_MAX_SIZE', 4096))
+    app.config['PRINCIPAL_CACHE_TTL_SECONDS'] = float(os.environ.get('PRINCIPAL_CACHE_TTL_SECONDS', 60))  # 0 disables
+    app.config['PRINCIPAL_CACHE_MAX_SIZE'] = int(os.environ.get('PRINCIPAL_CACHE_MAX_SIZE', 1024))
+    app.config['RECOMMENDATION_MAX_WORKERS'] = int(os.environ.get('RECOMMENDATION_MAX_WORKERS', 8))
+    app.config['RECOMMENDATION_STOCK_TIMEOUT'] = float(os.environ.get('RECOMMENDATION_STOCK_TIMEOUT', 15))
+    app.config['RECOMMENDATION_DEADLINE'] = float(os.environ.get('RECOMMENDATION_DEADLINE', 25))
+    app.config['RECOMMENDATION_SNAPSHOT_INTERVAL'] = float(os.environ.get('RECOMMENDATION_SNAPSHOT_INTERVAL', 0))  # 0 disables the in-process job
+    app.config['RECOMMENDATION_SNAPSHOT_MAX_AGE'] = float(os.environ.get('RECOMMENDATION_SNAPSHOT_MAX_AGE', 60 * 60))  # older snapshots trigger a background refresh; 0 disables
+    app.config['RECOMMENDATION_SNAPSHOT_KEEP'] = int(os.environ.get('RECOMMENDATION_SNAPSHOT_KEEP', 3))
+    app.config['RECOMMENDATION_SENTIMENT_SOURCE'] = os.environ.get('RECOMMENDATION_SENTIMENT_SOURCE', 'stored')  # stored or live
+    app.config['RECOMMENDATION_MIN_STORED_SENTIMENT'] = int(os.environ.get('RECOMMENDATION_MIN_STORED_SENTIMENT', 3))
+    app.config['RECOMMENDATION_COMPARE_MAX_BATCH'] = int(os.environ.get('RECOMMENDATION_COMPARE_MAX_BATCH', 50))
+    app.config['RECOMMENDATION_MAX_DAYS'] = int(os.environ.get('RECOMMENDATION_MAX_DAYS', 90))  # upper bound on a requested sentiment window
+    app.config['RECOMMENDATION_FRESH_SECONDS'] = float(os.environ.get('RECOMMENDATION_FRESH_SECONDS', 5 * 60))  # reuse without re-checking inputs
+    app.config['RECOMMENDATION_MAX_REUSE_SECONDS'] = float(os.environ.get('RECOMMENDATION_MAX_REUSE_SECONDS', 60 * 60))  # reuse while the fingerprint matches; 0 disables
+    app.config['RECOMMENDATION_SNAPSHOT_ENGINE'] = os.environ.get('RECOMMENDATION_SNAPSHOT_ENGINE', 'live')  # live or batch
+    app.config['STOCK_CACHE_BACKEND'] = os.environ.get('STOCK_CACHE_BACKEND', 'memory')  # memory, sqlite or redis
+    app.config['STOCK_CACHE_PATH'] = os.environ.get('STOCK_CACHE_PATH')  # sqlite file shared by workers on one host
+    app.config['STOCK_CACHE_URL'] = os.environ.get('STOCK_CACHE_URL')  # redis://host:port/db for multi-node
+    
+    # Initialize database; the schema is managed by migrations (python manage.py db upgrade)
+    init_db(app)
+    if app.config['DB_AUTO_CREATE']:
+        create_schema(app)
+    
+    # Configure stock cache storage and limits
+    StockCache.configure_from_config(app.config)
+    NotFoundCache.configure_from_config(app.config)
+    PrincipalCache.configure_from_config(app.config)
+    RecommendationCache.configure(ttl=app.config['RECOMMENDATION_FRESH_SECONDS'])
+    register_cache_invalidation()
+    ReplicaRouter.configure_from_config(app.config)
+    
+    # Enable CORS
+    CORS(app)
+    
+    # Register blueprints
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(stock_bp, url_prefix='/api/stocks')
+    app.register_blueprint(sentiment_bp, url_prefix='/api/sentiment')
+    app.register_blueprint(recommendation_bp, url_prefix='/api/recommendations')
+    app.register_blueprint(live_stock_bp, url_prefix='/api/live-stocks')
+    app.register_blueprint(admin_bp, url_prefix='/api/admin')
+    
+    # Periodically recompute the ranked recommendation snapshot served by /api/recommendations/top
+    if app.config['RECOMMENDATION_SNAPSHOT_INTERVAL'] > 0:
+        from app.services.recommendation_service import refresh_recommendation_snapshot
+        start_periodic_job(app, 'recommendation-snapshot', app.config['RECOMMENDATION_SNAPSHOT_INTERVAL'],
+                           refresh_recommendation_snapshot)
+    
+    @app.cli.command('create-schema')
+    def create_schema_command():
+        """Create any missing tables; run before `db upgrade` on a new database"""
+        create_schema(app)
+    
+    @app.route('/')
+    def home():
+        return {'message': 'Welcome to Stock Sentiment Analysis API'}
+    
+    @app.route('/debug/routes')
+    def list_routes():
+        routes = []
+        for rule in app.url_map.iter_rules():
+            routes.append({
+                "endpoint": rule.endpoint,
+                "methods": list(rule.methods),
+                "path": str(rule)
+            })
+        return {"routes": routes}
+    
+    return app
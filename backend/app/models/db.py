@@ -1,14 +1,14 @@
 #app/models/db.py
 
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
+from app.utils.db_routing import RoutingSession
 
-db = SQLAlchemy()
+# Reads in read_replica handlers may go to SQLALCHEMY_BINDS replicas
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 def init_db(app):
     """Initialize the database with the Flask app"""
     db.init_app(app)
-    Migrate(app, db)
     
     # Import models to ensure they're registered with SQLAlchemy
     from app.models.user import User
@@ -16,7 +16,49 @@ def init_db(app):
     from app.models.sentiment import SentimentData
     from app.models.recommendation import Recommendation
     from app.models.notification import Notification
+    from app.models.recommendation_snapshot import RecommendationSnapshot
     
-    # Create tables if they don't exist
+    # Publish change events for writes that derived caches depend on
+    register_change_events()
+
+def init_migrations(app):
+    """Attach Flask-Migrate for the `db` CLI commands (alembic is too slow to import in web workers)"""
+    from flask_migrate import Migrate
+    Migrate(app, db)
+
+def create_schema(app):
+    """Create any missing tables (new or local databases; existing ones are upgraded by migrations)"""
     with app.app_context():
-        db.create_all() 
\ No newline at end of file
+        db.create_all(bind_key=None)  # Primary only; replicas get the schema through replication
+
+def register_change_events():
+    """Publish stock, sentiment, recommendation and user writes on the in-process event bus"""
+    from app.utils import events
+    from app.models.user import User
+    from app.models.stock import Stock
+    from app.models.sentiment import SentimentData
+    from app.models.recommendation import Recommendation
+    
+    events.track_model(
+        Stock,
+        created=events.STOCK_CREATED,
+        updated=events.STOCK_UPDATED,
+        deleted=events.STOCK_DELETED,
+        payload=lambda stock: {'id': stock.id, 'symbol': stock.symbol}
+    )
+    events.track_model(
+        SentimentData,
+        created=events.SENTIMENT_INSERTED,
+        payload=lambda record: {'id': record.id, 'stock_id': record.stock_id, 'symbol': record.stock_symbol}
+    )
+    events.track_model(
+        Recommendation,
+        created=events.RECOMMENDATION_CREATED,
+        payload=lambda rec: {'id': rec.id, 'stock_id': rec.stock_id, 'type': rec.type, 'created_at': rec.created_at}
+    )
+    events.track_model(
+        User,
+        updated=events.USER_UPDATED,
+        deleted=events.USER_DELETED,
+        payload=lambda user: {'id': user.id}
+    )
@@ -3,9 +3,14 @@
 
 from app.models.db import db
 from datetime import datetime
+import json
 
 class Recommendation(db.Model):
     __tablename__ = 'recommendations'
+    __table_args__ = (
+        # Latest recommendation per stock and per-stock history windows
+        db.Index('ix_recommendations_stock_id_created_at', 'stock_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     stock_id = db.Column(db.Integer, db.ForeignKey('stocks.id'), nullable=False)
@@ -14,6 +19,8 @@ class Recommendation(db.Model):
     reason = db.Column(db.Text, nullable=False)
     price_target = db.Column(db.Float)
     time_frame = db.Column(db.String(50))  # short-term, medium-term, long-term
+    input_fingerprint = db.Column(db.String(40))  # sha1 of the sentiment row ids, stock price, last bar date and trading date it was computed from
+    details = db.Column(db.Text)  # JSON: sentiment_data and price_data it was computed from
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def to_dict(self):
@@ -26,4 +33,8 @@ class Recommendation(db.Model):
             'price_target': self.price_target,
             'time_frame': self.time_frame,
             'created_at': self.created_at.isoformat()
-        } 
\ No newline at end of file
+        }
+    
+    def details_dict(self):
+        """The sentiment and price inputs behind this recommendation, or None for rows stored without them"""
+        return json.loads(self.details) if self.details else None 
\ No newline at end of file
@@ -0,0 +1,38 @@
+#app/models/recommendation_snapshot.py
+
+from app.models.db import db
+from datetime import datetime
+import json
+
+class RecommendationSnapshot(db.Model):
+    """One row per stock of a precomputed, ranked recommendation run"""
+    __tablename__ = 'recommendation_snapshots'
+    __table_args__ = (
+        db.Index('ix_recommendation_snapshots_computed_at_rank', 'computed_at', 'rank'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    computed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # shared by every row of a run
+    rank = db.Column(db.Integer, nullable=False)  # 1 = best
+    stock_id = db.Column(db.Integer, db.ForeignKey('stocks.id'), nullable=False)
+    type = db.Column(db.String(20), nullable=False)  # buy, sell, hold
+    confidence_score = db.Column(db.Float, nullable=False)
+    reason = db.Column(db.Text, nullable=False)
+    price_target = db.Column(db.Float)
+    time_frame = db.Column(db.String(50))
+    inputs = db.Column(db.Text)  # JSON: sentiment_data and price_data used for the recommendation
+    
+    def to_dict(self):
+        inputs = json.loads(self.inputs) if self.inputs else {}
+        return {
+            'stock_id': self.stock_id,
+            'rank': self.rank,
+            'type': self.type,
+            'confidence_score': self.confidence_score,
+            'reason': self.reason,
+            'price_target': self.price_target,
+            'time_frame': self.time_frame,
+            'sentiment_data': inputs.get('sentiment_data'),
+            'price_data': inputs.get('price_data'),
+            'computed_at': self.computed_at.isoformat()
+        }
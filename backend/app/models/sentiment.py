@@ -5,6 +5,13 @@ from datetime import datetime
 
 class SentimentData(db.Model):
     __tablename__ = 'sentiment_data'
+    __table_args__ = (
+        # Per-symbol time windows (sentiment list, aggregate, stored recommendation inputs)
+        db.Index('ix_sentiment_data_symbol_created_at', 'stock_symbol', 'created_at'),
+        db.Index('ix_sentiment_data_symbol_source_created_at', 'stock_symbol', 'source', 'created_at'),
+        # Duplicate check when saving scraped headlines
+        db.Index('ix_sentiment_data_stock_title_url', 'stock_id', 'title', 'url'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     stock_id = db.Column(db.Integer, db.ForeignKey('stocks.id'), nullable=False)
@@ -1,6 +1,8 @@
 #app/models/stock.py
 
 from app.models.db import db
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
 from datetime import datetime
 
 # User-Stock association table for watchlist
@@ -19,7 +21,9 @@ class Stock(db.Model):
     sector = db.Column(db.String(100))
     current_price = db.Column(db.Float)
     previous_close = db.Column(db.Float)
-    last_updated = db.Column(db.DateTime, default=datetime.utcnow)
+    last_updated = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Bumped on every update; ETags use it because DATETIME only has one-second precision on MySQL
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
     # Relationships
     sentiment_data = db.relationship('SentimentData', backref='stock', lazy=True)
@@ -34,4 +38,11 @@ class Stock(db.Model):
             'current_price': self.current_price,
             'previous_close': self.previous_close,
             'last_updated': self.last_updated.isoformat() if self.last_updated else None
-        } 
\ No newline at end of file
+        }
+
+@event.listens_for(Stock, 'before_update')
+def _bump_version(mapper, connection, target):
+    # Incremented inside the UPDATE itself, so concurrent writers never reuse a version.
+    # Watchlist changes only touch the user_stocks collection and leave the row alone.
+    if object_session(target).is_modified(target, include_collections=False):
+        target.version = Stock.version + 1
@@ -0,0 +1,33 @@
+#app/routes/admin_routes.py
+
+from flask import Blueprint, jsonify
+from app.utils.auth import token_required, admin_required
+from app.models.db import db
+from app.utils.cache import StockCache, NotFoundCache, PrincipalCache, RecommendationCache
+from app.utils.db_pool import engine_pool_snapshots
+from app.utils.db_routing import ReplicaRouter
+
+admin_bp = Blueprint('admin', __name__)
+
+@admin_bp.route('/cache/stats', methods=['GET'])
+@token_required
+@admin_required
+def get_cache_stats(current_user):
+    """Get stock cache hit/miss/eviction counters (admin only)"""
+    return jsonify({
+        'stock_cache': StockCache.stats(),
+        'not_found_cache': NotFoundCache.stats(),
+        'principal_cache': PrincipalCache.stats(),
+        'recommendation_cache': RecommendationCache.stats()
+    }), 200
+
+
+@admin_bp.route('/db/pool', methods=['GET'])
+@token_required
+@admin_required
+def get_db_pool_stats(current_user):
+    """Get connection pool usage and checkout latency per engine, and replica routing, for this worker process (admin only)"""
+    return jsonify({
+        'pools': engine_pool_snapshots(db.engines),
+        'replication': ReplicaRouter.stats(db.engines)
+    }), 200
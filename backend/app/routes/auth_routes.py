@@ -87,6 +87,7 @@ def get_profile(current_user):
 @token_required
 def update_profile(current_user):
     data = request.get_json()
+    user = User.query.get(current_user.id)  # current_user is a read-only snapshot
     
     # Update fields if provided
     if 'username' in data:
@@ -94,7 +95,7 @@ def update_profile(current_user):
         existing_user = User.query.filter_by(username=data['username']).first()
         if existing_user and existing_user.id != current_user.id:
             return jsonify({'error': 'Username already taken'}), 409
-        current_user.username = data['username']
+        user.username = data['username']
     
     if 'email' in data:
         # Check if email is valid
@@ -106,14 +107,14 @@ def update_profile(current_user):
         existing_user = User.query.filter_by(email=data['email']).first()
         if existing_user and existing_user.id != current_user.id:
             return jsonify({'error': 'Email already registered'}), 409
-        current_user.email = data['email']
+        user.email = data['email']
     
     if 'password' in data:
-        current_user.password = data['password']
+        user.password = data['password']
     
     db.session.commit()
     
     return jsonify({
         'message': 'Profile updated successfully',
-        'user': current_user.to_dict()
+        'user': user.to_dict()
     }), 200 
\ No newline at end of file
@@ -2,8 +2,10 @@
 
 from flask import Blueprint, request, jsonify
 from app.utils.auth import token_required
-import yfinance as yf
 from app.models.db import db
+from app.services.market_data import get_provider
+from app.services.stock_service import remember_if_not_found
+from app.utils.cache import NotFoundCache
 
 import logging
 
@@ -15,11 +17,14 @@ live_stock_bp = Blueprint('live_stocks', __name__)
 
 def fetch_stock_from_internet(symbol):
     """Fetch stock data from Yahoo Finance"""
+    if NotFoundCache.contains(symbol):
+        return None  # Recently confirmed as unknown
+    
     try:
-        stock = yf.Ticker(symbol)
-        info = stock.info
+        info = get_provider().info(symbol)
 
         if 'shortName' not in info:
+            remember_if_not_found(symbol)
             return None  # Stock not found or invalid
         
         return {
@@ -109,19 +114,7 @@ def get_live_stock_history(current_user, symbol):
     symbol = symbol.upper()
 
     try:
-        stock = yf.Ticker(symbol)
-        hist = stock.history(period='1mo')  # Default 1 month history
-
-        history = []
-        for date, row in hist.iterrows():
-            history.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'open': row['Open'],
-                'high': row['High'],
-                'low': row['Low'],
-                'close': row['Close'],
-                'volume': int(row['Volume']),
-            })
+        history = get_provider().history(symbol, period='1mo')  # Default 1 month history
 
         return jsonify({
             'symbol': symbol,
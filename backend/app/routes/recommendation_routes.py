@@ -1,16 +1,59 @@
 #app/routes/recommendation_routes.py
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from app.models.db import db
 from app.models.stock import Stock
 from app.models.recommendation import Recommendation
 from app.models.user import User
-from app.services.recommendation_service import generate_recommendation, get_top_recommendations
+from app.services.recommendation_service import (
+    get_or_create_recommendation, recommendation_entry, refresh_recommendation_snapshot, get_latest_snapshot,
+    refresh_snapshot_in_background, iter_recommendations, iter_compare_recommendations, rank_recommendations,
+    summarize_coverage
+)
 from app.utils.auth import token_required, admin_required, analyst_required
+from app.utils.http_cache import make_etag, not_modified, with_validators
+from app.utils.streaming import STREAM_FORMATS, stream_events
+from app.utils.db_routing import read_replica, use_primary
 from datetime import datetime, timedelta
+import time
 
 recommendation_bp = Blueprint('recommendations', __name__)
 
+def _ranking_event(entries, coverage):
+    """Final streamed event: the ranked ordering of everything emitted before it"""
+    ranked = rank_recommendations([entry['recommendation'] for entry in entries])
+    symbols = {entry['stock']['id']: entry['stock']['symbol'] for entry in entries}
+    return 'ranking', {
+        'ranking': [
+            {
+                'rank': rank,
+                'stock_id': rec['stock_id'],
+                'symbol': symbols.get(rec['stock_id']),
+                'type': rec['type'],
+                'confidence_score': rec['confidence_score']
+            }
+            for rank, rec in enumerate(ranked, start=1)
+        ],
+        'coverage': coverage
+    }
+
+def _stream_top_recommendations(limit, days):
+    """Evaluate every stock live and emit each result as soon as its worker finishes"""
+    started = time.monotonic()
+    stocks = {stock.id: stock for stock in Stock.query.all()}
+    entries = []
+    statuses = []
+    
+    for stock_id, rec, status in iter_recommendations(list(stocks), days=days):
+        statuses.append(status)
+        entry = {'stock': stocks[stock_id].to_dict(), 'recommendation': rec, 'status': status}
+        if rec:
+            entries.append(entry)
+        yield 'recommendation', entry
+    
+    event_name, data = _ranking_event(entries, summarize_coverage(statuses, len(stocks), started))
+    data['ranking'] = data['ranking'][:limit]
+    yield event_name, data
 
 
 @recommendation_bp.route('/stock/<string:symbol>', methods=['GET'])
@@ -22,74 +65,115 @@ def fetch_stock_recommendation_by_symbol(current_user, symbol):
         return jsonify({'error': f'Stock with symbol {symbol} not found'}), 404
 
     days = request.args.get('days', default=7, type=int)
-    from_date = datetime.utcnow() - timedelta(days=1)
+    source = request.args.get('source')  # stored (default) or live
+    if source not in (None, 'stored', 'live'):
+        return jsonify({'error': 'source must be stored or live'}), 400
 
-    recent_recommendation = Recommendation.query.filter_by(
-        stock_id=stock.id
-    ).filter(
-        Recommendation.created_at >= from_date
-    ).order_by(
-        Recommendation.created_at.desc()
-    ).first()
+    # Reuse the latest stored recommendation while it is fresh or its inputs are unchanged
+    recommendation, reused = get_or_create_recommendation(stock, days=days, source=source)
 
-    if recent_recommendation:
-        return jsonify({
-            'stock': stock.to_dict(),
-            'recommendation': recent_recommendation.to_dict(),
-            'is_cached': True
-        }), 200
-
-    recommendation_data = generate_recommendation(stock.id, days=days)
-
-    if not recommendation_data:
+    if not recommendation:
         return jsonify({'error': 'Failed to generate recommendation'}), 500
 
-    new_recommendation = Recommendation(
-        stock_id=stock.id,
-        type=recommendation_data['type'],
-        confidence_score=recommendation_data['confidence_score'],
-        reason=recommendation_data['reason'],
-        price_target=recommendation_data.get('price_target'),
-        time_frame=recommendation_data.get('time_frame', 'short-term')
-    )
+    return jsonify(recommendation_entry(stock.to_dict(), recommendation, reused)), 200
 
-    db.session.add(new_recommendation)
-    db.session.commit()
+def _load_snapshot(limit, refresh=False):
+    """
+    Read the top of the latest snapshot, recomputing it when forced or before the first one exists
+    
+    Returns:
+        tuple: ((RecommendationSnapshot, Stock) rows, coverage dict or None if nothing was recomputed)
+    """
+    coverage = None
+    try:
+        rows = [] if refresh else get_latest_snapshot(limit=limit)
+        
+        # A lagging replica may not have the first snapshot yet
+        if not rows and not refresh:
+            use_primary()
+            rows = get_latest_snapshot(limit=limit)
+        
+        # Compute synchronously when forced by an admin or before the first snapshot exists
+        if not rows:
+            _, coverage = refresh_recommendation_snapshot()
+            rows = get_latest_snapshot(limit=limit)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error getting top recommendations: {str(e)}")
+        rows = []
+    return rows, coverage
 
-    return jsonify({
-        'stock': stock.to_dict(),
-        'recommendation': new_recommendation.to_dict(),
-        'details': recommendation_data,
-        'is_cached': False
-    }), 200
+def _snapshot_info(rows, coverage):
+    """Snapshot age, and whether it is past RECOMMENDATION_SNAPSHOT_MAX_AGE and being recomputed"""
+    computed_at = rows[0][0].computed_at
+    age = (datetime.utcnow() - computed_at).total_seconds()
+    max_age = current_app.config.get('RECOMMENDATION_SNAPSHOT_MAX_AGE', 0)
+    stale = bool(max_age) and age > max_age
+    return {
+        'computed_at': computed_at.isoformat(),
+        'age_seconds': round(age, 1),
+        'refreshed': coverage is not None,
+        'stale': stale,
+        # Serve the stale rows now; one background refresh per process brings them up to date
+        'refreshing': stale and refresh_snapshot_in_background()
+    }
+
+def _stream_snapshot(rows, coverage):
+    """Emit snapshot rows in the same events as a live stream, followed by the stored ranking"""
+    entries = []
+    for snapshot, stock in rows:
+        entry = {'stock': stock.to_dict(), 'recommendation': snapshot.to_dict(), 'status': 'completed'}
+        entries.append(entry)
+        yield 'recommendation', entry
+    
+    event_name, data = _ranking_event(entries, coverage)
+    data['snapshot'] = _snapshot_info(rows, coverage)
+    yield event_name, data
 
 @recommendation_bp.route('/top', methods=['GET'])
 @token_required
+@read_replica
 def get_top_stock_recommendations(current_user):
-    """Get top stock recommendations"""
+    """Get top stock recommendations from the latest precomputed snapshot"""
     limit = request.args.get('limit', default=5, type=int)
+    refresh = request.args.get('refresh', default='false').lower() in ('1', 'true', 'yes')
+    stream_format = request.args.get('stream')
     
-    top_recommendations = get_top_recommendations(limit=limit, user_id=current_user.id)
+    if stream_format and stream_format not in STREAM_FORMATS:
+        return jsonify({'error': f"stream must be one of {', '.join(STREAM_FORMATS)}"}), 400
     
-    if not top_recommendations:
-        return jsonify({'error': 'Failed to generate top recommendations'}), 500
+    # Recomputing evaluates every stock, so only admins may force it, streamed or not
+    if refresh and current_user.role != 'admin':
+        return jsonify({'error': 'Admin privileges required to force a recompute'}), 403
     
-    recommendations_with_stocks = []
+    # A forced stream evaluates live, emitting each stock as it completes
+    if stream_format and refresh:
+        return stream_events(_stream_top_recommendations(limit, request.args.get('days', default=7, type=int)),
+                             stream_format)
     
-    for rec in top_recommendations:
-        stock = Stock.query.get(rec['stock_id'])
-        if stock:
-            recommendations_with_stocks.append({
-                'stock': stock.to_dict(),
-                'recommendation': rec
-            })
+    rows, coverage = _load_snapshot(limit, refresh=refresh)
+    
+    if not rows:
+        return jsonify({'error': 'Failed to generate top recommendations'}), 500
+    
+    if stream_format:
+        return stream_events(_stream_snapshot(rows, coverage), stream_format)
     
     return jsonify({
-        'top_recommendations': recommendations_with_stocks
+        'top_recommendations': [
+            {
+                'stock': stock.to_dict(),
+                'recommendation': snapshot.to_dict()
+            }
+            for snapshot, stock in rows
+        ],
+        'snapshot': _snapshot_info(rows, coverage),
+        'coverage': coverage
     }), 200
 
 @recommendation_bp.route('/history/<int:stock_id>', methods=['GET'])
 @token_required
+@read_replica
 def get_recommendation_history(current_user, stock_id):
     """Get recommendation history for a stock"""
     stock = Stock.query.get_or_404(stock_id)
@@ -122,24 +206,55 @@ def compare_stock_recommendations(current_user):
     
     stock_ids = data['stock_ids']
     days = data.get('days', 7)
+    source = data.get('source')  # stored (default) or live
     
     if not stock_ids or not isinstance(stock_ids, list):
         return jsonify({'error': 'Invalid stock IDs format'}), 400
     
-    recommendations = []
+    # bool is an int subclass, but true/false are not stock IDs
+    if not all(isinstance(stock_id, int) and not isinstance(stock_id, bool) for stock_id in stock_ids):
+        return jsonify({'error': 'Stock IDs must be integers'}), 400
     
-    for stock_id in stock_ids:
-        stock = Stock.query.get(stock_id)
-        if not stock:
-            continue
-        
-        recommendation_data = generate_recommendation(stock_id, days=days)
+    max_days = current_app.config.get('RECOMMENDATION_MAX_DAYS', 90)
+    if not isinstance(days, int) or isinstance(days, bool) or not 1 <= days <= max_days:
+        return jsonify({'error': f'days must be an integer between 1 and {max_days}'}), 400
+    
+    if source not in (None, 'stored', 'live'):
+        return jsonify({'error': 'source must be stored or live'}), 400
+    
+    stream_format = request.args.get('stream')
+    if stream_format and stream_format not in STREAM_FORMATS:
+        return jsonify({'error': f"stream must be one of {', '.join(STREAM_FORMATS)}"}), 400
+    
+    # Each stock is evaluated once, however often it was requested
+    stock_ids = list(dict.fromkeys(stock_ids))
+    max_batch = current_app.config.get('RECOMMENDATION_COMPARE_MAX_BATCH', 50)
+    if len(stock_ids) > max_batch:
+        return jsonify({'error': f'At most {max_batch} stocks can be compared at once'}), 400
+    
+    stocks = Stock.query.filter(Stock.id.in_(stock_ids)).all()
+    started = time.monotonic()
+    results = iter_compare_recommendations(stocks, days=days, source=source)
+    
+    if stream_format:
+        def events():
+            entries = []
+            statuses = ['failed'] * (len(stock_ids) - len(stocks))  # Unknown ids
+            for stock_id, entry, status in results:
+                statuses.append(status)
+                if entry:
+                    entries.append(entry)
+                yield 'recommendation', entry or {'stock_id': stock_id, 'recommendation': None, 'status': status}
+            yield _ranking_event(entries, summarize_coverage(statuses, len(stock_ids), started))
         
-        if recommendation_data:
-            recommendations.append({
-                'stock': stock.to_dict(),
-                'recommendation': recommendation_data
-            })
+        return stream_events(events(), stream_format)
+    
+    recommendations = []
+    statuses = ['failed'] * (len(stock_ids) - len(stocks))
+    for _, entry, status in results:
+        statuses.append(status)
+        if entry:
+            recommendations.append(entry)
     
     if not recommendations:
         return jsonify({'error': 'Failed to generate recommendations for the specified stocks'}), 500
@@ -150,34 +265,65 @@ def compare_stock_recommendations(current_user):
     ), reverse=True)
     
     return jsonify({
-        'recommendations': recommendations
+        'recommendations': recommendations,
+        'coverage': summarize_coverage(statuses, len(stock_ids), started)
     }), 200
 
 @recommendation_bp.route('/', methods=['GET'])
 @token_required
+@read_replica
 def get_all_recommendations(current_user):
     """Get recent recommendations for all stocks"""
     days = request.args.get('days', default=1, type=int)
     from_date = datetime.utcnow() - timedelta(days=days)
     
-    stocks = Stock.query.all()
-    recommendations = []
+    # Validators cover both the recommendations in the window and the embedded stock rows
+    rec_count, rec_modified, rec_max_id = db.session.query(
+        db.func.count(Recommendation.id), db.func.max(Recommendation.created_at), db.func.max(Recommendation.id)
+    ).filter(
+        Recommendation.created_at >= from_date
+    ).one()
+    stock_count, stock_id_sum, stock_version_sum = db.session.query(
+        db.func.count(Stock.id), db.func.sum(Stock.id), db.func.sum(Stock.version)
+    ).one()
+    # ETag only: rows leaving the window or deleted stocks never advance a max(timestamp).
+    # Recommendations are insert-only, so max(id) catches new rows within the same second.
+    etag = make_etag('recommendations', days, rec_count, rec_modified, rec_max_id,
+                     stock_count, stock_id_sum, stock_version_sum)
     
-    for stock in stocks:
-        recent_recommendation = Recommendation.query.filter_by(
-            stock_id=stock.id
-        ).filter(
-            Recommendation.created_at >= from_date
-        ).order_by(
-            Recommendation.created_at.desc()
-        ).first()
-        
-        if recent_recommendation:
-            recommendations.append({
-                'stock': stock.to_dict(),
-                'recommendation': recent_recommendation.to_dict()
-            })
+    cached_response = not_modified(etag)
+    if cached_response:
+        return cached_response
     
-    return jsonify({
+    # Latest recommendation per stock in the window, joined with its stock, in one query.
+    # row_number() needs window functions: MySQL 8.0+ or SQLite 3.25+.
+    latest = db.session.query(
+        Recommendation.id.label('id'),
+        db.func.row_number().over(
+            partition_by=Recommendation.stock_id,
+            order_by=(Recommendation.created_at.desc(), Recommendation.id.desc())
+        ).label('row_number')
+    ).filter(
+        Recommendation.created_at >= from_date
+    ).subquery()
+    
+    rows = db.session.query(Recommendation, Stock).join(
+        latest, db.and_(latest.c.id == Recommendation.id, latest.c.row_number == 1)
+    ).join(
+        Stock, Stock.id == Recommendation.stock_id
+    ).order_by(
+        Stock.id
+    ).all()
+    
+    recommendations = [
+        {
+            'stock': stock.to_dict(),
+            'recommendation': recommendation.to_dict()
+        }
+        for recommendation, stock in rows
+    ]
+    
+    response = jsonify({
         'recommendations': recommendations
-    }), 200
+    })
+    return with_validators(response, etag), 200
@@ -5,6 +5,8 @@ from app.models.db import db
 from app.models.sentiment import SentimentData
 from app.services.sentiment_service import analyze_text, scrape_news, aggregate_sentiment
 from app.utils.auth import token_required
+from app.utils.http_cache import make_etag, not_modified, with_validators
+from app.utils.db_routing import read_replica
 from datetime import datetime, timedelta
 
 sentiment_bp = Blueprint('sentiment', __name__)
@@ -31,28 +33,44 @@ def analyze_sentiment(current_user):
 
 @sentiment_bp.route('/stock/<string:symbol>', methods=['GET'])
 @token_required
+@read_replica
 def get_stock_sentiment(current_user, symbol):
     """Get sentiment data for a specific stock symbol"""
     symbol = symbol.upper()
     days = request.args.get('days', default=7, type=int)
     from_date = datetime.utcnow() - timedelta(days=days)
     
-    sentiment_records = SentimentData.query.filter_by(
+    query = SentimentData.query.filter_by(
         stock_symbol=symbol
     ).filter(
         SentimentData.created_at >= from_date
-    ).order_by(
+    )
+    
+    # Rows are insert-only, so count plus newest row identifies the window's contents.
+    # No Last-Modified: rows dropping out of the window never advance max(created_at).
+    count, last_modified, max_id = query.with_entities(
+        db.func.count(SentimentData.id), db.func.max(SentimentData.created_at), db.func.max(SentimentData.id)
+    ).one()
+    etag = make_etag('sentiment', symbol, days, count, last_modified, max_id)
+    
+    cached_response = not_modified(etag)
+    if cached_response:
+        return cached_response
+    
+    sentiment_records = query.order_by(
         SentimentData.created_at.desc()
     ).all()
     
-    return jsonify({
+    response = jsonify({
         'symbol': symbol,
         'sentiment_data': [record.to_dict() for record in sentiment_records],
         'data_points': len(sentiment_records)
-    }), 200
+    })
+    return with_validators(response, etag), 200
 
 @sentiment_bp.route('/stock/<string:symbol>/aggregate', methods=['GET'])
 @token_required
+@read_replica
 def get_aggregate_sentiment(current_user, symbol):
     """Get aggregated sentiment data for a specific stock symbol"""
     symbol = symbol.upper()
@@ -129,6 +147,7 @@ def get_live_sentiment(current_user, symbol):
 
 @sentiment_bp.route('/stock/<string:symbol>/sources/<source>', methods=['GET'])
 @token_required
+@read_replica
 def get_sentiment_by_source(current_user, symbol, source):
     """Get sentiment data for a specific stock symbol from a specific source"""
     symbol = symbol.upper()
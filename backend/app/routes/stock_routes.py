@@ -7,11 +7,21 @@ from app.models.stock import Stock, user_stocks
 from app.models.user import User
 from app.utils.auth import token_required, admin_required
 from app.services.stock_service import fetch_stock_data
-from app.utils.cache import StockCache
+from app.utils.cache import StockCache, NotFoundCache
+from app.utils.http_cache import make_etag, not_modified, with_validators
+from app.utils.database import insert_ignore
+from app.utils.db_routing import read_replica
+from datetime import datetime
 
 stock_bp = Blueprint('stocks', __name__)
 
+def load_stock_dict(symbol):
+    """Load a stock from the database as a dict, or None if it does not exist"""
+    stock = Stock.query.filter_by(symbol=symbol).first()
+    return stock.to_dict() if stock else None
+
 @stock_bp.route('/', methods=['GET'])
+@read_replica
 def get_stocks():
     """Get all stocks or filter by sector or symbol"""
     sector = request.args.get('sector')
@@ -25,20 +35,39 @@ def get_stocks():
     if symbol:
         query = query.filter(Stock.symbol.ilike(f'%{symbol}%'))
     
+    # Cheap validators: inserts and deletes change the count or id sum, updates the version sum.
+    # No Last-Modified: deleting a row never advances max(last_updated).
+    count, id_sum, version_sum = query.with_entities(
+        db.func.count(Stock.id), db.func.sum(Stock.id), db.func.sum(Stock.version)
+    ).one()
+    etag = make_etag('stocks', count, id_sum, version_sum, sector, symbol)
+    
+    cached_response = not_modified(etag)
+    if cached_response:
+        return cached_response
+    
     stocks = query.all()
     
-    return jsonify({
+    response = jsonify({
         'stocks': [stock.to_dict() for stock in stocks]
-    }), 200
+    })
+    return with_validators(response, etag), 200
 
 @stock_bp.route('/<int:stock_id>', methods=['GET'])
+@read_replica
 def get_stock(stock_id):
     """Get a specific stock by ID"""
     stock = Stock.query.get_or_404(stock_id)
     
-    return jsonify({
+    etag = make_etag('stock', stock.id, stock.version)
+    cached_response = not_modified(etag, stock.last_updated)
+    if cached_response:
+        return cached_response
+    
+    response = jsonify({
         'stock': stock.to_dict()
-    }), 200
+    })
+    return with_validators(response, etag, stock.last_updated), 200
 
 @stock_bp.route('/', methods=['POST'])
 @token_required
@@ -56,6 +85,10 @@ def add_stock(current_user):
     if existing_stock:
         return jsonify({'error': 'Stock with this symbol already exists'}), 409
     
+    # The symbol may have been cached as unknown before the admin added it. With
+    # the memory backend this only reaches this worker; see NotFoundCache.
+    NotFoundCache.clear(data['symbol'])
+    
     # Create new stock
     new_stock = Stock(
         symbol=data['symbol'].upper(),
@@ -65,7 +98,7 @@ def add_stock(current_user):
     
     # Try to fetch current price data
     try:
-        stock_data = fetch_stock_data(data['symbol'])
+        stock_data = fetch_stock_data(data['symbol'], fields='quote')
         if stock_data:
             new_stock.current_price = stock_data.get('current_price')
             new_stock.previous_close = stock_data.get('previous_close')
@@ -130,7 +163,7 @@ def refresh_stock_data(current_user, stock_id):
     stock = Stock.query.get_or_404(stock_id)
     
     try:
-        stock_data = fetch_stock_data(stock.symbol)
+        stock_data = fetch_stock_data(stock.symbol, fields='quote')
         if stock_data:
             stock.current_price = stock_data.get('current_price')
             stock.previous_close = stock_data.get('previous_close')
@@ -149,6 +182,7 @@ def refresh_stock_data(current_user, stock_id):
 # User watchlist routes
 @stock_bp.route('/watchlist', methods=['GET'])
 @token_required
+@read_replica
 def get_watchlist(current_user):
     """Get current user's watchlist"""
     user = User.query.get(current_user.id)
@@ -169,22 +203,17 @@ def add_to_watchlist(current_user, stock_id):
     # Check if stock exists
     stock = Stock.query.get_or_404(stock_id)
     
-    # Check if already in watchlist
-    is_in_watchlist = db.session.query(user_stocks).filter_by(
-        user_id=current_user.id, stock_id=stock_id
-    ).first() is not None
+    # Add to watchlist; the primary key rejects duplicates atomically
+    inserted = insert_ignore(db.session, user_stocks, {
+        'user_id': current_user.id,
+        'stock_id': stock_id,
+        'added_at': datetime.utcnow()
+    })
+    db.session.commit()
     
-    if is_in_watchlist:
+    if not inserted:
         return jsonify({'error': 'Stock already in watchlist'}), 409
     
-    # Add to watchlist
-    stmt = user_stocks.insert().values(
-        user_id=current_user.id,
-        stock_id=stock_id
-    )
-    db.session.execute(stmt)
-    db.session.commit()
-    
     return jsonify({
         'message': 'Stock added to watchlist successfully'
     }), 201
@@ -225,24 +254,13 @@ def search_stock(current_user):
     
     symbol = data['symbol'].upper()
     
-    # Try to get from cache first (fast)
-    cached_stock = StockCache.get(symbol)
-    if cached_stock:
-        return jsonify({
-            'stock': cached_stock,
-            'source': 'cache'
-        }), 200
-    
-    # Next, try to find the stock in our database
-    stock = Stock.query.filter_by(symbol=symbol).first()
-    
-    if stock:
-        # Cache the stock data for future requests
-        stock_dict = stock.to_dict()
-        StockCache.set(symbol, stock_dict)
+    # Try the cache first, falling back to our database. Stale entries are
+    # served immediately while a single background refresh reloads them.
+    stock_dict, from_cache = StockCache.get_or_load(symbol, lambda: load_stock_dict(symbol))
+    if stock_dict:
         return jsonify({
             'stock': stock_dict,
-            'source': 'database'
+            'source': 'cache' if from_cache else 'database'
         }), 200
     
     # Stock not found in database, fetch from Yahoo Finance
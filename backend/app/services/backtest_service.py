@@ -0,0 +1,316 @@
+#app/services/backtest_service.py
+
+import csv
+import glob
+import json
+import logging
+import os
+import numpy as np
+from app.services.recommendation_engine import BRANCH_NAMES, BRANCH_TYPES, classify
+
+logger = logging.getLogger(__name__)
+
+DAY_SECONDS = 86400
+SYMBOL_STRIDE = 10 ** 11  # Separates symbols in the combined (symbol, timestamp) sort key
+
+def load_price_csv_dir(directory):
+    """
+    Load daily OHLCV bars from one CSV per symbol (e.g. AAPL.csv as exported by yfinance)
+
+    Column names are matched case-insensitively: Date, Open, High, Low, Close, Volume.
+
+    Returns:
+        dict: symbol -> list of bars sorted by date
+    """
+    bars_by_symbol = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.csv'))):
+        symbol = os.path.splitext(os.path.basename(path))[0].upper()
+        bars = []
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                row = {key.strip().lower(): value for key, value in row.items() if key}
+                try:
+                    bars.append({
+                        'date': row['date'][:10],
+                        'open': float(row['open']),
+                        'close': float(row['close'])
+                    })
+                except (KeyError, ValueError):
+                    continue
+        if bars:
+            bars_by_symbol[symbol] = sorted(bars, key=lambda bar: bar['date'])
+    return bars_by_symbol
+
+def load_price_recordings(directory):
+    """
+    Load daily bars from market data recordings (see RecordingProvider)
+
+    When a symbol has several history recordings, the longest one is used.
+
+    Returns:
+        dict: symbol -> list of bars sorted by date
+    """
+    bars_by_symbol = {}
+    for path in glob.glob(os.path.join(directory, 'history__*.json')):
+        with open(path) as f:
+            payload = json.load(f)
+        bars = [bar for bar in payload.get('response') or [] if bar.get('close') is not None]
+        symbol = payload['symbol']
+        if len(bars) > len(bars_by_symbol.get(symbol, [])):
+            bars_by_symbol[symbol] = sorted(bars, key=lambda bar: bar['date'])
+    return bars_by_symbol
+
+def load_price_history(directory):
+    """Load bars from a CSV directory, falling back to market data recordings"""
+    bars_by_symbol = load_price_csv_dir(directory)
+    return bars_by_symbol or load_price_recordings(directory)
+
+def build_price_grid(bars_by_symbol):
+    """
+    Align bars on a shared date axis
+
+    Returns:
+        tuple: (dates as datetime64[D] array, symbols, open and close arrays of
+        shape (len(dates), len(symbols)), NaN where a symbol has no bar)
+    """
+    symbols = sorted(bars_by_symbol)
+    all_dates = sorted({bar['date'] for bars in bars_by_symbol.values() for bar in bars})
+    dates = np.array(all_dates, dtype='datetime64[D]')
+
+    opens = np.full((len(dates), len(symbols)), np.nan)
+    closes = np.full((len(dates), len(symbols)), np.nan)
+    for column, symbol in enumerate(symbols):
+        bars = bars_by_symbol[symbol]
+        bar_dates = np.array([bar['date'] for bar in bars], dtype='datetime64[D]')
+        rows = np.searchsorted(dates, bar_dates)
+        opens[rows, column] = [np.nan if bar.get('open') is None else bar['open'] for bar in bars]
+        closes[rows, column] = [bar['close'] for bar in bars]
+
+    return dates, symbols, opens, closes
+
+def load_sentiment_rows(symbols, start=None, end=None, days=7):
+    """
+    Load stored sentiment for the backtest symbols, keyed by publish time
+
+    Must run inside an app context.
+
+    Returns:
+        tuple: (symbol index array, unix seconds array, compound score array)
+    """
+    from datetime import datetime, timedelta
+    from app.models.db import db
+    from app.models.sentiment import SentimentData
+
+    published = db.func.coalesce(SentimentData.published_at, SentimentData.created_at)
+    query = db.session.query(SentimentData.stock_symbol, published, SentimentData.compound_score).filter(
+        SentimentData.stock_symbol.in_(symbols)
+    )
+    if start:
+        query = query.filter(published >= datetime.fromisoformat(str(start)) - timedelta(days=days))
+    if end:
+        query = query.filter(published < datetime.fromisoformat(str(end)) + timedelta(days=1))
+    rows = query.all()
+
+    position = {symbol: i for i, symbol in enumerate(symbols)}
+    symbol_index = np.array([position[row[0]] for row in rows], dtype=np.int64)
+    epoch = datetime(1970, 1, 1)  # Timestamps are stored as naive UTC
+    seconds = np.array([(row[1] - epoch).total_seconds() for row in rows], dtype=np.int64)
+    scores = np.array([row[2] for row in rows], dtype=float)
+    return symbol_index, seconds, scores
+
+def sentiment_grid(symbol_index, seconds, scores, dates, n_symbols, days=7):
+    """
+    Rolling sentiment features for every (date, symbol) cell at once
+
+    The window for a date covers news published in the `days` days up to the
+    end of that date, so a signal only uses news available by that close.
+    Window bounds are found with one searchsorted over a combined
+    (symbol, timestamp) key, and sums come from prefix sums, so the early and
+    recent halves split at n // 2 exactly as generate_recommendation() does.
+
+    Returns:
+        dict: counts, avg and trend arrays of shape (len(dates), n_symbols)
+    """
+    order = np.lexsort((seconds, symbol_index))
+    keys = symbol_index[order] * SYMBOL_STRIDE + seconds[order]
+    prefix = np.concatenate([[0.0], np.cumsum(scores[order])])
+
+    day_end = (dates.astype('datetime64[s]').astype(np.int64) + DAY_SECONDS)[:, None]
+    symbol_base = (np.arange(n_symbols, dtype=np.int64) * SYMBOL_STRIDE)[None, :]
+    lo = np.searchsorted(keys, symbol_base + day_end - days * DAY_SECONDS, side='left')
+    hi = np.searchsorted(keys, symbol_base + day_end, side='left')
+
+    counts = hi - lo
+    mid = lo + counts // 2
+    total = prefix[hi] - prefix[lo]
+    early_total = prefix[mid] - prefix[lo]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg = total / counts
+        early = early_total / (mid - lo)
+        recent = (total - early_total) / (hi - mid)
+    trend = np.where(counts >= 4, recent - early, 0.0)
+
+    return {'counts': counts, 'avg': avg, 'trend': trend}
+
+def prepare_backtest(bars_by_symbol, sentiment_rows, days=7, horizon=5, lookback=21, start=None, end=None):
+    """
+    Compute everything a backtest needs that does not depend on the rule thresholds
+
+    Returns:
+        dict: dates, symbols, in_range mask and (date, symbol) arrays of sentiment
+        features, price change, forward return and tradability
+    """
+    # Prices before `start` still feed the lookback; start/end only bound the scored signals
+    dates, symbols, opens, closes = build_price_grid(bars_by_symbol)
+    n_dates, n_symbols = closes.shape
+    if n_dates <= horizon:
+        raise ValueError(f"Need more than {horizon} trading days of prices, got {n_dates}")
+
+    in_range = np.ones(n_dates, dtype=bool)
+    if start:
+        in_range &= dates >= np.datetime64(start, 'D')
+    if end:
+        in_range &= dates <= np.datetime64(end, 'D')
+
+    features = sentiment_grid(*sentiment_rows, dates, n_symbols, days=days)
+
+    # Price change over the trailing lookback window, as the live path sees a 1mo history
+    start_close = np.full_like(closes, np.nan)
+    if lookback <= n_dates:
+        start_close[lookback - 1:] = closes[:n_dates - lookback + 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_change = (closes - start_close) / start_close * 100
+
+    # Entry at next open, exit at close `horizon` days after the signal
+    forward = np.full_like(closes, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        forward[:-horizon] = closes[horizon:] / opens[1:n_dates - horizon + 1] - 1
+
+    return {
+        'dates': dates,
+        'symbols': symbols,
+        'in_range': in_range,
+        'features': features,
+        'closes': closes,
+        'price_change': price_change,
+        'forward': forward,
+        'tradable': np.isfinite(closes) & np.isfinite(forward) & in_range[:, None],
+        'days': days,
+        'horizon': horizon
+    }
+
+def score_backtest(prepared, hold_band=0.02, momentum_threshold=0.25):
+    """
+    Classify every (date, symbol) cell and score the signals against forward returns
+
+    Returns:
+        tuple: (per-branch stats dict, strategy stats dict)
+    """
+    features, closes, forward, tradable = (prepared[key] for key in ('features', 'closes', 'forward', 'tradable'))
+    n_dates, n_symbols = closes.shape
+    has_price = np.isfinite(prepared['price_change'])
+
+    result = classify(
+        features['avg'].ravel(), features['trend'].ravel(),
+        np.where(has_price, prepared['price_change'], 0.0).ravel(),
+        closes.ravel(), has_price.ravel(), (features['counts'] > 0).ravel(),
+        momentum_threshold=momentum_threshold
+    )
+    branch = result['branch'].reshape(n_dates, n_symbols)
+
+    direction = np.select([BRANCH_TYPES[branch] == 'buy', BRANCH_TYPES[branch] == 'sell'], [1.0, -1.0], 0.0)
+    hits = np.where(direction != 0, direction * forward > 0, np.abs(forward) <= hold_band)
+
+    # A signal is a change when the symbol's branch differs from its previous trading day
+    changed = np.zeros_like(tradable)
+    changed[1:] = branch[1:] != branch[:-1]
+
+    branches = {}
+    for code, name in BRANCH_NAMES.items():
+        mask = tradable & (branch == code)
+        signals = int(mask.sum())
+        branches[name] = {
+            'signals': signals,
+            'mean_forward_return': float(forward[mask].mean()) if signals else None,
+            'hit_rate': float(hits[mask].mean()) if signals else None,
+            'turnover': float(changed[mask].mean()) if signals else None
+        }
+
+    active = tradable & (direction != 0)
+    type_changed = np.zeros_like(tradable)
+    type_changed[1:] = direction[1:] != direction[:-1]
+    tradable_per_day = tradable.sum(axis=1)
+    scored_days = tradable_per_day[1:] > 0
+    daily_turnover = (type_changed & tradable).sum(axis=1)[1:][scored_days] / tradable_per_day[1:][scored_days]
+
+    strategy = {
+        'signals': int(active.sum()),
+        'mean_signed_return': float((direction * forward)[active].mean()) if active.any() else None,
+        'hit_rate': float(hits[active].mean()) if active.any() else None,
+        'mean_daily_turnover': float(daily_turnover.mean()) if len(daily_turnover) else None
+    }
+    return branches, strategy
+
+def run_backtest(bars_by_symbol, sentiment_rows, days=7, horizon=5, lookback=21, hold_band=0.02,
+                 start=None, end=None, momentum_threshold=0.25):
+    """
+    Replay the recommendation rules over every trading day and symbol
+
+    On each date the rules see the sentiment window ending that day and the
+    price change over the last `lookback` closes. Each signal is entered at the
+    next day's open and exited at the close `horizon` trading days later.
+
+    Args:
+        bars_by_symbol (dict): symbol -> daily bars (date, open, close)
+        sentiment_rows (tuple): (symbol index, unix seconds, score) arrays from load_sentiment_rows
+        days (int): Sentiment window in days
+        horizon (int): Holding period in trading days
+        lookback (int): Closes used for price_change_pct (about one month)
+        hold_band (float): A hold counts as a hit when the absolute return stays within this band
+        start/end (str, optional): ISO dates bounding the replayed period
+        momentum_threshold (float): |Average sentiment| the momentum branches require (0.25 live)
+
+    Returns:
+        dict: Summary with per-branch signals, mean forward return, hit rate and turnover
+    """
+    prepared = prepare_backtest(bars_by_symbol, sentiment_rows, days=days, horizon=horizon, lookback=lookback,
+                                start=start, end=end)
+    branches, strategy = score_backtest(prepared, hold_band=hold_band, momentum_threshold=momentum_threshold)
+
+    scored_dates = prepared['dates'][prepared['in_range']]
+    return {
+        'start': str(scored_dates[0]) if len(scored_dates) else None,
+        'end': str(scored_dates[-1]) if len(scored_dates) else None,
+        'trading_days': int(prepared['in_range'].sum()),
+        'symbols': len(prepared['symbols']),
+        'days': days,
+        'horizon': horizon,
+        'momentum_threshold': momentum_threshold,
+        'branches': branches,
+        'strategy': strategy
+    }
+
+def sweep_momentum_thresholds(bars_by_symbol, sentiment_rows, thresholds, hold_band=0.02, **options):
+    """
+    Score the rules at several momentum thresholds over one set of prepared features
+
+    The best threshold has the highest mean signed return among those that
+    produced any buy/sell signals; ties go to the lower threshold.
+
+    Args:
+        thresholds (iterable): Candidate |average sentiment| thresholds
+        **options: days, horizon, lookback, start and end as for run_backtest
+
+    Returns:
+        dict: 'results' (threshold plus strategy stats, in input order) and 'best_threshold' (or None)
+    """
+    prepared = prepare_backtest(bars_by_symbol, sentiment_rows, **options)
+    results = []
+    for threshold in thresholds:
+        _, strategy = score_backtest(prepared, hold_band=hold_band, momentum_threshold=threshold)
+        results.append({'threshold': threshold, **strategy})
+
+    scored = [result for result in results if result['mean_signed_return'] is not None]
+    best = max(scored, key=lambda result: (result['mean_signed_return'], -result['threshold']), default=None)
+    return {'results': results, 'best_threshold': best['threshold'] if best else None}
@@ -0,0 +1,278 @@
+#app/services/indicator_service.py
+
+import logging
+import threading
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SHORT_WINDOW = 5
+LONG_WINDOW = 20
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+RSI_PERIOD = 14
+TRADING_DAYS = 252
+
+BAR_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def build_bar_matrix(bars_by_symbol):
+    """
+    Align daily bars for many symbols into 2-D arrays.
+
+    Rows are symbols and columns are bars. Series are right-aligned so the last
+    column holds every symbol's latest bar; shorter histories are left-padded
+    with NaN.
+
+    Args:
+        bars_by_symbol (dict): symbol -> list of bars sorted by date
+
+    Returns:
+        tuple: (symbols, fields) where fields maps open/high/low/close/volume
+        to arrays of shape (len(symbols), max_bars)
+    """
+    symbols = list(bars_by_symbol)
+    length = max((len(bars) for bars in bars_by_symbol.values()), default=0)
+
+    fields = {field: np.full((len(symbols), length), np.nan) for field in BAR_FIELDS}
+    for row, symbol in enumerate(symbols):
+        bars = bars_by_symbol[symbol]
+        if not bars:
+            continue
+        offset = length - len(bars)
+        for field in BAR_FIELDS:
+            fields[field][row, offset:] = [
+                np.nan if bar.get(field) is None else bar[field] for bar in bars
+            ]
+
+    return symbols, fields
+
+
+def _rolling_sum(values, window):
+    """Rolling sum along axis 1; NaN until a full window of valid values is available"""
+    valid = np.isfinite(values)
+    filled = np.where(valid, values, 0.0)
+
+    pad = np.zeros((values.shape[0], 1))
+    csum = np.concatenate([pad, np.cumsum(filled, axis=1)], axis=1)
+    ccount = np.concatenate([pad, np.cumsum(valid, axis=1)], axis=1)
+
+    result = np.full(values.shape, np.nan)
+    if values.shape[1] < window:
+        return result
+
+    sums = csum[:, window:] - csum[:, :-window]
+    counts = ccount[:, window:] - ccount[:, :-window]
+    result[:, window - 1:] = np.where(counts == window, sums, np.nan)
+    return result
+
+
+def sma(values, window):
+    """Simple moving average along axis 1"""
+    return _rolling_sum(values, window) / window
+
+
+def rolling_std(values, window):
+    """Rolling sample standard deviation along axis 1"""
+    mean = sma(values, window)
+    mean_sq = sma(values * values, window)
+    var = (mean_sq - mean * mean) * window / max(window - 1, 1)
+    return np.sqrt(np.clip(var, 0.0, None))
+
+
+def ema(values, span=None, alpha=None):
+    """
+    Exponential moving average along axis 1, seeded with each row's first valid value.
+
+    The recursion runs over bars but is vectorized across symbols.
+    """
+    if alpha is None:
+        alpha = 2.0 / (span + 1.0)
+
+    result = np.full(values.shape, np.nan)
+    prev = np.full(values.shape[0], np.nan)
+    for col in range(values.shape[1]):
+        current = values[:, col]
+        has_prev = np.isfinite(prev)
+        has_current = np.isfinite(current)
+        prev = np.where(
+            has_prev & has_current, alpha * current + (1 - alpha) * prev,
+            np.where(has_current, current, prev)
+        )
+        result[:, col] = prev
+    return result
+
+
+def rsi(close, period=RSI_PERIOD):
+    """Relative strength index with Wilder smoothing"""
+    delta = np.diff(close, axis=1, prepend=np.nan)
+    gains = np.where(delta > 0, delta, np.where(np.isfinite(delta), 0.0, np.nan))
+    losses = np.where(delta < 0, -delta, np.where(np.isfinite(delta), 0.0, np.nan))
+
+    avg_gain = ema(gains, alpha=1.0 / period)
+    avg_loss = ema(losses, alpha=1.0 / period)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        result = 100.0 - 100.0 / (1.0 + rs)
+    result = np.where((avg_loss == 0) & np.isfinite(avg_gain), 100.0, result)
+
+    # Wilder's RSI is undefined until a full period of changes is available
+    counts = np.cumsum(np.isfinite(delta), axis=1)
+    return np.where(counts >= period, result, np.nan)
+
+
+def macd(close, fast=MACD_FAST, slow=MACD_SLOW, signal=MACD_SIGNAL):
+    """MACD line, signal line and histogram"""
+    line = ema(close, span=fast) - ema(close, span=slow)
+    signal_line = ema(line, span=signal)
+    return line, signal_line, line - signal_line
+
+
+def realized_volatility(close, window=LONG_WINDOW):
+    """Annualized standard deviation of daily log returns"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_returns = np.diff(np.log(close), axis=1, prepend=np.nan)
+    return rolling_std(log_returns, window) * np.sqrt(TRADING_DAYS)
+
+
+def volume_zscore(volume, window=LONG_WINDOW):
+    """Z-score of each bar's volume against its trailing window"""
+    mean = sma(volume, window)
+    std = rolling_std(volume, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(std > 0, (volume - mean) / std, np.nan)
+
+
+def price_change_pct(close):
+    """Percent change from each row's first valid close to its last close"""
+    valid = np.isfinite(close)
+    counts = valid.sum(axis=1)
+    first_idx = np.argmax(valid, axis=1)
+    rows = np.arange(close.shape[0])
+
+    start = close[rows, first_idx] if close.shape[1] else np.full(close.shape[0], np.nan)
+    end = close[:, -1] if close.shape[1] else np.full(close.shape[0], np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = (end - start) / start * 100
+    return np.where(counts >= 2, change, 0.0)
+
+
+def compute_indicator_matrix(fields):
+    """
+    Compute every indicator over aligned bar arrays.
+
+    Args:
+        fields (dict): Output of build_bar_matrix
+
+    Returns:
+        dict: Indicator name -> 2-D array with the same shape as the input
+    """
+    close = fields['close']
+    macd_line, macd_signal, macd_hist = macd(close)
+
+    return {
+        'sma_short': sma(close, SHORT_WINDOW),
+        'sma_long': sma(close, LONG_WINDOW),
+        'ema_short': ema(close, span=MACD_FAST),
+        'ema_long': ema(close, span=MACD_SLOW),
+        'rsi': rsi(close),
+        'macd': macd_line,
+        'macd_signal': macd_signal,
+        'macd_hist': macd_hist,
+        'volatility': realized_volatility(close),
+        'volume_zscore': volume_zscore(fields['volume'])
+    }
+
+
+def _latest(value):
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+class IndicatorCache:
+    """In-memory cache of latest indicator values keyed by (symbol, last_bar_date)"""
+    _cache = {}  # symbol -> (last_bar_date, bar_count, indicators)
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, symbol, last_bar_date, bar_count):
+        with cls._lock:
+            entry = cls._cache.get(symbol)
+        if entry and entry[0] == last_bar_date and entry[1] == bar_count:
+            return entry[2]
+        return None
+
+    @classmethod
+    def latest(cls, symbol):
+        """Get the most recently computed indicators for a symbol, whatever their bar date"""
+        with cls._lock:
+            entry = cls._cache.get(symbol)
+        return entry[2] if entry else None
+
+    @classmethod
+    def set(cls, symbol, last_bar_date, bar_count, indicators):
+        # Only the latest bar date is kept per symbol, so the cache stays bounded
+        with cls._lock:
+            cls._cache[symbol] = (last_bar_date, bar_count, indicators)
+
+    @classmethod
+    def clear(cls, symbol=None):
+        with cls._lock:
+            if symbol:
+                cls._cache.pop(symbol, None)
+            else:
+                cls._cache.clear()
+
+
+def compute_indicators(bars_by_symbol):
+    """
+    Get the latest indicator values for many symbols at once.
+
+    Symbols whose (symbol, last_bar_date) is already cached are not recomputed;
+    the rest are computed together in a single vectorized pass.
+
+    Args:
+        bars_by_symbol (dict): symbol -> list of bars sorted by date
+
+    Returns:
+        dict: symbol -> dict of latest indicator values (None where undefined)
+    """
+    results = {}
+    pending = {}
+
+    for symbol, bars in bars_by_symbol.items():
+        if not bars:
+            continue
+        cached = IndicatorCache.get(symbol, bars[-1]['date'], len(bars))
+        if cached is not None:
+            results[symbol] = cached
+        else:
+            pending[symbol] = bars
+
+    if not pending:
+        return results
+
+    symbols, fields = build_bar_matrix(pending)
+    matrix = compute_indicator_matrix(fields)
+    changes = price_change_pct(fields['close'])
+
+    for row, symbol in enumerate(symbols):
+        bars = pending[symbol]
+        indicators = {name: _latest(values[row, -1]) for name, values in matrix.items()}
+        indicators['price_change_pct'] = _latest(changes[row])
+        indicators['start_price'] = bars[0]['close']
+        indicators['end_price'] = bars[-1]['close']
+        indicators['last_bar_date'] = bars[-1]['date']
+        indicators['bar_count'] = len(bars)
+
+        IndicatorCache.set(symbol, bars[-1]['date'], len(bars), indicators)
+        results[symbol] = indicators
+
+    return results
+
+
+def get_indicators(symbol, bars):
+    """Get the latest indicator values for a single symbol"""
+    return compute_indicators({symbol: bars}).get(symbol)
@@ -0,0 +1,324 @@
+#app/services/market_data.py
+
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+YAHOO_SEARCH_URL = "https://query1.finance.yahoo.com/v1/finance/search"
+YAHOO_TIMEOUT = float(os.environ.get('MARKET_DATA_TIMEOUT', 10))  # seconds per upstream request
+YAHOO_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+def _to_float(value):
+    """Convert numpy/pandas scalars to plain floats so results stay JSON serializable"""
+    if value is None:
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if value != value else value  # NaN -> None
+
+
+def _to_int(value):
+    value = _to_float(value)
+    return int(value) if value is not None else None
+
+
+class MarketDataProvider:
+    """
+    Interface for market data sources.
+
+    All methods return plain Python structures (dicts, lists, floats) so that
+    responses can be recorded to disk and replayed without pandas or yfinance.
+    """
+
+    name = 'base'
+
+    def quote(self, symbol):
+        """
+        Get the latest prices for a symbol
+
+        Returns:
+            dict or None: current_price, previous_close, open, high, low, volume
+        """
+        raise NotImplementedError
+
+    def info(self, symbol):
+        """
+        Get company fundamentals for a symbol (the yfinance ``Ticker.info`` dict)
+
+        Returns:
+            dict: Company information, empty if the symbol is unknown
+        """
+        raise NotImplementedError
+
+    def history(self, symbol, period='1mo'):
+        """
+        Get daily price bars for a symbol
+
+        Args:
+            symbol (str): Stock ticker symbol
+            period (str): Period of historical data (1d, 5d, 1mo, 3mo, 6mo, 1y, ...)
+
+        Returns:
+            list: Bars as dicts with date, open, high, low, close and volume
+        """
+        raise NotImplementedError
+
+    def search_news(self, symbol, limit=5):
+        """
+        Search news articles for a symbol
+
+        Returns:
+            list: Raw article dicts (title, link, publisher, providerPublishTime)
+        """
+        raise NotImplementedError
+
+    def symbol_exists(self, symbol):
+        """
+        Ask the source whether a symbol is listed at all
+
+        Empty quotes or history can also mean a network error or rate limit,
+        so only a False from here justifies caching a symbol as not found.
+
+        Returns:
+            bool or None: False only if the source confirms the symbol is unknown,
+            None if this provider cannot tell
+        """
+        return None
+
+
+class YahooProvider(MarketDataProvider):
+    """
+    Live Yahoo Finance provider (yfinance plus the public search endpoint)
+
+    yfinance (which loads pandas) and requests are imported on first use, so
+    processes that never call Yahoo do not pay for them at startup.
+    """
+
+    name = 'yahoo'
+
+    def quote(self, symbol):
+        bars = self.history(symbol, period='5d')
+        if not bars:
+            return None
+
+        latest = bars[-1]
+        return {
+            'current_price': latest['close'],
+            'previous_close': bars[-2]['close'] if len(bars) > 1 else None,
+            'open': latest['open'],
+            'high': latest['high'],
+            'low': latest['low'],
+            'volume': latest['volume'],
+            'date': latest['date']
+        }
+
+    def info(self, symbol):
+        import yfinance as yf
+        info = yf.Ticker(symbol).info
+        return dict(info) if info else {}
+
+    def history(self, symbol, period='1mo'):
+        import yfinance as yf
+        hist_data = yf.Ticker(symbol).history(period=period, timeout=YAHOO_TIMEOUT)
+
+        bars = []
+        for date, row in hist_data.iterrows():
+            bars.append({
+                'date': date.strftime('%Y-%m-%d'),
+                'open': _to_float(row['Open']),
+                'high': _to_float(row['High']),
+                'low': _to_float(row['Low']),
+                'close': _to_float(row['Close']),
+                'volume': _to_int(row['Volume'])
+            })
+        return bars
+
+    def search_news(self, symbol, limit=5):
+        import requests
+        response = requests.get(
+            YAHOO_SEARCH_URL,
+            params={'q': symbol, 'newsCount': limit},
+            headers=YAHOO_HEADERS,
+            timeout=YAHOO_TIMEOUT
+        )
+        response.raise_for_status()
+        return response.json().get('news', [])
+
+    def symbol_exists(self, symbol):
+        import requests
+        response = requests.get(
+            YAHOO_SEARCH_URL,
+            params={'q': symbol, 'quotesCount': 10, 'newsCount': 0},
+            headers=YAHOO_HEADERS,
+            timeout=YAHOO_TIMEOUT
+        )
+        response.raise_for_status()  # Errors are not an answer; the caller must not cache them
+        quotes = response.json().get('quotes', [])
+        return any(quote.get('symbol', '').upper() == symbol.upper() for quote in quotes)
+
+
+class RecordingProvider(MarketDataProvider):
+    """
+    Wraps another provider and writes every response to disk so it can be
+    served later by ReplayProvider.
+    """
+
+    name = 'record'
+
+    def __init__(self, upstream, directory):
+        self.upstream = upstream
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _call(self, method, symbol, **params):
+        result = getattr(self.upstream, method)(symbol, **params)
+        path = recording_path(self.directory, method, symbol, params)
+        payload = {
+            'method': method,
+            'symbol': symbol.upper(),
+            'params': params,
+            'recorded_at': time.time(),
+            'response': result
+        }
+        with self._lock:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(payload, f, default=str)
+            os.replace(tmp_path, path)
+        return result
+
+    def quote(self, symbol):
+        return self._call('quote', symbol)
+
+    def info(self, symbol):
+        return self._call('info', symbol)
+
+    def history(self, symbol, period='1mo'):
+        return self._call('history', symbol, period=period)
+
+    def search_news(self, symbol, limit=5):
+        return self._call('search_news', symbol, limit=limit)
+
+    def symbol_exists(self, symbol):
+        return self._call('symbol_exists', symbol)
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Serves responses captured by RecordingProvider, with optional injected
+    latency so load tests see realistic upstream timings without the network.
+    """
+
+    name = 'replay'
+
+    def __init__(self, directory, latency_ms=0, jitter_ms=0):
+        self.directory = directory
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._responses = {}
+
+    def _sleep(self):
+        delay_ms = self.latency_ms
+        if self.jitter_ms:
+            delay_ms += random.uniform(0, self.jitter_ms)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000.0)
+
+    def _call(self, method, symbol, empty, **params):
+        self._sleep()
+        path = recording_path(self.directory, method, symbol, params)
+        if path in self._responses:
+            return self._responses[path]
+
+        # Read outside any lock so cold reads of different recordings run in parallel;
+        # when two threads load the same file, setdefault keeps the first result
+        try:
+            with open(path) as f:
+                response = json.load(f)['response']
+        except FileNotFoundError:
+            logger.warning(f"No recorded {method} response for {symbol} {params}")
+            response = empty
+        return self._responses.setdefault(path, response)
+
+    def quote(self, symbol):
+        return self._call('quote', symbol, None)
+
+    def info(self, symbol):
+        return self._call('info', symbol, {})
+
+    def history(self, symbol, period='1mo'):
+        return self._call('history', symbol, [], period=period)
+
+    def search_news(self, symbol, limit=5):
+        return self._call('search_news', symbol, [], limit=limit)
+
+    def symbol_exists(self, symbol):
+        return self._call('symbol_exists', symbol, None)
+
+
+def recording_path(directory, method, symbol, params):
+    """Build the file path used to store a recorded response"""
+    key = json.dumps(params, sort_keys=True)
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+    safe_symbol = re.sub(r'[^A-Z0-9._-]', '_', symbol.upper())
+    return os.path.join(directory, f"{method}__{safe_symbol}__{digest}.json")
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def create_provider(kind=None, directory=None, latency_ms=None, jitter_ms=None):
+    """
+    Create a market data provider.
+
+    Defaults come from the environment:
+        MARKET_DATA_PROVIDER: yahoo (default), record or replay
+        MARKET_DATA_DIR: directory for recorded responses
+        MARKET_DATA_LATENCY_MS / MARKET_DATA_JITTER_MS: injected replay latency
+    """
+    kind = (kind or os.environ.get('MARKET_DATA_PROVIDER', 'yahoo')).lower()
+    directory = directory or os.environ.get('MARKET_DATA_DIR', 'market_data_recordings')
+
+    if kind == 'yahoo':
+        return YahooProvider()
+    if kind == 'record':
+        return RecordingProvider(YahooProvider(), directory)
+    if kind == 'replay':
+        if latency_ms is None:
+            latency_ms = float(os.environ.get('MARKET_DATA_LATENCY_MS', 0))
+        if jitter_ms is None:
+            jitter_ms = float(os.environ.get('MARKET_DATA_JITTER_MS', 0))
+        return ReplayProvider(directory, latency_ms=latency_ms, jitter_ms=jitter_ms)
+
+    raise ValueError(f"Unknown market data provider: {kind}")
+
+
+def get_provider():
+    """Get the process-wide market data provider, creating it on first use"""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = create_provider()
+    return _provider
+
+
+def set_provider(provider):
+    """Replace the process-wide market data provider (used by benchmarks and load tests)"""
+    global _provider
+    with _provider_lock:
+        _provider = provider
@@ -0,0 +1,330 @@
+#app/services/recommendation_engine.py
+
+import logging
+from datetime import datetime, timedelta
+import numpy as np
+from app.models.db import db
+from app.models.stock import Stock
+from app.models.sentiment import SentimentData
+from app.services.indicator_service import IndicatorCache, compute_indicators
+
+logger = logging.getLogger(__name__)
+
+# Rule branches, shared with the backtester so results can be grouped per rule
+BRANCH_HOLD = 0
+BRANCH_BUY_MOMENTUM = 1  # positive sentiment, non-negative trend, rising price
+BRANCH_SELL_MOMENTUM = 2  # negative sentiment, non-positive trend, falling price
+BRANCH_BUY_IMPROVING = 3  # negative but improving sentiment
+BRANCH_SELL_WORSENING = 4  # positive but worsening sentiment
+BRANCH_SENTIMENT_BUY = 5  # no price data, strong positive sentiment
+BRANCH_SENTIMENT_SELL = 6  # no price data, strong negative sentiment
+BRANCH_SENTIMENT_HOLD = 7  # no price data, neutral sentiment
+BRANCH_NO_NEWS = 8
+
+BRANCH_NAMES = {
+    BRANCH_HOLD: 'hold_mixed',
+    BRANCH_BUY_MOMENTUM: 'buy_momentum',
+    BRANCH_SELL_MOMENTUM: 'sell_momentum',
+    BRANCH_BUY_IMPROVING: 'buy_improving',
+    BRANCH_SELL_WORSENING: 'sell_worsening',
+    BRANCH_SENTIMENT_BUY: 'buy_sentiment_only',
+    BRANCH_SENTIMENT_SELL: 'sell_sentiment_only',
+    BRANCH_SENTIMENT_HOLD: 'hold_sentiment_only',
+    BRANCH_NO_NEWS: 'hold_no_news'
+}
+
+BRANCH_TYPES = np.array(['hold', 'buy', 'sell', 'buy', 'sell', 'buy', 'sell', 'hold', 'hold'])
+
+def sentiment_features(group_index, scores, n_groups):
+    """
+    Per-stock sentiment aggregates over rows sorted by (stock, published time)
+
+    Mirrors generate_recommendation(): with 4+ items the trend is the mean of
+    the later half minus the mean of the earlier half (split at n // 2),
+    otherwise the trend is 0.
+
+    Args:
+        group_index (np.ndarray): Stock position (0..n_groups-1) of each row, non-decreasing
+        scores (np.ndarray): Compound score of each row
+        n_groups (int): Number of stocks
+
+    Returns:
+        dict: counts, avg, early, recent and trend arrays of length n_groups
+    """
+    group_index = np.asarray(group_index, dtype=np.int64)
+    scores = np.asarray(scores, dtype=float)
+
+    counts = np.bincount(group_index, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    position = np.arange(len(group_index)) - starts[group_index]
+    mid = counts // 2
+
+    total = np.bincount(group_index, weights=scores, minlength=n_groups)
+    early_total = np.bincount(group_index, weights=scores * (position < mid[group_index]), minlength=n_groups)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg = total / counts
+        early = early_total / mid
+        recent = (total - early_total) / (counts - mid)
+
+    split = counts >= 4
+    early = np.where(split, early, avg)
+    recent = np.where(split, recent, avg)
+    trend = np.where(split, recent - early, 0.0)
+
+    return {'counts': counts, 'avg': avg, 'early': early, 'recent': recent, 'trend': trend}
+
+def classify(avg, trend, price_change_pct, current_price, has_price, has_news, momentum_threshold=0.25):
+    """
+    Apply the buy/sell/hold rules to whole arrays at once
+
+    The masks reproduce generate_recommendation() and
+    generate_sentiment_only_recommendation() branch for branch, in the same
+    precedence order. momentum_threshold is the |average sentiment| the
+    momentum branches require; only backtests vary it.
+
+    Returns:
+        dict: branch, confidence, price_target (NaN where none) and medium_term arrays
+    """
+    avg = np.asarray(avg, dtype=float)
+    trend = np.asarray(trend, dtype=float)
+    price_change_pct = np.asarray(price_change_pct, dtype=float)
+    current_price = np.asarray(current_price, dtype=float)
+    has_price = np.asarray(has_price, dtype=bool)
+    has_news = np.asarray(has_news, dtype=bool)
+
+    with_price = has_news & has_price
+    sentiment_only = has_news & ~has_price
+
+    branch = np.select(
+        [
+            ~has_news,
+            with_price & (avg > momentum_threshold) & (trend >= 0) & (price_change_pct > 0),
+            with_price & (avg < -momentum_threshold) & (trend <= 0) & (price_change_pct < 0),
+            with_price & (avg < 0) & (trend > 0.1),
+            with_price & (avg > 0) & (trend < -0.1),
+            with_price,
+            sentiment_only & (avg > 0.3),
+            sentiment_only & (avg < -0.3),
+        ],
+        [
+            BRANCH_NO_NEWS,
+            BRANCH_BUY_MOMENTUM,
+            BRANCH_SELL_MOMENTUM,
+            BRANCH_BUY_IMPROVING,
+            BRANCH_SELL_WORSENING,
+            BRANCH_HOLD,
+            BRANCH_SENTIMENT_BUY,
+            BRANCH_SENTIMENT_SELL,
+        ],
+        default=BRANCH_SENTIMENT_HOLD
+    )
+
+    confidence = np.select(
+        [
+            branch == BRANCH_BUY_MOMENTUM,
+            branch == BRANCH_SELL_MOMENTUM,
+            branch == BRANCH_BUY_IMPROVING,
+            branch == BRANCH_SELL_WORSENING,
+            (branch == BRANCH_SENTIMENT_BUY) | (branch == BRANCH_SENTIMENT_SELL),
+        ],
+        [
+            np.minimum(0.9, 0.5 + avg * 0.5),
+            np.minimum(0.9, 0.5 + np.abs(avg) * 0.5),
+            0.5 + trend * 0.5,
+            0.5 + np.abs(trend) * 0.5,
+            0.5 + np.minimum(0.3, np.abs(avg) * 0.3),
+        ],
+        default=0.5
+    )
+
+    price_target = np.select(
+        [
+            branch == BRANCH_BUY_MOMENTUM,
+            branch == BRANCH_SELL_MOMENTUM,
+            branch == BRANCH_BUY_IMPROVING,
+        ],
+        [
+            current_price * (1 + avg * 0.2),
+            current_price * (1 + avg * 0.15),
+            current_price * (1 + trend * 0.3),
+        ],
+        default=np.nan
+    )
+
+    return {
+        'branch': branch,
+        'confidence': confidence,
+        'price_target': price_target,
+        'medium_term': branch == BRANCH_BUY_IMPROVING
+    }
+
+def _reason(branch, symbol, avg, price_change_pct):
+    if branch == BRANCH_BUY_MOMENTUM:
+        return f"Positive sentiment ({avg:.2f}) with upward price trend (+{price_change_pct:.2f}%)."
+    if branch == BRANCH_SELL_MOMENTUM:
+        return f"Negative sentiment ({avg:.2f}) with downward price trend ({price_change_pct:.2f}%)."
+    if branch == BRANCH_BUY_IMPROVING:
+        return "Improving sentiment despite negativity. Potential value buy."
+    if branch == BRANCH_SELL_WORSENING:
+        return "Worsening sentiment despite positivity. Consider selling."
+    if branch == BRANCH_HOLD:
+        return f"Mixed sentiment ({avg:.2f}). Hold recommended."
+    if branch == BRANCH_SENTIMENT_BUY:
+        return f"Strong positive sentiment ({avg:.2f})."
+    if branch == BRANCH_SENTIMENT_SELL:
+        return f"Strong negative sentiment ({avg:.2f})."
+    if branch == BRANCH_SENTIMENT_HOLD:
+        return f"Neutral sentiment ({avg:.2f})."
+    return f"Insufficient stored news for {symbol}."
+
+def _optional(value):
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+def load_universe(stock_ids=None):
+    """Load (id, symbol, current_price) for the stock universe in one query"""
+    query = db.session.query(Stock.id, Stock.symbol, Stock.current_price).order_by(Stock.id)
+    if stock_ids is not None:
+        query = query.filter(Stock.id.in_(stock_ids))
+    return query.all()
+
+def load_sentiment_windows(stock_ids, days=7):
+    """
+    Load compound scores for every stock's sentiment window in one query
+
+    Returns:
+        tuple: (stock_id array, compound score array) ordered by stock then publish time
+    """
+    from_date = datetime.utcnow() - timedelta(days=days)
+    published = db.func.coalesce(SentimentData.published_at, SentimentData.created_at)
+
+    query = db.session.query(SentimentData.stock_id, SentimentData.compound_score).filter(
+        SentimentData.created_at >= from_date
+    )
+    if stock_ids is not None:
+        query = query.filter(SentimentData.stock_id.in_(stock_ids))
+    rows = query.order_by(SentimentData.stock_id, published, SentimentData.id).all()
+
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    stock_id_values, scores = zip(*rows)
+    return np.array(stock_id_values, dtype=np.int64), np.array(scores, dtype=float)
+
+def load_price_changes(symbols, fetch_missing=False, period='1mo', **pool_options):
+    """
+    Get each symbol's price change over its latest cached bars
+
+    Uses IndicatorCache only, unless fetch_missing is set, in which case
+    uncached symbols are fetched through the market data provider on the
+    bounded pool of iter_recommendations (same workers, per-symbol timeout and
+    deadline as live evaluation) and computed together in one vectorized pass.
+    Symbols whose fetch fails or times out are left without price data.
+
+    Args:
+        symbols (list): Ticker symbols
+        fetch_missing (bool): Fetch history for symbols without cached indicators
+        period (str): History period to fetch
+        **pool_options: max_workers, per_stock_timeout and deadline for iter_recommendations
+
+    Returns:
+        dict: symbol -> price_change_pct for symbols with price data
+    """
+    changes = {}
+    missing = []
+    for symbol in symbols:
+        cached = IndicatorCache.latest(symbol)
+        if cached is not None:
+            changes[symbol] = cached['price_change_pct'] or 0
+        else:
+            missing.append(symbol)
+
+    if fetch_missing and missing:
+        from app.services.recommendation_service import iter_recommendations
+        from app.services.stock_service import get_historical_data
+
+        bars = {}
+        unfetched = 0
+        for symbol, history, status in iter_recommendations(
+                missing, task=lambda symbol: get_historical_data(symbol, period=period), **pool_options):
+            if history:
+                bars[symbol] = history
+            elif status == 'timed_out':
+                unfetched += 1
+        if unfetched:
+            logger.warning(f"Price history fetch timed out for {unfetched} of {len(missing)} symbols")
+
+        for symbol, indicators in compute_indicators(bars).items():
+            changes[symbol] = indicators['price_change_pct'] or 0
+
+    return changes
+
+def generate_recommendations_batch(stock_ids=None, days=7, price_changes=None, fetch_missing_prices=False):
+    """
+    Generate recommendations for the whole stock universe at once
+
+    Loads stocks and sentiment windows with two set-based queries, computes
+    average sentiment, trend and price change as arrays and applies the
+    rules with vectorized masks. Per stock, the output matches
+    generate_recommendation(source='stored') without the live-scrape
+    fallback, given the same price change. The only difference: a stock
+    without a current price gets no price target instead of raising an error.
+
+    Args:
+        stock_ids (list, optional): Restrict to these stocks, defaults to all
+        days (int): Sentiment window in days
+        price_changes (dict, optional): symbol -> price_change_pct; defaults to load_price_changes()
+        fetch_missing_prices (bool): Fetch price history for symbols without cached indicators
+
+    Returns:
+        list: Recommendation dicts, in stock id order
+    """
+    stocks = load_universe(stock_ids)
+    if not stocks:
+        return []
+
+    ids = np.array([stock.id for stock in stocks], dtype=np.int64)
+    symbols = [stock.symbol for stock in stocks]
+    current_price = np.array([
+        np.nan if stock.current_price is None else stock.current_price for stock in stocks
+    ])
+
+    row_stock_ids, scores = load_sentiment_windows(None if stock_ids is None else ids.tolist(), days=days)
+    features = sentiment_features(np.searchsorted(ids, row_stock_ids), scores, len(ids))
+
+    if price_changes is None:
+        price_changes = load_price_changes(symbols, fetch_missing=fetch_missing_prices)
+    has_price = np.array([symbol in price_changes for symbol in symbols])
+    price_change_pct = np.array([price_changes.get(symbol, 0.0) for symbol in symbols], dtype=float)
+
+    has_news = features['counts'] > 0
+    result = classify(features['avg'], features['trend'], price_change_pct, current_price, has_price, has_news)
+
+    recommendations = []
+    for i, stock_id in enumerate(ids.tolist()):
+        branch = int(result['branch'][i])
+        avg = float(features['avg'][i]) if has_news[i] else None
+        rec = {
+            'stock_id': stock_id,
+            'type': str(BRANCH_TYPES[branch]),
+            'confidence_score': float(result['confidence'][i]),
+            'reason': _reason(branch, symbols[i], avg, price_change_pct[i]),
+            'time_frame': 'medium-term' if result['medium_term'][i] else 'short-term',
+            'branch': BRANCH_NAMES[branch]
+        }
+
+        if has_news[i] and has_price[i]:
+            rec['price_target'] = _optional(result['price_target'][i])
+            rec['sentiment_data'] = {
+                'avg_sentiment': avg,
+                'sentiment_trend': float(features['trend'][i]),
+                'early_sentiment': float(features['early'][i]),
+                'recent_sentiment': float(features['recent'][i]),
+            }
+            rec['price_data'] = {'price_change_pct': float(price_change_pct[i])}
+        elif has_news[i]:
+            rec['sentiment_data'] = {'avg_sentiment': avg}
+
+        recommendations.append(rec)
+
+    return recommendations
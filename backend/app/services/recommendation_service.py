@@ -1,37 +1,175 @@
 #app/services/recommendation_service.py
 
-import pandas as pd
-import numpy as np
 from app.models.sentiment import SentimentData
 from app.models.stock import Stock
+from app.models.recommendation import Recommendation
+from app.models.db import db
+from app.models.recommendation_snapshot import RecommendationSnapshot
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from flask import current_app
+import hashlib
+import json
 import logging
+import threading
+import time
 from app.services.stock_service import fetch_stock_data, get_historical_data
+from app.utils.cache import RecommendationCache
 
 logger = logging.getLogger(__name__)
 
-def generate_recommendation(stock_id, days=7):
+_snapshot_refresh = {'lock': threading.Lock(), 'attempted_at': None}  # one background refresh per process
+
+def load_sentiment_window(stock, days=7):
+    """
+    Load stored sentiment for a stock's window with one query on (stock_symbol, created_at)
+    
+    Returns:
+        list: Dicts with id, compound_score, sentiment_label and published_at, oldest first
+    """
+    from_date = datetime.utcnow() - timedelta(days=days)
+    published = db.func.coalesce(SentimentData.published_at, SentimentData.created_at)
+    
+    rows = db.session.query(
+        SentimentData.id, SentimentData.compound_score, SentimentData.sentiment_label, published
+    ).filter(
+        SentimentData.stock_symbol == stock.symbol,
+        SentimentData.created_at >= from_date
+    ).order_by(
+        published, SentimentData.id
+    ).all()
+    
+    return [
+        {'id': row_id, 'compound_score': score, 'sentiment_label': label, 'published_at': published_at}
+        for row_id, score, label, published_at in rows
+    ]
+
+def scrape_live_sentiment(stock):
+    """Scrape and score fresh headlines for a stock (saved to sentiment_data as a side effect)"""
+    from app.services.sentiment_service import scrape_news
+    return scrape_news(stock.symbol, limit=10)
+
+def load_recommendation_inputs(stock, days=7, source=None):
+    """
+    Gather the sentiment rows and price history a recommendation is computed from
+    
+    Args:
+        stock (Stock): Stock to evaluate
+        days (int): Sentiment window in days
+        source (str, optional): 'stored' reads sentiment_data for the window and only
+            scrapes live news when fewer than RECOMMENDATION_MIN_STORED_SENTIMENT rows
+            exist; 'live' always scrapes. Defaults to RECOMMENDATION_SENTIMENT_SOURCE.
+    
+    Returns:
+        dict: source actually used, news_items and historical_data (None when there is no news)
+    """
+    source = source or current_app.config.get('RECOMMENDATION_SENTIMENT_SOURCE', 'stored')
+    
+    if source == 'live':
+        news_items = scrape_live_sentiment(stock)
+    else:
+        news_items = load_sentiment_window(stock, days=days)
+        min_rows = current_app.config.get('RECOMMENDATION_MIN_STORED_SENTIMENT', 3)
+        if len(news_items) < min_rows:
+            logger.info(f"Only {len(news_items)} stored sentiment rows for {stock.symbol}; scraping live news")
+            news_items = scrape_live_sentiment(stock) or news_items
+            source = 'live'
+    
+    historical_data = get_historical_data(stock.symbol, period='1mo') if news_items else None
+    return {'source': source, 'news_items': news_items, 'historical_data': historical_data}
+
+def current_trading_date(now=None):
+    """Current trading date in UTC; Saturday and Sunday roll back to Friday"""
+    today = (now or datetime.utcnow()).date()
+    return today - timedelta(days=max(0, today.weekday() - 4))
+
+def last_known_bar_date(stock, recommendation=None):
+    """
+    Last daily bar date known for a stock without a market data request
+    
+    Taken from this worker's latest computed indicators, falling back to the
+    bar date the recommendation was computed from.
+    """
+    from app.services.indicator_service import IndicatorCache
+    indicators = IndicatorCache.latest(stock.symbol)
+    if indicators is None and recommendation is not None:
+        price_data = recommendation.details_dict().get('price_data') or {}
+        indicators = price_data.get('indicators')
+    return (indicators or {}).get('last_bar_date')
+
+def fingerprint_inputs(stock, days=7, last_bar_date=None):
+    """
+    Hash the stored data a recommendation depends on
+    
+    Sentiment is identified by the ids of the rows in the stock's window and
+    prices by the stock's stored current_price and last_updated, the last bar
+    date of the price window and the current trading date, so computing it
+    takes one indexed query and no market data request. Equal fingerprints
+    mean the stored inputs have not changed since the recommendation was made;
+    a new trading day always changes it.
+    
+    Args:
+        stock (Stock): Stock to fingerprint
+        days (int): Sentiment window in days
+        last_bar_date (str, optional): Date of the last price bar the
+            recommendation is (or was) computed from
+    
+    Returns:
+        str: Hex digest
+    """
+    from_date = datetime.utcnow() - timedelta(days=days)
+    sentiment_ids = [row_id for (row_id,) in db.session.query(SentimentData.id).filter(
+        SentimentData.stock_symbol == stock.symbol,
+        SentimentData.created_at >= from_date
+    ).order_by(SentimentData.id).all()]
+    
+    raw = json.dumps({
+        'days': days,
+        'sentiment': sentiment_ids,
+        'current_price': stock.current_price,
+        'last_updated': stock.last_updated,
+        'last_bar_date': last_bar_date,
+        'trading_date': current_trading_date()
+    }, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def generate_recommendation(stock_id, days=7, source=None, inputs=None):
     """
     Generate investment recommendation based on sentiment analysis and stock performance
+    
+    Args:
+        stock_id (int): Stock to evaluate
+        days (int): Sentiment window in days
+        source (str, optional): Sentiment source, see load_recommendation_inputs
+        inputs (dict, optional): Inputs already gathered by load_recommendation_inputs
     """
+    # pandas and numpy load on the first evaluation rather than at worker boot
+    import pandas as pd
+    from app.services.indicator_service import get_indicators
+    
     try:
         stock = Stock.query.get(stock_id)
         if not stock:
             logger.error(f"Stock with ID {stock_id} not found")
             return None
         
-        # Get fresh sentiment data
-        from app.services.sentiment_service import scrape_news, analyze_text
-        news_items = scrape_news(stock.symbol, limit=10)
+        inputs = inputs or load_recommendation_inputs(stock, days=days, source=source)
+        historical_data = inputs['historical_data']
+        last_bar_date = historical_data[-1]['date'] if historical_data else None
+        # After any scrape has stored its rows
+        fingerprint = fingerprint_inputs(stock, days=days, last_bar_date=last_bar_date)
+        source = inputs['source']
+        news_items = inputs['news_items']
 
         if not news_items:
-            logger.warning(f"No live news found for stock {stock.symbol}")
+            logger.warning(f"No {source} news found for stock {stock.symbol}")
             return {
                 'stock_id': stock_id,
                 'type': 'hold',
                 'confidence_score': 0.5,
-                'reason': f"Insufficient live news for {stock.symbol}.",
-                'time_frame': 'short-term'
+                'reason': f"Insufficient {source} news for {stock.symbol}.",
+                'time_frame': 'short-term',
+                'input_fingerprint': fingerprint
             }
         
         sentiment_df = pd.DataFrame([
@@ -43,26 +181,19 @@ def generate_recommendation(stock_id, days=7):
             for item in news_items
         ])
 
-        # Get historical price data
-        historical_data = get_historical_data(stock.symbol, period='1mo')
         if not historical_data:
             logger.warning(f"No historical price data available for stock {stock.symbol}")
-            return generate_sentiment_only_recommendation(stock, sentiment_df)
+            recommendation = generate_sentiment_only_recommendation(stock, sentiment_df)
+            recommendation['input_fingerprint'] = fingerprint
+            return recommendation
         
-        price_df = pd.DataFrame(historical_data)
-        price_df['date'] = pd.to_datetime(price_df['date'])
-        price_df = price_df.sort_values('date')
-
-        if len(price_df) >= 2:
-            start_price = price_df.iloc[0]['close']
-            end_price = price_df.iloc[-1]['close']
-            price_change_pct = (end_price - start_price) / start_price * 100
-        else:
-            price_change_pct = 0
+        # Price signals come from the indicator engine, cached per (symbol, last bar date)
+        indicators = get_indicators(stock.symbol, historical_data)
+        price_change_pct = indicators['price_change_pct'] or 0
 
         # Analyze sentiment trend
         sentiment_df['published_at'] = pd.to_datetime(sentiment_df['published_at'])
-        sentiment_df = sentiment_df.sort_values('published_at')
+        sentiment_df = sentiment_df.sort_values('published_at', kind='stable')
 
         if len(sentiment_df) >= 4:
             mid_idx = len(sentiment_df) // 2
@@ -122,15 +253,164 @@ def generate_recommendation(stock_id, days=7):
             },
             'price_data': {
                 'price_change_pct': price_change_pct,
-                'start_price': start_price if len(price_df) > 0 else None,
-                'end_price': end_price if len(price_df) > 0 else None
-            }
+                'start_price': indicators['start_price'],
+                'end_price': indicators['end_price'],
+                'indicators': indicators
+            },
+            'input_fingerprint': fingerprint
         }
 
     except Exception as e:
         logger.error(f"Error generating recommendation: {str(e)}")
         return None
 
+def is_recommendation_fresh(recommendation, max_age_seconds):
+    """Check that a recommendation is younger than max_age_seconds and its inputs have not changed since"""
+    if max_age_seconds <= 0 or recommendation.created_at is None:
+        return False
+    if recommendation.created_at < datetime.utcnow() - timedelta(seconds=max_age_seconds):
+        return False
+    return RecommendationCache.is_fresh(recommendation.stock_id, recommendation.created_at)
+
+def is_recommendation_reusable(recommendation, stock, days, max_age_seconds):
+    """Check that a recommendation is younger than max_age_seconds and its fingerprint still matches"""
+    if max_age_seconds <= 0 or recommendation.created_at is None:
+        return False
+    if recommendation.created_at < datetime.utcnow() - timedelta(seconds=max_age_seconds):
+        return False
+    fingerprint = fingerprint_inputs(stock, days=days, last_bar_date=last_known_bar_date(stock, recommendation))
+    return recommendation.input_fingerprint == fingerprint
+
+def recommendation_entry(stock_dict, recommendation, reused):
+    """Response entry for a stored recommendation, identical whether it was reused or just computed"""
+    return {
+        'stock': stock_dict,
+        'recommendation': recommendation.to_dict(),
+        'details': recommendation.details_dict(),
+        'is_cached': reused
+    }
+
+def get_or_create_recommendation(stock, days=7, source=None):
+    """
+    Return the stock's latest stored recommendation if its inputs are unchanged,
+    otherwise generate and store a new one
+    
+    Cheapest checks first: a recommendation younger than RECOMMENDATION_FRESH_SECONDS
+    is reused as is, then one younger than RECOMMENDATION_MAX_REUSE_SECONDS is
+    reused while the fingerprint of the stored inputs still matches.
+    Price history is fetched (and news scraped) only when a recompute is
+    needed, or up front when the source is 'live'.
+    
+    Returns:
+        tuple: (Recommendation or None, reused flag)
+    """
+    source = source or current_app.config.get('RECOMMENDATION_SENTIMENT_SOURCE', 'stored')
+    latest = Recommendation.query.filter_by(
+        stock_id=stock.id
+    ).order_by(
+        Recommendation.created_at.desc(), Recommendation.id.desc()
+    ).first()
+    
+    # An explicit live request always scrapes; the fingerprint then tells whether anything new was stored
+    inputs = load_recommendation_inputs(stock, days=days, source=source) if source == 'live' else None
+    
+    if latest and inputs is None and is_recommendation_fresh(
+            latest, current_app.config.get('RECOMMENDATION_FRESH_SECONDS', 300)):
+        return latest, True
+    
+    if latest and is_recommendation_reusable(
+            latest, stock, days, current_app.config.get('RECOMMENDATION_MAX_REUSE_SECONDS', 3600)):
+        return latest, True
+    
+    recommendation_data = generate_recommendation(stock.id, days=days, source=source, inputs=inputs)
+    if not recommendation_data:
+        return None, False
+    
+    recommendation = Recommendation(
+        stock_id=stock.id,
+        type=recommendation_data['type'],
+        confidence_score=recommendation_data['confidence_score'],
+        reason=recommendation_data['reason'],
+        price_target=recommendation_data.get('price_target'),
+        time_frame=recommendation_data.get('time_frame', 'short-term'),
+        input_fingerprint=recommendation_data['input_fingerprint'],
+        details=json.dumps({
+            'sentiment_data': recommendation_data.get('sentiment_data'),
+            'price_data': recommendation_data.get('price_data')
+        }, default=float)
+    )
+    db.session.add(recommendation)
+    db.session.commit()
+    
+    return recommendation, False
+
+def get_fresh_recommendations(stock_ids, max_age_seconds):
+    """
+    Load each stock's latest recommendation created within max_age_seconds, in one query
+    
+    Recommendations whose sentiment or price this worker has seen change since
+    they were created are left out (see RecommendationCache). Uses row_number(),
+    which needs MySQL 8.0+ or SQLite 3.25+.
+    
+    Returns:
+        dict: stock_id -> Recommendation
+    """
+    since = datetime.utcnow() - timedelta(seconds=max_age_seconds)
+    latest = db.session.query(
+        Recommendation.id.label('id'),
+        db.func.row_number().over(
+            partition_by=Recommendation.stock_id,
+            order_by=(Recommendation.created_at.desc(), Recommendation.id.desc())
+        ).label('row_number')
+    ).filter(
+        Recommendation.stock_id.in_(stock_ids),
+        Recommendation.created_at >= since
+    ).subquery()
+    
+    rows = Recommendation.query.join(
+        latest, db.and_(latest.c.id == Recommendation.id, latest.c.row_number == 1)
+    ).all()
+    return {rec.stock_id: rec for rec in rows if RecommendationCache.is_fresh(rec.stock_id, rec.created_at)}
+
+def iter_compare_recommendations(stocks, days=7, source=None, fresh_seconds=None, **pool_options):
+    """
+    Evaluate a set of stocks for comparison, yielding entries as they become available
+    
+    Stocks with a recommendation newer than fresh_seconds (default
+    RECOMMENDATION_FRESH_SECONDS) are answered from storage first. The rest run
+    get_or_create_recommendation on the bounded pool under its deadline, so an
+    unchanged fingerprint still avoids a recompute.
+    
+    Args:
+        stocks (list): Stock rows, already deduplicated
+        days (int): Sentiment window in days
+        source (str, optional): Sentiment source, see load_recommendation_inputs
+        fresh_seconds (float, optional): Max age of a stored recommendation reused without checking inputs
+        **pool_options: Passed to iter_recommendations
+    
+    Yields:
+        tuple: (stock_id, entry dict or None, status)
+    """
+    if fresh_seconds is None:
+        fresh_seconds = current_app.config.get('RECOMMENDATION_FRESH_SECONDS', 300)
+    
+    stock_dicts = {stock.id: stock.to_dict() for stock in stocks}
+    fresh = get_fresh_recommendations(list(stock_dicts), fresh_seconds) if fresh_seconds > 0 and source != 'live' else {}
+    
+    for stock_id, recommendation in fresh.items():
+        yield stock_id, recommendation_entry(stock_dicts[stock_id], recommendation, True), 'completed'
+    
+    def evaluate(stock_id):
+        stock = Stock.query.get(stock_id)
+        recommendation, reused = get_or_create_recommendation(stock, days=days, source=source)
+        if not recommendation:
+            return None
+        return recommendation_entry(stock_dicts[stock_id], recommendation, reused)
+    
+    pending = [stock_id for stock_id in stock_dicts if stock_id not in fresh]
+    if pending:
+        yield from iter_recommendations(pending, days=days, source=source, task=evaluate, **pool_options)
+
 def generate_sentiment_only_recommendation(stock, sentiment_df):
     """Fallback if no price data is available."""
     avg_sentiment = sentiment_df['compound_score'].mean()
@@ -161,26 +441,262 @@ def generate_sentiment_only_recommendation(stock, sentiment_df):
         }
     }
 
-def get_top_recommendations(limit=5, user_id=None):
+def rank_recommendations(recommendations):
+    """Order recommendations with buys first, then by confidence"""
+    return sorted(recommendations, key=lambda x: (
+        1 if x['type'] == 'buy' else 0,
+        x['confidence_score']
+    ), reverse=True)
+
+def iter_recommendations(stock_ids, days=7, source=None, task=None, max_workers=None, per_stock_timeout=None, deadline=None):
     """
-    Generate top recommendations live based on fresh sentiment
+    Run generate_recommendation (or `task`) for many stocks on a bounded thread pool, yielding results as they finish
+    
+    Each worker runs inside its own app context (and so its own DB session).
+    The per-stock budget starts when a worker picks the stock up and is
+    enforced while waiting: a stock still running when it runs out is yielded
+    as timed out right away, and its late result is discarded. Workers cannot
+    be interrupted, so it keeps its pool thread until it returns. Every result
+    that arrives within budget is kept. Once the overall deadline passes, every
+    unfinished stock is yielded as timed out.
+    
+    Args:
+        stock_ids (list): Stock IDs to evaluate
+        days (int): Sentiment window passed to generate_recommendation
+        source (str, optional): Sentiment source passed to generate_recommendation
+        task (callable, optional): Called as task(stock_id) in place of generate_recommendation;
+            a falsy return value counts as failed
+        max_workers (int, optional): Pool size, defaults to RECOMMENDATION_MAX_WORKERS
+        per_stock_timeout (float, optional): Seconds allowed per stock, defaults to RECOMMENDATION_STOCK_TIMEOUT
+        deadline (float, optional): Seconds allowed overall, defaults to RECOMMENDATION_DEADLINE
+        
+    Yields:
+        tuple: (stock_id, recommendation dict (or task result) or None, status)
+        where status is 'completed', 'failed' or 'timed_out'
     """
+    app = current_app._get_current_object()
+    max_workers = max_workers or app.config.get('RECOMMENDATION_MAX_WORKERS', 8)
+    per_stock_timeout = per_stock_timeout or app.config.get('RECOMMENDATION_STOCK_TIMEOUT', 15)
+    deadline = deadline or app.config.get('RECOMMENDATION_DEADLINE', 25)
+    
+    task = task or (lambda stock_id: generate_recommendation(stock_id, days=days, source=source))
+    started = {}  # submission index -> monotonic time its worker started
+    
+    def run(index, stock_id):
+        started[index] = time.monotonic()
+        with app.app_context():
+            return task(stock_id)
+    
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(stock_ids) or 1)),
+                                  thread_name_prefix='recommendation')
+    futures = {executor.submit(run, index, stock_id): (index, stock_id) for index, stock_id in enumerate(stock_ids)}
+    pending = set(futures)
+    ends_at = time.monotonic() + deadline
     try:
-        stocks = Stock.query.all()
-        recommendations = []
+        while pending:
+            # Sleep until something finishes, the next running stock exhausts its budget, or the deadline
+            budgets = [started[futures[future][0]] + per_stock_timeout
+                       for future in pending if futures[future][0] in started]
+            done, _ = wait(pending, timeout=max(0, min([ends_at] + budgets) - time.monotonic()),
+                           return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                pending.discard(future)
+                stock_id = futures[future][1]
+                try:
+                    rec = future.result()
+                except Exception as e:
+                    logger.error(f"Error generating recommendation in worker: {str(e)}")
+                    yield stock_id, None, 'failed'
+                    continue
+                yield stock_id, rec or None, 'completed' if rec else 'failed'
+            
+            now = time.monotonic()
+            if now >= ends_at:
+                logger.warning(f"Recommendation deadline of {deadline}s reached; returning partial results")
+                break
+            
+            for future in list(pending):
+                index, stock_id = futures[future]
+                if index in started and now - started[index] >= per_stock_timeout:
+                    pending.discard(future)
+                    yield stock_id, None, 'timed_out'
+        
+        for future in pending:
+            yield futures[future][1], None, 'timed_out'
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
-        for stock in stocks:
-            rec = generate_recommendation(stock.id)
-            if rec:
-                recommendations.append(rec)
+def summarize_coverage(statuses, total, started):
+    """Build the coverage dict reported alongside partial results"""
+    completed = sum(1 for status in statuses if status == 'completed')
+    failed = sum(1 for status in statuses if status == 'failed')
+    return {
+        'total': total,
+        'completed': completed,
+        'failed': failed,
+        'timed_out': total - completed - failed,
+        'partial': completed < total,
+        'elapsed_ms': round((time.monotonic() - started) * 1000, 1)
+    }
 
-        recommendations.sort(key=lambda x: (
-            1 if x['type'] == 'buy' else 0,
-            x['confidence_score']
-        ), reverse=True)
+def evaluate_recommendations(stock_ids, days=7, **pool_options):
+    """
+    Evaluate many stocks in parallel and collect the results (see iter_recommendations)
+    
+    Returns:
+        tuple: (list of recommendation dicts, coverage dict)
+    """
+    started = time.monotonic()
+    recommendations = []
+    statuses = []
+    
+    for _, rec, status in iter_recommendations(stock_ids, days=days, **pool_options):
+        statuses.append(status)
+        if rec:
+            recommendations.append(rec)
+    
+    return recommendations, summarize_coverage(statuses, len(stock_ids), started)
 
-        return recommendations[:limit]
+def compute_top_recommendations(limit=5, user_id=None, **pool_options):
+    """
+    Generate top recommendations live in parallel, under per-stock and overall deadlines
+    
+    Returns:
+        tuple: (top recommendations, coverage dict from evaluate_recommendations)
+    """
+    stock_ids = [stock_id for (stock_id,) in Stock.query.with_entities(Stock.id).all()]
+    recommendations, coverage = evaluate_recommendations(stock_ids, **pool_options)
+    return rank_recommendations(recommendations)[:limit], coverage
+
+def get_top_recommendations(limit=5, user_id=None):
+    """
+    Generate top recommendations live based on fresh sentiment
+    """
+    try:
+        recommendations, _ = compute_top_recommendations(limit=limit, user_id=user_id)
+        return recommendations
 
     except Exception as e:
         logger.error(f"Error getting top recommendations: {str(e)}")
         return []
+
+def evaluate_recommendations_batch(days=7):
+    """
+    Run the vectorized engine over every stock, reporting coverage like evaluate_recommendations
+    
+    Returns:
+        tuple: (list of recommendation dicts, coverage dict)
+    """
+    from app.services.recommendation_engine import generate_recommendations_batch
+    
+    started = time.monotonic()
+    recommendations = generate_recommendations_batch(days=days, fetch_missing_prices=True)
+    return recommendations, summarize_coverage(['completed'] * len(recommendations), len(recommendations), started)
+
+def refresh_recommendation_snapshot(keep=None, engine=None, **pool_options):
+    """
+    Recompute recommendations for every stock and store them as a ranked snapshot
+    
+    Older snapshots beyond the most recent `keep` runs are deleted.
+    
+    Args:
+        keep (int, optional): Snapshots to retain, defaults to RECOMMENDATION_SNAPSHOT_KEEP
+        engine (str, optional): 'live' (per-stock thread pool) or 'batch' (vectorized
+            over stored sentiment), defaults to RECOMMENDATION_SNAPSHOT_ENGINE
+        **pool_options: Passed to evaluate_recommendations
+        
+    Returns:
+        tuple: (computed_at datetime, coverage dict)
+    """
+    keep = keep or current_app.config.get('RECOMMENDATION_SNAPSHOT_KEEP', 3)
+    engine = engine or current_app.config.get('RECOMMENDATION_SNAPSHOT_ENGINE', 'live')
+    
+    if engine == 'batch':
+        recommendations, coverage = evaluate_recommendations_batch(days=pool_options.get('days', 7))
+    else:
+        stock_ids = [stock_id for (stock_id,) in Stock.query.with_entities(Stock.id).all()]
+        recommendations, coverage = evaluate_recommendations(stock_ids, **pool_options)
+    
+    computed_at = datetime.utcnow()
+    rows = [
+        RecommendationSnapshot(
+            computed_at=computed_at,
+            rank=rank,
+            stock_id=rec['stock_id'],
+            type=rec['type'],
+            confidence_score=float(rec['confidence_score']),
+            reason=rec['reason'],
+            price_target=float(rec['price_target']) if rec.get('price_target') is not None else None,
+            time_frame=rec.get('time_frame'),
+            inputs=json.dumps({
+                'sentiment_data': rec.get('sentiment_data'),
+                'price_data': rec.get('price_data')
+            }, default=float)
+        )
+        for rank, rec in enumerate(rank_recommendations(recommendations), start=1)
+    ]
+    db.session.add_all(rows)
+    
+    # Prune old runs
+    stale_runs = db.session.query(RecommendationSnapshot.computed_at).distinct().order_by(
+        RecommendationSnapshot.computed_at.desc()
+    ).offset(keep).all()
+    if stale_runs:
+        RecommendationSnapshot.query.filter(
+            RecommendationSnapshot.computed_at <= stale_runs[0][0]
+        ).delete(synchronize_session=False)
+    
+    db.session.commit()
+    logger.info(f"Stored recommendation snapshot with {len(rows)} stocks ({coverage})")
+    return computed_at, coverage
+
+def refresh_snapshot_in_background(retry_seconds=60):
+    """
+    Recompute the snapshot in a background thread unless this process is already doing so
+    
+    A failed or slow refresh is not retried for retry_seconds, so requests that keep
+    finding the snapshot stale do not pile up recomputes.
+    
+    Returns:
+        bool: True if a refresh was started
+    """
+    now = time.monotonic()
+    attempted_at = _snapshot_refresh['attempted_at']
+    if attempted_at is not None and now - attempted_at < retry_seconds:
+        return False
+    if not _snapshot_refresh['lock'].acquire(blocking=False):
+        return False
+    _snapshot_refresh['attempted_at'] = now
+    
+    app = current_app._get_current_object()
+    
+    def refresh():
+        try:
+            with app.app_context():
+                refresh_recommendation_snapshot()
+        except Exception as e:
+            logger.error(f"Background snapshot refresh failed: {str(e)}")
+        finally:
+            _snapshot_refresh['lock'].release()
+    
+    threading.Thread(target=refresh, name='recommendation-snapshot-refresh', daemon=True).start()
+    return True
+
+def get_latest_snapshot(limit=5):
+    """
+    Read the top of the most recent recommendation snapshot
+    
+    Uses a single query on the (computed_at, rank) index.
+    
+    Returns:
+        list: (RecommendationSnapshot, Stock) pairs ordered by rank
+    """
+    latest = db.session.query(db.func.max(RecommendationSnapshot.computed_at)).scalar_subquery()
+    return db.session.query(RecommendationSnapshot, Stock).join(
+        Stock, Stock.id == RecommendationSnapshot.stock_id
+    ).filter(
+        RecommendationSnapshot.computed_at == latest
+    ).order_by(
+        RecommendationSnapshot.rank
+    ).limit(limit).all()
@@ -1,22 +1,33 @@
 # ✅ FILE: app/services/sentiment_service.py
 
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import logging
-import requests
+import threading
 from datetime import datetime
-import pandas as pd
 from app.models.db import db
 from app.models.stock import Stock
 from app.models.sentiment import SentimentData
+from app.services.market_data import get_provider
 
-analyzer = SentimentIntensityAnalyzer()
 logger = logging.getLogger(__name__)
 
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+def get_analyzer():
+    """VADER analyzer, created on first use since loading its lexicon slows startup"""
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+                _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
 def analyze_text(text):
     if not text:
         return None
     try:
-        scores = analyzer.polarity_scores(text)
+        scores = get_analyzer().polarity_scores(text)
         compound = scores['compound']
         if compound >= 0.05:
             label = 'positive'
@@ -42,16 +53,7 @@ def scrape_news(symbol, limit=5, save_to_db=True):
     Perform sentiment analysis and (optionally) save to DB.
     """
     try:
-        base_url = f"https://query1.finance.yahoo.com/v1/finance/search?q={symbol}&newsCount={limit}"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-
-        response = requests.get(base_url, headers=headers)
-        response.raise_for_status()
-        results = response.json()
-
-        articles = results.get("news", [])
+        articles = get_provider().search_news(symbol, limit=limit)
         news_items = []
 
         for article in articles[:limit]:
@@ -124,6 +126,8 @@ def aggregate_sentiment(sentiment_data):
     if not sentiment_data:
         return None
 
+    import pandas as pd
+
     try:
         df = pd.DataFrame(sentiment_data)
 
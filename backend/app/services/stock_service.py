@@ -1,47 +1,52 @@
 #app/services/stock_service.py
 
-import yfinance as yf
-import pandas as pd
-from datetime import datetime, timedelta
-import os
-import json
+from datetime import datetime
 import logging
+from app.services.market_data import get_provider
+from app.utils.cache import NotFoundCache
 
 logger = logging.getLogger(__name__)
 
-def fetch_stock_data(symbol):
+def fetch_stock_data(symbol, fields='full'):
     """
     Fetch stock data from Yahoo Finance
     
     Args:
         symbol (str): Stock ticker symbol
+        fields (str): 'full' for prices plus fundamentals, or 'quote' for prices
+            only. Quote mode skips ticker.info and makes a single history request.
         
     Returns:
         dict: Stock data including current price and previous close
     """
+    if fields == 'quote':
+        return fetch_stock_quote(symbol)
+    
+    if NotFoundCache.contains(symbol):
+        return None
+    
     try:
-        ticker = yf.Ticker(symbol)
+        provider = get_provider()
         
         # Get the basic information
-        info = ticker.info
+        info = provider.info(symbol)
         
-        # Get historical data for the past 2 days to ensure we have previous close
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=5)  # Get 5 days to ensure we have enough data even with weekends
-        hist_data = ticker.history(start=start_date, end=end_date)
+        # Get the last few sessions to ensure we have previous close even with weekends
+        hist_data = provider.history(symbol, period='5d')
         
         # Handle empty data
-        if hist_data.empty:
+        if not hist_data:
             logger.warning(f"No historical data available for {symbol}")
+            remember_if_not_found(symbol)
             return None
         
         # Get the latest data and previous close
-        latest_data = hist_data.iloc[-1]
+        latest_data = hist_data[-1]
         
         # Get previous close (if available)
         previous_close = None
         if len(hist_data) > 1:
-            previous_close = hist_data.iloc[-2]['Close']
+            previous_close = hist_data[-2]['close']
         else:
             # Fallback to info's previous close if available
             previous_close = info.get('previousClose')
@@ -50,12 +55,12 @@ def fetch_stock_data(symbol):
         stock_data = {
             'symbol': symbol,
             'name': info.get('shortName', info.get('longName', symbol)),
-            'current_price': latest_data['Close'],
+            'current_price': latest_data['close'],
             'previous_close': previous_close,
-            'open': latest_data['Open'],
-            'high': latest_data['High'],
-            'low': latest_data['Low'],
-            'volume': latest_data['Volume'],
+            'open': latest_data['open'],
+            'high': latest_data['high'],
+            'low': latest_data['low'],
+            'volume': latest_data['volume'],
             'market_cap': info.get('marketCap'),
             'pe_ratio': info.get('trailingPE'),
             'dividend_yield': info.get('dividendYield'),
@@ -70,6 +75,63 @@ def fetch_stock_data(symbol):
         logger.error(f"Error fetching stock data for {symbol}: {str(e)}")
         return None
 
+def fetch_stock_quote(symbol):
+    """
+    Fetch only the latest prices for a stock, without company fundamentals
+    
+    Args:
+        symbol (str): Stock ticker symbol
+        
+    Returns:
+        dict: symbol, current_price, previous_close, open, high, low, volume and timestamp
+    """
+    if NotFoundCache.contains(symbol):
+        return None
+    
+    try:
+        quote = get_provider().quote(symbol)
+        
+        if not quote:
+            logger.warning(f"No quote data available for {symbol}")
+            remember_if_not_found(symbol)
+            return None
+        
+        return {
+            'symbol': symbol,
+            'current_price': quote['current_price'],
+            'previous_close': quote['previous_close'],
+            'open': quote['open'],
+            'high': quote['high'],
+            'low': quote['low'],
+            'volume': quote['volume'],
+            'timestamp': datetime.now().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error fetching stock quote for {symbol}: {str(e)}")
+        return None
+
+def remember_if_not_found(symbol):
+    """
+    Add a symbol to NotFoundCache if the provider confirms it does not exist
+    
+    Called after an empty response, which may just as well be a network error
+    or rate limit; those must not hide a real symbol for the cache TTL.
+    
+    Returns:
+        bool: True if the symbol was cached as not found
+    """
+    try:
+        exists = get_provider().symbol_exists(symbol)
+    except Exception as e:
+        logger.warning(f"Could not confirm whether {symbol} exists: {str(e)}")
+        return False
+    
+    if exists is False:
+        NotFoundCache.add(symbol)
+        return True
+    return False
+
 def get_historical_data(symbol, period='1mo'):
     """
     Get historical stock data for a specific period
@@ -79,25 +141,10 @@ def get_historical_data(symbol, period='1mo'):
         period (str): Period of historical data (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
         
     Returns:
-        pd.DataFrame: Historical stock data
+        list: Historical stock data as daily bars
     """
     try:
-        ticker = yf.Ticker(symbol)
-        hist_data = ticker.history(period=period)
-        
-        # Convert DataFrame to a dictionary with date strings
-        result = []
-        for date, row in hist_data.iterrows():
-            result.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'open': row['Open'],
-                'high': row['High'],
-                'low': row['Low'],
-                'close': row['Close'],
-                'volume': row['Volume']
-            })
-        
-        return result
+        return get_provider().history(symbol, period=period)
         
     except Exception as e:
         logger.error(f"Error fetching historical data for {symbol}: {str(e)}")
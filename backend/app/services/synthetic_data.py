@@ -0,0 +1,240 @@
+#app/services/synthetic_data.py
+
+import logging
+import string
+from datetime import datetime
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SECTORS = ['Technology', 'Financial Services', 'Healthcare', 'Consumer Cyclical', 'Industrials',
+           'Energy', 'Communication Services', 'Consumer Defensive', 'Utilities', 'Real Estate']
+SOURCES = np.array(['Yahoo Finance', 'Market Watch', 'CNBC', 'Bloomberg', 'Reuters'])
+SOURCE_WEIGHTS = np.array([0.35, 0.2, 0.2, 0.15, 0.1])
+TIME_FRAMES = np.array(['short-term', 'medium-term'])
+TABLES = ('stocks', 'users', 'watchlists', 'sentiment', 'recommendations')
+
+DAY_SECONDS = 86400
+
+def ticker(index):
+    """Deterministic symbol for a stock index (ZAAAA, ZAAAB, ...)"""
+    letters = []
+    for _ in range(4):
+        index, remainder = divmod(index, 26)
+        letters.append(string.ascii_uppercase[remainder])
+    return 'Z' + ''.join(reversed(letters))  # The Z prefix keeps clear of the sample tickers
+
+def popularity(rng, n):
+    """
+    Zipf-like attention weights: a few stocks get most of the news and watchers
+
+    Returns:
+        np.ndarray: Probabilities in random stock order
+    """
+    weights = 1.0 / np.arange(1, n + 1) ** 1.1
+    return rng.permutation(weights / weights.sum())
+
+def to_datetimes(seconds):
+    """Unix seconds array -> list of naive UTC datetimes (None where NaN)"""
+    seconds = np.asarray(seconds, dtype=float)
+    values = np.nan_to_num(seconds).astype('int64').astype('datetime64[s]').astype(datetime).tolist()
+    return [None if np.isnan(s) else value for s, value in zip(seconds, values)]
+
+def news_times(rng, size, start, end):
+    """
+    Publish times weighted towards weekdays and US market hours
+
+    Returns:
+        np.ndarray: Unix seconds
+    """
+    first_day = start // DAY_SECONDS
+    days = np.arange(first_day, end // DAY_SECONDS + 1)
+    weekday = (days + 3) % 7  # 1970-01-01 was a Thursday; 0 is Monday
+    day_weights = np.where(weekday < 5, 1.0, 0.25)
+    day = rng.choice(days, size=size, p=day_weights / day_weights.sum())
+
+    # Most headlines land between 12:00 and 22:00 UTC, the rest anywhere in the day
+    in_session = rng.random(size) < 0.7
+    offset = np.where(in_session, rng.uniform(12, 22, size), rng.uniform(0, 24, size)) * 3600
+    return np.clip(day * DAY_SECONDS + offset.astype(np.int64), start, end)
+
+def sentiment_scores(rng, stock_index, seconds, mood, phase, period):
+    """
+    VADER-like compound scores around each stock's slowly drifting mood
+
+    About a quarter of headlines contain no sentiment words and score exactly 0,
+    as VADER does.
+
+    Returns:
+        tuple: (compound, positive, neutral, negative, label) arrays
+    """
+    size = len(stock_index)
+    drift = 0.25 * np.sin(2 * np.pi * seconds / period[stock_index] + phase[stock_index])
+    compound = np.clip(mood[stock_index] + drift + rng.normal(0, 0.4, size), -0.99, 0.99)
+    compound = np.where(rng.random(size) < 0.25, 0.0, compound).round(4)
+
+    positive = (np.maximum(compound, 0) * 0.45 + rng.uniform(0, 0.08, size)).round(3)
+    negative = (np.maximum(-compound, 0) * 0.45 + rng.uniform(0, 0.08, size)).round(3)
+    neutral = (1 - positive - negative).round(3)
+    label = np.select([compound >= 0.05, compound <= -0.05], ['positive', 'negative'], 'neutral')
+    return compound, positive, neutral, negative, label
+
+def _insert_chunks(db, table, total, make_chunk, chunk_size):
+    """Insert `total` rows built `chunk_size` at a time, committing after each chunk"""
+    inserted = 0
+    for start in range(0, total, chunk_size):
+        rows = make_chunk(start, min(total, start + chunk_size))
+        db.session.execute(table.insert(), rows)
+        db.session.commit()
+        inserted += len(rows)
+        logger.info(f"{table.name}: {inserted}/{total}")
+    return inserted
+
+def generate_dataset(db, stocks, users, sentiment_rows, recommendation_rows, watchlist_size=8,
+                     span_days=365, end=None, seed=42, chunk_size=20000):
+    """
+    Bulk-load a reproducible synthetic dataset for load testing
+
+    Each table draws from its own child of `seed`, so the same seed and
+    arguments always produce the same rows, and changing one table's size does
+    not change the others. Rows go in through Core inserts of `chunk_size` rows.
+    Must run inside an app context against a database without stocks.
+
+    Args:
+        db: Flask-SQLAlchemy instance
+        stocks (int): Number of stocks
+        users (int): Number of users, each with a watchlist
+        sentiment_rows (int): Number of sentiment_data rows
+        recommendation_rows (int): Number of recommendations rows
+        watchlist_size (float): Mean watchlist length
+        span_days (int): Days of history ending at `end`
+        end (datetime, optional): Latest timestamp (default: now, UTC)
+        seed (int): Random seed
+        chunk_size (int): Rows per INSERT
+
+    Returns:
+        dict: Rows inserted per table
+    """
+    from app.models.stock import Stock, user_stocks
+    from app.models.user import User
+    from app.models.sentiment import SentimentData
+    from app.models.recommendation import Recommendation
+
+    if db.session.query(Stock.id).first() is not None:
+        raise ValueError("The stocks table is not empty; generate into a fresh database")
+
+    rngs = dict(zip(TABLES, (np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(len(TABLES)))))
+    updated_at = end or datetime.utcnow()
+    end_seconds = int((updated_at - datetime(1970, 1, 1)).total_seconds())
+    start_seconds = end_seconds - span_days * DAY_SECONDS
+    counts = {}
+
+    # Stocks: lognormal prices; popularity, mood and drift are kept for the rows below
+    rng = rngs['stocks']
+    price = rng.lognormal(4.0, 0.9, stocks).round(2)
+    previous_close = (price / (1 + rng.normal(0, 0.015, stocks))).round(2)
+    sector = rng.choice(len(SECTORS), stocks)
+    weights = popularity(rng, stocks)
+    mood = rng.normal(0.05, 0.15, stocks)
+    phase = rng.uniform(0, 2 * np.pi, stocks)
+    period = rng.uniform(20, 120, stocks) * DAY_SECONDS
+    counts['stocks'] = _insert_chunks(db, Stock.__table__, stocks, lambda lo, hi: [{
+        'symbol': ticker(i),
+        'name': f'Synthetic Company {i}',
+        'sector': SECTORS[sector[i]],
+        'current_price': float(price[i]),
+        'previous_close': float(previous_close[i]),
+        'last_updated': updated_at
+    } for i in range(lo, hi)], chunk_size)
+
+    stock_ids = np.array([row[0] for row in db.session.query(Stock.id).order_by(Stock.id)])
+    symbols = np.array([row[0] for row in db.session.query(Stock.symbol).order_by(Stock.id)])
+
+    # Users share one password so load tests can log in as anyone
+    rng = rngs['users']
+    first_user = (db.session.query(db.func.max(User.id)).scalar() or 0) + 1
+    role = rng.choice(np.array(['user', 'analyst', 'admin']), users, p=[0.9, 0.09, 0.01])
+    joined = rng.integers(start_seconds, end_seconds, users)
+    password_hash = User.hash_password('loadtest123')
+    counts['users'] = _insert_chunks(db, User.__table__, users, lambda lo, hi: [{
+        'username': f'loaduser{first_user + i}',
+        'email': f'loaduser{first_user + i}@example.com',
+        'password_hash': password_hash,
+        'role': str(role[i]),
+        'is_active': True,
+        'created_at': created_at
+    } for i, created_at in zip(range(lo, hi), to_datetimes(joined[lo:hi]))], chunk_size)
+
+    user_ids = np.array([row[0] for row in db.session.query(User.id).filter(User.id >= first_user).order_by(User.id)],
+                        dtype=np.int64)
+
+    # Watchlists: Poisson lengths, popular stocks watched more often, no duplicate pairs
+    rng = rngs['watchlists']
+    lengths = np.minimum(rng.poisson(watchlist_size, len(user_ids)), stocks)
+    owner = np.repeat(np.arange(len(user_ids)), lengths)
+    picked = rng.choice(stocks, size=len(owner), p=weights)
+    pairs = np.unique(owner.astype(np.int64) * stocks + picked)
+    added = rng.integers(start_seconds, end_seconds, len(pairs))
+    counts['watchlists'] = _insert_chunks(db, user_stocks, len(pairs), lambda lo, hi: [{
+        'user_id': int(user_ids[pair // stocks]),
+        'stock_id': int(stock_ids[pair % stocks]),
+        'added_at': added_at
+    } for pair, added_at in zip(pairs[lo:hi], to_datetimes(added[lo:hi]))], chunk_size)
+
+    # Sentiment: news volume follows popularity; created_at trails publication by the scrape delay
+    rng = rngs['sentiment']
+
+    def sentiment_chunk(lo, hi):
+        size = hi - lo
+        stock_index = rng.choice(stocks, size=size, p=weights)
+        published = news_times(rng, size, start_seconds, end_seconds)
+        created = np.minimum(published + rng.exponential(3 * 3600, size).astype(np.int64), end_seconds)
+        compound, positive, neutral, negative, label = sentiment_scores(rng, stock_index, published, mood, phase, period)
+        source = rng.choice(SOURCES, size=size, p=SOURCE_WEIGHTS)
+        # A few feeds omit the publish time
+        published = np.where(rng.random(size) < 0.02, np.nan, published)
+
+        return [{
+            'stock_id': int(stock_ids[stock_index[k]]),
+            'stock_symbol': str(symbols[stock_index[k]]),
+            'source': str(source[k]),
+            'title': f'{symbols[stock_index[k]]} headline {lo + k}',
+            'url': f'https://news.example.com/{symbols[stock_index[k]].lower()}/{lo + k}',
+            'compound_score': float(compound[k]),
+            'positive_score': float(positive[k]),
+            'neutral_score': float(neutral[k]),
+            'negative_score': float(negative[k]),
+            'sentiment_label': str(label[k]),
+            'published_at': published_at,
+            'created_at': created_at
+        } for k, (published_at, created_at) in enumerate(zip(to_datetimes(published), to_datetimes(created)))]
+
+    counts['sentiment'] = _insert_chunks(db, SentimentData.__table__, sentiment_rows, sentiment_chunk, chunk_size)
+
+    # Recommendations: snapshot refreshes spread over the span, type following the stock's mood
+    rng = rngs['recommendations']
+
+    def recommendation_chunk(lo, hi):
+        size = hi - lo
+        stock_index = rng.choice(stocks, size=size, p=weights)
+        created = rng.integers(start_seconds, end_seconds, size)
+        signal = mood[stock_index] + 0.25 * np.sin(2 * np.pi * created / period[stock_index] + phase[stock_index])
+        signal = signal + rng.normal(0, 0.15, size)
+        rec_type = np.select([signal > 0.2, signal < -0.1], ['buy', 'sell'], 'hold')
+        confidence = np.clip(0.5 + np.abs(signal) * rng.uniform(0.5, 1.5, size), 0.5, 0.95).round(2)
+        target = np.select([rec_type == 'buy', rec_type == 'sell'], [1.1, 0.9], 1.0) * price[stock_index]
+        time_frame = rng.choice(TIME_FRAMES, size=size, p=[0.7, 0.3])
+
+        return [{
+            'stock_id': int(stock_ids[stock_index[k]]),
+            'type': str(rec_type[k]),
+            'confidence_score': float(confidence[k]),
+            'reason': f'Synthetic {rec_type[k]} signal for {symbols[stock_index[k]]}.',
+            'price_target': round(float(target[k]), 2),
+            'time_frame': str(time_frame[k]),
+            'created_at': created_at
+        } for k, created_at in enumerate(to_datetimes(created))]
+
+    counts['recommendations'] = _insert_chunks(db, Recommendation.__table__, recommendation_rows,
+                                               recommendation_chunk, chunk_size)
+    return counts
@@ -1,6 +1,8 @@
-from flask import request, jsonify, current_app
+from flask import request, jsonify, current_app, g
 from functools import wraps
+from dataclasses import dataclass, asdict
 from app.models.user import User
+from app.utils.cache import PrincipalCache
 import jwt
 from datetime import datetime, timedelta
 import os
@@ -8,13 +10,36 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+@dataclass(frozen=True)
+class Principal:
+    """
+    Read-only snapshot of the authenticated user passed to protected routes.
+    
+    Routes that modify the user must load the ORM User by id.
+    """
+    id: int
+    username: str
+    email: str
+    role: str
+    is_active: bool
+    created_at: str
+    
+    @classmethod
+    def from_user(cls, user):
+        return cls(**user.to_dict())
+    
+    def to_dict(self):
+        return asdict(self)
+
 def generate_token(user_id):
     """Generate JWT token for authentication"""
     
-    expiration = datetime.utcnow() + timedelta(days=1)  # Token expires in 1 day
+    issued_at = datetime.utcnow()
+    expiration = issued_at + timedelta(days=1)  # Token expires in 1 day
     
     payload = {
         'user_id': user_id,
+        'iat': issued_at,
         'exp': expiration
     }
     
@@ -26,6 +51,21 @@ def generate_token(user_id):
     
     return token
 
+def bearer_token_user_id():
+    """User id from the request's bearer token, or None when it is missing, invalid or expired"""
+    auth_header = request.headers.get('Authorization')
+    if not auth_header or not auth_header.startswith('Bearer '):
+        return None
+    try:
+        payload = jwt.decode(
+            auth_header.split(' ')[1],
+            os.environ.get('SECRET_KEY', 'dev-key-change-in-production'),
+            algorithms=['HS256']
+        )
+    except jwt.InvalidTokenError:
+        return None
+    return payload.get('user_id')
+
 def token_required(f):
     """Decorator to protect routes"""
     @wraps(f)
@@ -48,15 +88,23 @@ def token_required(f):
                 algorithms=['HS256']
             )
             
-            # Get user from token
-            current_user = User.query.get(payload['user_id'])
+            # Get user from token, from the principal cache when possible
+            current_user = PrincipalCache.get(payload['user_id'], payload.get('iat'))
             
-            if not current_user:
-                return jsonify({'error': 'User not found'}), 401
+            if current_user is None:
+                user = User.query.get(payload['user_id'])
+                if not user:
+                    return jsonify({'error': 'User not found'}), 401
+                
+                current_user = Principal.from_user(user)
+                PrincipalCache.set(payload['user_id'], payload.get('iat'), current_user)
                 
             if not current_user.is_active:
                 return jsonify({'error': 'User account is inactive'}), 403
             
+            # Lets read replica routing keep this user's reads on the primary after a write
+            g.current_user = current_user
+            
         except jwt.ExpiredSignatureError:
             return jsonify({'error': 'Token has expired'}), 401
         except jwt.InvalidTokenError:
@@ -1,49 +1,566 @@
-from datetime import datetime, timedelta
+import logging
+import secrets
+import threading
+import time
+from datetime import datetime
+from flask import current_app, has_app_context
+from app.utils.cache_backends import MemoryBackend, create_cache_backend
+
+logger = logging.getLogger(__name__)
 
 class StockCache:
-    """Simple in-memory cache for stock data with time-to-live functionality"""
-    _cache = {}  # symbol -> (data, timestamp)
-    
+    """
+    Stock data cache with per-entry time-to-live on a pluggable backend.
+
+    The default in-process backend is a bounded LRU on the monotonic clock.
+    The sqlite and redis backends share entries between worker processes
+    (see app/utils/cache_backends.py). Expired entries are dropped lazily
+    when read and by a periodic sweep.
+
+    get_or_load() adds stale-while-revalidate: for stale_ttl seconds past its
+    time-to-live an entry is still served while one background refresh
+    reloads it. With refresh-ahead enabled, hot keys are reloaded shortly
+    before they expire so readers never see the TTL boundary.
+    """
+    _backend = MemoryBackend(max_size=1024)
+    _lock = threading.Lock()
+
+    default_ttl = 15 * 60  # seconds
+    stale_ttl = 5 * 60  # seconds a stale entry may be served while it is refreshed
+    purge_interval = 60  # seconds between full sweeps of expired entries
+    refresh_ahead_hits = 0  # accesses per TTL window that make a key hot; 0 disables refresh-ahead
+    refresh_ahead_ratio = 0.8  # fraction of the TTL after which hot keys are refreshed
+    clock = staticmethod(time.monotonic)  # access window and purge timing; injectable for tests
+
+    _last_purge = time.monotonic()
+    _stats = {'hits': 0, 'misses': 0, 'stale_hits': 0, 'refreshes': 0, 'refresh_ahead': 0, 'refresh_errors': 0}
+    _refreshing = set()
+    _access_counts = {}
+    _access_window_start = time.monotonic()
+
     @classmethod
-    def get(cls, symbol, max_age_minutes=15):
+    def configure(cls, max_size=None, default_ttl=None, purge_interval=None, backend=None,
+                  stale_ttl=None, refresh_ahead_hits=None, refresh_ahead_ratio=None, clock=None):
+        """
+        Update cache limits and storage
+
+        Args:
+            max_size (int, optional): Maximum number of entries before eviction
+            default_ttl (float, optional): Default time-to-live in seconds
+            purge_interval (float, optional): Seconds between sweeps of expired entries
+            backend (object, optional): Storage backend from app.utils.cache_backends
+            stale_ttl (float, optional): Seconds past expiry that get_or_load may serve stale data
+            refresh_ahead_hits (int, optional): Accesses per TTL window that trigger refresh-ahead (0 disables)
+            refresh_ahead_ratio (float, optional): Fraction of the TTL after which hot keys are refreshed
+            clock (callable, optional): Monotonic time source for access windows and purges
+        """
+        with cls._lock:
+            if backend is not None:
+                cls._backend = backend
+            if default_ttl is not None:
+                cls.default_ttl = default_ttl
+            if purge_interval is not None:
+                cls.purge_interval = purge_interval
+            if stale_ttl is not None:
+                cls.stale_ttl = stale_ttl
+            if refresh_ahead_hits is not None:
+                cls.refresh_ahead_hits = refresh_ahead_hits
+            if refresh_ahead_ratio is not None:
+                cls.refresh_ahead_ratio = refresh_ahead_ratio
+            if clock is not None:
+                cls.clock = staticmethod(clock)
+                cls._last_purge = cls._access_window_start = clock()
+                cls._access_counts.clear()
+        if max_size is not None:
+            cls._backend.resize(max_size)
+
+    @classmethod
+    def configure_from_config(cls, config):
+        """Configure the cache from Flask app config (STOCK_CACHE_* keys)"""
+        backend = create_cache_backend(
+            config.get('STOCK_CACHE_BACKEND', 'memory'),
+            max_size=config.get('STOCK_CACHE_MAX_SIZE', 1024),
+            path=config.get('STOCK_CACHE_PATH'),
+            url=config.get('STOCK_CACHE_URL')
+        )
+        cls.configure(
+            default_ttl=config.get('STOCK_CACHE_TTL_SECONDS'),
+            stale_ttl=config.get('STOCK_CACHE_STALE_SECONDS'),
+            refresh_ahead_hits=config.get('STOCK_CACHE_REFRESH_AHEAD_HITS'),
+            backend=backend
+        )
+
+    @classmethod
+    def get(cls, symbol, max_age_minutes=None):
         """
         Get cached stock data if not expired
-        
+
         Args:
             symbol (str): Stock symbol
-            max_age_minutes (int): Maximum age of cached data in minutes
-            
+            max_age_minutes (int, optional): Maximum age of cached data in minutes,
+                on top of the entry's own time-to-live
+
         Returns:
             dict or None: Cached stock data if valid, None otherwise
         """
-        if symbol in cls._cache:
-            data, timestamp = cls._cache[symbol]
-            age = datetime.now() - timestamp
-            if age < timedelta(minutes=max_age_minutes):
-                return data
-        return None
-    
+        entry = cls._lookup(symbol)
+        if entry is None:
+            cls._count('misses')
+            return None
+
+        data, age, ttl = entry
+        if age >= ttl or (max_age_minutes is not None and age >= max_age_minutes * 60):
+            cls._count('misses')
+            return None
+
+        cls._count('hits')
+        return data
+
     @classmethod
-    def set(cls, symbol, data):
+    def get_or_load(cls, symbol, loader, ttl_seconds=None):
+        """
+        Get cached stock data, serving stale data while it is refreshed in the background
+
+        Args:
+            symbol (str): Stock symbol
+            loader (callable): Returns fresh data for the symbol, or None if it does not exist
+            ttl_seconds (float, optional): Time-to-live for loaded data, defaults to default_ttl
+
+        Returns:
+            tuple: (data, from_cache). data is None when the loader found nothing.
+        """
+        entry = cls._lookup(symbol)
+        if entry is not None:
+            data, age, ttl = entry
+            if age < ttl:
+                cls._count('hits')
+                if cls._is_hot(symbol) and age >= ttl * cls.refresh_ahead_ratio:
+                    if cls._refresh_in_background(symbol, loader, ttl_seconds):
+                        cls._count('refresh_ahead')
+                return data, True
+
+            # Stale but within the grace window: serve it and refresh once in the background
+            cls._count('stale_hits')
+            cls._refresh_in_background(symbol, loader, ttl_seconds)
+            return data, True
+
+        cls._count('misses')
+        data = loader()
+        if data is not None:
+            cls.set(symbol, data, ttl_seconds)
+        return data, False
+
+    @classmethod
+    def set(cls, symbol, data, ttl_seconds=None):
         """
         Cache stock data with current timestamp
-        
+
         Args:
             symbol (str): Stock symbol
             data (dict): Stock data to cache
+            ttl_seconds (float, optional): Time-to-live for this entry, defaults to default_ttl
         """
-        cls._cache[symbol] = (data, datetime.now())
-    
+        cls._maybe_purge()
+        ttl = ttl_seconds if ttl_seconds is not None else cls.default_ttl
+        # Entries outlive their TTL by the stale window so get_or_load can still serve them
+        cls._backend.set(symbol, [data, ttl], ttl + cls.stale_ttl)
+
     @classmethod
     def clear(cls, symbol=None):
         """
         Clear cache for a specific symbol or all symbols
-        
+
         Args:
             symbol (str, optional): Stock symbol to clear from cache. If None, clear all.
         """
         if symbol:
-            if symbol in cls._cache:
-                del cls._cache[symbol]
+            cls._backend.delete(symbol)
         else:
-            cls._cache.clear() 
\ No newline at end of file
+            cls._backend.clear()
+
+    @classmethod
+    def purge_expired(cls):
+        """
+        Remove every expired entry
+
+        Returns:
+            int: Number of entries removed
+        """
+        with cls._lock:
+            cls._last_purge = cls.clock()
+        return cls._backend.purge_expired()
+
+    @classmethod
+    def stats(cls):
+        """
+        Get cache counters
+
+        Returns:
+            dict: hits and misses for this process plus backend size, eviction and expiration counters
+        """
+        with cls._lock:
+            stats = dict(cls._stats)
+            stats['default_ttl'] = cls.default_ttl
+            stats['stale_ttl'] = cls.stale_ttl
+            stats['refreshing'] = len(cls._refreshing)
+        stats.update(cls._backend.stats())
+
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    @classmethod
+    def reset_stats(cls):
+        """Reset hit/miss counters"""
+        with cls._lock:
+            for key in cls._stats:
+                cls._stats[key] = 0
+
+    @classmethod
+    def _lookup(cls, symbol):
+        """Get (data, age, ttl) for a stored entry, including stale ones"""
+        cls._maybe_purge()
+        entry = cls._backend.get(symbol)
+        if entry is None:
+            return None
+        (data, ttl), age = entry
+        return data, age, ttl
+
+    @classmethod
+    def _is_hot(cls, symbol):
+        """Count an access and report whether the key qualifies for refresh-ahead"""
+        if not cls.refresh_ahead_hits:
+            return False
+
+        now = cls.clock()
+        with cls._lock:
+            if now - cls._access_window_start >= cls.default_ttl:
+                cls._access_counts.clear()
+                cls._access_window_start = now
+            count = cls._access_counts.get(symbol, 0) + 1
+            cls._access_counts[symbol] = count
+        return count >= cls.refresh_ahead_hits
+
+    @classmethod
+    def _refresh_in_background(cls, symbol, loader, ttl_seconds):
+        """Start a single background reload for a key; returns False if one is already running"""
+        with cls._lock:
+            if symbol in cls._refreshing:
+                return False
+            cls._refreshing.add(symbol)
+
+        app = current_app._get_current_object() if has_app_context() else None
+
+        def refresh():
+            try:
+                if app is not None:
+                    with app.app_context():
+                        data = loader()
+                else:
+                    data = loader()
+                if data is not None:
+                    cls.set(symbol, data, ttl_seconds)
+                else:
+                    cls.clear(symbol)
+                cls._count('refreshes')
+            except Exception as e:
+                cls._count('refresh_errors')
+                logger.error(f"Error refreshing cache entry for {symbol}: {str(e)}")
+            finally:
+                with cls._lock:
+                    cls._refreshing.discard(symbol)
+
+        threading.Thread(target=refresh, name=f"stock-cache-refresh-{symbol}", daemon=True).start()
+        return True
+
+    @classmethod
+    def _count(cls, counter):
+        with cls._lock:
+            cls._stats[counter] += 1
+
+    @classmethod
+    def _maybe_purge(cls):
+        now = cls.clock()
+        with cls._lock:
+            due = now - cls._last_purge >= cls.purge_interval
+            if due:
+                cls._last_purge = now
+        if due:
+            cls._backend.purge_expired()
+
+
+class NotFoundCache:
+    """
+    Short-lived negative cache of symbols the market data provider did not know.
+
+    Kept apart from StockCache so typo-driven lookups can never crowd out real
+    entries. Only symbols the provider confirmed as unknown are cached, never
+    empty responses or errors (see stock_service.remember_if_not_found).
+
+    With the sqlite or redis backend every worker sees clear(), so a stock an
+    admin just added is found everywhere at once. The default memory backend
+    is per process: other workers keep answering "not found" for up to ttl.
+    """
+    _backend = MemoryBackend(max_size=4096)
+    ttl = 5 * 60  # seconds
+
+    @classmethod
+    def configure(cls, max_size=None, ttl=None, backend=None):
+        """
+        Update negative cache limits and storage
+
+        Args:
+            max_size (int, optional): Maximum number of remembered symbols
+            ttl (float, optional): Seconds a symbol stays marked as not found
+            backend (object, optional): Storage backend from app.utils.cache_backends
+        """
+        if backend is not None:
+            cls._backend = backend
+        if ttl is not None:
+            cls.ttl = ttl
+        if max_size is not None:
+            cls._backend.resize(max_size)
+
+    @classmethod
+    def configure_from_config(cls, config):
+        """Configure the cache from Flask app config, sharing the StockCache backend kind"""
+        max_size = config.get('NOT_FOUND_CACHE_MAX_SIZE', 4096)
+        backend = create_cache_backend(
+            config.get('STOCK_CACHE_BACKEND', 'memory'),
+            max_size=max_size,
+            path=config.get('STOCK_CACHE_PATH'),
+            url=config.get('STOCK_CACHE_URL'),
+            namespace='not_found_cache'
+        )
+        cls.configure(max_size=max_size, ttl=config.get('NOT_FOUND_CACHE_TTL_SECONDS'), backend=backend)
+
+    @classmethod
+    def contains(cls, symbol):
+        """Check whether a symbol was recently reported as not found"""
+        return cls._backend.get(symbol.upper()) is not None
+
+    @classmethod
+    def add(cls, symbol):
+        """Remember that a symbol was not found"""
+        cls._backend.set(symbol.upper(), True, cls.ttl)
+
+    @classmethod
+    def clear(cls, symbol=None):
+        """Forget one symbol, or every symbol if none is given"""
+        if symbol:
+            cls._backend.delete(symbol.upper())
+        else:
+            cls._backend.clear()
+
+    @classmethod
+    def stats(cls):
+        stats = cls._backend.stats()
+        stats['ttl'] = cls.ttl
+        return stats
+
+
+class PrincipalCache:
+    """
+    Short-lived cache of authenticated user snapshots, keyed by (user_id, token iat, generation).
+
+    Lets token_required skip the per-request user lookup. invalidate() gives the
+    user a new random generation, so every cached token for that user misses at
+    once, and the orphaned snapshots age out of the LRU. Snapshots stay in this
+    process; generations live in a backend of the StockCache kind, so with the
+    sqlite or redis backend an invalidation reaches every worker. A generation
+    only has to outlive the snapshots cached before it was set, so it expires
+    after twice the ttl, and the store is bounded by max_size like the snapshots.
+    """
+    _backend = MemoryBackend(max_size=1024)
+    _generations = MemoryBackend(max_size=1024)
+    ttl = 60  # seconds
+    _lock = threading.Lock()
+    _stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    @classmethod
+    def configure(cls, max_size=None, ttl=None, generations=None):
+        """
+        Update principal cache limits and generation storage
+
+        Args:
+            max_size (int, optional): Maximum number of cached (user, token) pairs
+            ttl (float, optional): Seconds a snapshot is trusted before the user is reloaded
+            generations (object, optional): Backend from app.utils.cache_backends holding per-user generations
+        """
+        if generations is not None:
+            cls._generations = generations
+        if ttl is not None:
+            cls.ttl = ttl
+        if max_size is not None:
+            cls._backend.resize(max_size)
+            cls._generations.resize(max_size)
+
+    @classmethod
+    def configure_from_config(cls, config):
+        """Configure the cache from Flask app config, sharing generations through the StockCache backend kind"""
+        max_size = config.get('PRINCIPAL_CACHE_MAX_SIZE', 1024)
+        generations = create_cache_backend(
+            config.get('STOCK_CACHE_BACKEND', 'memory'),
+            max_size=max_size,
+            path=config.get('STOCK_CACHE_PATH'),
+            url=config.get('STOCK_CACHE_URL'),
+            namespace='principal_generation'
+        )
+        cls.configure(max_size=max_size, ttl=config.get('PRINCIPAL_CACHE_TTL_SECONDS'), generations=generations)
+
+    @classmethod
+    def _key(cls, user_id, issued_at):
+        entry = cls._generations.get(str(user_id))
+        return (user_id, issued_at, entry[0] if entry else '')
+
+    @classmethod
+    def get(cls, user_id, issued_at):
+        """Get a cached principal, or None (counted as a hit or a miss)"""
+        entry = cls._backend.get(cls._key(user_id, issued_at)) if cls.ttl > 0 else None
+        with cls._lock:
+            cls._stats['hits' if entry else 'misses'] += 1
+        return entry[0] if entry else None
+
+    @classmethod
+    def set(cls, user_id, issued_at, principal):
+        if cls.ttl > 0:
+            cls._backend.set(cls._key(user_id, issued_at), principal, cls.ttl)
+
+    @classmethod
+    def invalidate(cls, user_id):
+        """Drop every cached token for a user, in every worker sharing the generation backend"""
+        if cls.ttl > 0:
+            cls._generations.set(str(user_id), secrets.token_hex(8), cls.ttl * 2)
+        with cls._lock:
+            cls._stats['invalidations'] += 1
+
+    @classmethod
+    def clear(cls):
+        cls._backend.clear()
+        cls._generations.clear()
+
+    @classmethod
+    def stats(cls):
+        stats = cls._backend.stats()
+        with cls._lock:
+            stats.update(cls._stats)
+        stats['ttl'] = cls.ttl
+        stats['generations'] = cls._generations.stats()
+        return stats
+
+
+class RecommendationCache:
+    """
+    Per-process record of when each stock's recommendation inputs last changed.
+
+    A stored recommendation younger than RECOMMENDATION_FRESH_SECONDS is reused
+    without re-checking its inputs, unless this worker has seen its stock's
+    sentiment or price change since it was created. Marks older than the fresh
+    window can no longer matter, so they expire after ttl seconds. Other workers
+    only learn of a change through the input fingerprint once the window ends.
+    """
+    _backend = MemoryBackend(max_size=4096)
+    ttl = 5 * 60  # seconds, RECOMMENDATION_FRESH_SECONDS
+    _stats = {'invalidations': 0, 'rejected': 0}
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, max_size=None, ttl=None):
+        """
+        Update limits
+
+        Args:
+            max_size (int, optional): Maximum number of stocks with a pending change mark
+            ttl (float, optional): Fresh window in seconds
+        """
+        if ttl is not None:
+            cls.ttl = ttl
+        if max_size is not None:
+            cls._backend.resize(max_size)
+
+    @classmethod
+    def invalidate(cls, stock_id):
+        """Mark a stock's inputs as changed now, so recommendations created before are no longer fresh"""
+        if cls.ttl > 0:
+            cls._backend.set(stock_id, datetime.utcnow(), cls.ttl)
+        with cls._lock:
+            cls._stats['invalidations'] += 1
+
+    @classmethod
+    def settle(cls, stock_id, created_at):
+        """Forget a change mark once a recommendation created after it exists"""
+        entry = cls._backend.get(stock_id)
+        if entry and created_at and entry[0] <= created_at:
+            cls._backend.delete(stock_id)
+
+    @classmethod
+    def is_fresh(cls, stock_id, created_at):
+        """
+        Check that a stock's inputs have not changed since created_at (naive UTC)
+
+        The caller still checks the recommendation's age against the fresh window.
+        """
+        entry = cls._backend.get(stock_id)
+        if entry and (created_at is None or entry[0] >= created_at):
+            with cls._lock:
+                cls._stats['rejected'] += 1
+            return False
+        return True
+
+    @classmethod
+    def clear(cls, stock_id=None):
+        if stock_id is not None:
+            cls._backend.delete(stock_id)
+        else:
+            cls._backend.clear()
+
+    @classmethod
+    def stats(cls):
+        stats = cls._backend.stats()
+        with cls._lock:
+            stats.update(cls._stats)
+        stats['ttl'] = cls.ttl
+        return stats
+
+
+def _on_stock_changed(event_name, payload):
+    from app.services.indicator_service import IndicatorCache
+    StockCache.clear(payload['symbol'])
+    IndicatorCache.clear(payload['symbol'])  # An intraday price moves the last bar without changing its date
+    RecommendationCache.invalidate(payload['id'])
+
+
+def _on_stock_created(event_name, payload):
+    StockCache.clear(payload['symbol'])
+    NotFoundCache.clear(payload['symbol'])
+
+
+def _on_stock_deleted(event_name, payload):
+    from app.services.indicator_service import IndicatorCache
+    StockCache.clear(payload['symbol'])
+    IndicatorCache.clear(payload['symbol'])
+    RecommendationCache.clear(payload['id'])
+
+
+def _on_sentiment_inserted(event_name, payload):
+    RecommendationCache.invalidate(payload['stock_id'])
+
+
+def _on_recommendation_created(event_name, payload):
+    RecommendationCache.settle(payload['stock_id'], payload.get('created_at'))
+
+
+def _on_user_changed(event_name, payload):
+    PrincipalCache.invalidate(payload['id'])
+
+
+def register_cache_invalidation():
+    """Keep the stock, recommendation and principal caches consistent with database writes published on the event bus"""
+    from app.utils import events
+    events.subscribe(events.STOCK_CREATED, _on_stock_created)
+    events.subscribe(events.STOCK_UPDATED, _on_stock_changed)
+    events.subscribe(events.STOCK_DELETED, _on_stock_deleted)
+    events.subscribe(events.SENTIMENT_INSERTED, _on_sentiment_inserted)
+    events.subscribe(events.RECOMMENDATION_CREATED, _on_recommendation_created)
+    events.subscribe(events.USER_UPDATED, _on_user_changed)
+    events.subscribe(events.USER_DELETED, _on_user_changed)
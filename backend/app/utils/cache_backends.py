@@ -0,0 +1,350 @@
+#app/utils/cache_backends.py
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the encoded entry layout changes; entries written with another
+# version are treated as misses instead of being decoded incorrectly.
+CACHE_FORMAT_VERSION = 2
+
+_FLAG_ZLIB = 0x01
+_COMPRESS_THRESHOLD = 512  # bytes of JSON before compression pays off
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def _check_encodable(value, path='value'):
+    """Raise TypeError unless value survives a JSON round trip unchanged"""
+    if isinstance(value, _JSON_SCALARS):
+        return
+    if isinstance(value, list):
+        for index, item in enumerate(value):
+            _check_encodable(item, f'{path}[{index}]')
+        return
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise TypeError(f'Cache keys must be strings, got {type(key).__name__} key in {path}')
+            _check_encodable(item, f'{path}[{key!r}]')
+        return
+    # Tuples would come back as lists and other objects as strings, so refuse them
+    raise TypeError(f'Cannot cache {type(value).__name__} at {path}; use JSON types (dict, list, str, number, bool, None)')
+
+
+def encode_entry(value, stored_at):
+    """
+    Encode a cache entry as compact bytes
+
+    Layout: one version byte, one flags byte, then JSON ``[stored_at, value]``,
+    zlib-compressed when larger than a few hundred bytes.
+
+    Raises:
+        TypeError: If value contains anything but dicts with string keys, lists,
+            strings, numbers, booleans and None
+    """
+    _check_encodable(value)
+    payload = json.dumps([stored_at, value], separators=(',', ':')).encode('utf-8')
+    flags = 0
+    if len(payload) > _COMPRESS_THRESHOLD:
+        payload = zlib.compress(payload)
+        flags |= _FLAG_ZLIB
+    return bytes([CACHE_FORMAT_VERSION, flags]) + payload
+
+
+def decode_entry(blob):
+    """
+    Decode bytes produced by encode_entry
+
+    Returns:
+        tuple: (value, stored_at)
+
+    Raises:
+        ValueError: If the entry was written with a different format version
+    """
+    if not blob or blob[0] != CACHE_FORMAT_VERSION:
+        raise ValueError('Unsupported cache entry version')
+    payload = blob[2:]
+    if blob[1] & _FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    stored_at, value = json.loads(payload)
+    return value, stored_at
+
+
+class MemoryBackend:
+    """
+    Per-process LRU storage with per-entry TTL on the monotonic clock.
+
+    Values are kept as Python objects, so nothing is serialized.
+    """
+
+    name = 'memory'
+
+    def __init__(self, max_size=1024, clock=time.monotonic):
+        self.max_size = max_size
+        self.clock = clock  # Seconds on a monotonic scale; injectable for tests
+        self._entries = OrderedDict()  # key -> (value, stored_at, ttl_seconds)
+        self._lock = threading.RLock()
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key):
+        """
+        Get a live entry
+
+        Returns:
+            tuple or None: (value, age_seconds) if present and not expired
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, stored_at, ttl = entry
+            age = now - stored_at
+            if age >= ttl:
+                del self._entries[key]
+                self._expirations += 1
+                return None
+
+            self._entries.move_to_end(key)
+            return value, age
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, self.clock(), ttl)
+            self._entries.move_to_end(key)
+            self._evict_overflow()
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def purge_expired(self):
+        now = self.clock()
+        with self._lock:
+            expired = [
+                key for key, (_, stored_at, ttl) in self._entries.items()
+                if now - stored_at >= ttl
+            ]
+            for key in expired:
+                del self._entries[key]
+            self._expirations += len(expired)
+            return len(expired)
+
+    def resize(self, max_size):
+        with self._lock:
+            self.max_size = max_size
+            self._evict_overflow()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': self.name,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'evictions': self._evictions,
+                'expirations': self._expirations
+            }
+
+    def _evict_overflow(self):
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+
+class SQLiteBackend:
+    """
+    Host-wide storage in a SQLite file shared by every worker process.
+
+    Ages use wall-clock time because monotonic clocks are not comparable
+    across processes. Every write evicts the oldest entries beyond max_size,
+    and the periodic purge drops expired ones.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path=None, max_size=1024, table='stock_cache'):
+        self.path = path or os.path.join(tempfile.gettempdir(), 'stock_cache.sqlite3')
+        self.max_size = max_size
+        self.table = table
+        self._local = threading.local()
+        self._evictions = 0
+        self._expirations = 0
+
+        conn = self._connection()
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "stored_at REAL NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{self.table}_stored_at ON {self.table} (stored_at)")
+
+    def _connection(self):
+        # One connection per thread and per process (connections must not cross a fork)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute(
+            f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        blob, expires_at = row
+        if expires_at <= now:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ? AND expires_at <= ?", (key, now))
+            self._expirations += 1
+            return None
+
+        try:
+            value, stored_at = decode_entry(blob)
+        except ValueError:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            return None
+        return value, max(0.0, now - stored_at)
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, stored_at, expires_at) VALUES (?, ?, ?, ?)",
+            (key, encode_entry(value, now), now, now + ttl)
+        )
+        self._evict_overflow(conn)
+
+    def delete(self, key):
+        self._connection().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self):
+        self._connection().execute(f"DELETE FROM {self.table}")
+
+    def purge_expired(self):
+        conn = self._connection()
+        removed = conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),)).rowcount
+        self._expirations += removed
+        self._evict_overflow(conn)
+        return removed
+
+    def resize(self, max_size):
+        self.max_size = max_size
+        self.purge_expired()
+
+    def stats(self):
+        return {
+            'backend': self.name,
+            'path': self.path,
+            'size': self._size(self._connection()),
+            'max_size': self.max_size,
+            'evictions': self._evictions,
+            'expirations': self._expirations
+        }
+
+    def _size(self, conn):
+        return conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def _evict_overflow(self, conn):
+        # Keep the newest max_size entries; the stored_at index makes this a short scan
+        self._evictions += conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN "
+            f"(SELECT key FROM {self.table} ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_size,)
+        ).rowcount
+
+
+class RedisBackend:
+    """
+    Multi-node storage on any Redis-protocol server (Redis, Valkey, KeyDB, ...).
+
+    Expiry is delegated to the server via PX; size limits are the server's
+    maxmemory policy. Requires the optional ``redis`` package.
+    """
+
+    name = 'redis'
+
+    def __init__(self, url='redis://localhost:6379/0', prefix='stock_cache:', client=None):
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("The redis cache backend requires the 'redis' package (pip install redis)")
+            client = redis.Redis.from_url(url)
+
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        blob = self.client.get(self.prefix + key)
+        if blob is None:
+            return None
+        try:
+            value, stored_at = decode_entry(blob)
+        except ValueError:
+            self.client.delete(self.prefix + key)
+            return None
+        return value, max(0.0, time.time() - stored_at)
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, encode_entry(value, time.time()), px=max(1, int(ttl * 1000)))
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + '*', count=500))
+        if keys:
+            self.client.delete(*keys)
+
+    def purge_expired(self):
+        return 0  # The server expires keys itself
+
+    def resize(self, max_size):
+        pass
+
+    def stats(self):
+        return {
+            'backend': self.name,
+            'prefix': self.prefix
+        }
+
+
+def create_cache_backend(kind='memory', max_size=1024, path=None, url=None, namespace='stock_cache'):
+    """
+    Create a cache backend by name
+
+    Args:
+        kind (str): memory, sqlite or redis
+        max_size (int): Maximum number of entries (memory and sqlite)
+        path (str, optional): SQLite file shared by workers on one host
+        url (str, optional): Redis URL for multi-node deployments
+        namespace (str): SQLite table or Redis key prefix, so several caches can share one store
+    """
+    kind = (kind or 'memory').lower()
+    if kind == 'memory':
+        return MemoryBackend(max_size=max_size)
+    if kind == 'sqlite':
+        return SQLiteBackend(path=path, max_size=max_size, table=namespace)
+    if kind == 'redis':
+        return RedisBackend(url=url or 'redis://localhost:6379/0', prefix=f'{namespace}:')
+    raise ValueError(f"Unknown cache backend: {kind}")
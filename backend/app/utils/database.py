@@ -0,0 +1,107 @@
+#app/utils/database.py
+
+import os
+import sqlite3
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import StaticPool
+
+def build_database_uri():
+    """
+    Build the SQLAlchemy database URI from the environment
+
+    DATABASE_URL wins when set. Otherwise DB_ENGINE selects:
+        mysql (default): DB_USER, DB_PASSWORD, DB_HOST and DB_NAME
+        sqlite: DB_PATH (default stock_sentiment.db), or ':memory:' for an in-memory database
+
+    Returns:
+        str: Database URI
+    """
+    if os.environ.get('DATABASE_URL'):
+        return os.environ['DATABASE_URL']
+
+    if os.environ.get('DB_ENGINE', 'mysql').lower() == 'sqlite':
+        path = os.environ.get('DB_PATH', 'stock_sentiment.db')
+        return 'sqlite://' if path == ':memory:' else f"sqlite:///{os.path.abspath(path)}"
+
+    return f"mysql+pymysql://{os.environ.get('DB_USER', 'root')}:{os.environ.get('DB_PASSWORD', '')}@{os.environ.get('DB_HOST', 'localhost')}/{os.environ.get('DB_NAME', 'stock_sentiment')}"
+
+def is_memory_sqlite(database_uri):
+    return database_uri in ('sqlite://', 'sqlite:///:memory:') or 'mode=memory' in database_uri
+
+def sqlite_engine_options(database_uri):
+    """
+    Engine options for SQLite
+
+    An in-memory database exists only as long as its connection, so every
+    thread shares one connection through StaticPool.
+    """
+    if is_memory_sqlite(database_uri):
+        return {
+            'poolclass': StaticPool,
+            'connect_args': {'check_same_thread': False}
+        }
+    return {'connect_args': {'check_same_thread': False}}
+
+@event.listens_for(Engine, 'connect')
+def _configure_sqlite(dbapi_connection, connection_record):
+    """Apply pragmas to every new SQLite connection; other databases are untouched"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers run alongside the single writer (not available in memory)
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA foreign_keys=ON')  # Match MySQL's enforced foreign keys
+    cursor.execute('PRAGMA busy_timeout=30000')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA cache_size=-65536')  # 64 MB page cache
+    cursor.close()
+
+MYSQL_DUPLICATE_ENTRY = 1062  # ER_DUP_ENTRY
+
+def insert_ignore(session, table, rows):
+    """
+    Insert rows, skipping any that duplicate an existing primary or unique key
+
+    Uses INSERT ... ON CONFLICT DO NOTHING on SQLite and PostgreSQL, which only
+    covers uniqueness conflicts. MySQL's INSERT IGNORE would also turn foreign
+    key, NOT NULL and truncation errors into warnings, and ON DUPLICATE KEY
+    UPDATE cannot report whether a row was inserted because SQLAlchemy's MySQL
+    drivers count matched rather than changed rows. So on MySQL each row is a
+    plain INSERT in a savepoint, and only a duplicate key error is skipped.
+    Either way there is no check-then-insert race, and every other constraint
+    violation raises IntegrityError.
+
+    Args:
+        session: SQLAlchemy session
+        table: Table to insert into
+        rows (dict or list): Row values
+
+    Returns:
+        int: Number of rows actually inserted
+    """
+    dialect = session.get_bind().dialect.name
+    rows = [rows] if isinstance(rows, dict) else rows
+
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table).on_conflict_do_nothing()
+        return sum(session.execute(stmt.values(**row)).rowcount for row in rows)
+
+    inserted = 0
+    for row in rows:
+        try:
+            with session.begin_nested():
+                session.execute(table.insert().values(**row))
+        except IntegrityError as e:
+            if getattr(e.orig, 'args', (None,))[0] != MYSQL_DUPLICATE_ENTRY:
+                raise
+        else:
+            inserted += 1
+    return inserted
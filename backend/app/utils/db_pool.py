@@ -0,0 +1,169 @@
+#app/utils/db_pool.py
+
+import os
+import threading
+import time
+from collections import deque
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+from app.utils.database import sqlite_engine_options
+
+
+class PoolStats:
+    """
+    Connection pool counters for one engine's pool in this process.
+
+    Checkout latency is the time a request waits for a connection, including
+    opening a new one. A growing p95 or any timeouts mean the pool is too small
+    for the worker's thread count.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=2048)  # Recent checkout latencies in ms
+        self._counters = {'checkouts': 0, 'overflow_checkouts': 0, 'timeouts': 0, 'connects': 0, 'invalidations': 0}
+        self._max_ms = 0.0
+
+    def record_checkout(self, elapsed_ms, overflow):
+        with self._lock:
+            self._samples.append(elapsed_ms)
+            self._counters['checkouts'] += 1
+            if overflow:
+                self._counters['overflow_checkouts'] += 1
+            self._max_ms = max(self._max_ms, elapsed_ms)
+
+    def increment(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counters = dict.fromkeys(self._counters, 0)
+            self._max_ms = 0.0
+
+    def snapshot(self):
+        """
+        Counters since startup (or the last reset)
+
+        Returns:
+            dict: Counters and checkout latency percentiles
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+            stats = dict(self._counters)
+            max_ms = self._max_ms
+
+        def percentile(fraction):
+            return round(samples[min(len(samples) - 1, int(len(samples) * fraction))], 3) if samples else None
+
+        stats['checkout_ms'] = {
+            'samples': len(samples),
+            'p50': percentile(0.5),
+            'p95': percentile(0.95),
+            'p99': percentile(0.99),
+            'max': round(max_ms, 3)
+        }
+        return stats
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits and when it opens an overflow connection"""
+
+    def __init__(self, *args, **kwargs):
+        recreated = '_dispatch' in kwargs  # recreate() passes the existing listeners on
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        if not recreated:
+            stats = self.stats
+            event.listen(self, 'invalidate', lambda dbapi_connection, record, exception: stats.increment('invalidations'))
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats  # Counters survive engine.dispose()
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        overflow_before = self.overflow()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.increment('timeouts')
+            raise
+        # overflow() only grows when the checkout opened a connection beyond pool_size
+        self.stats.record_checkout((time.perf_counter() - started) * 1000,
+                                   self.overflow() > max(0, overflow_before))
+        return connection
+
+    def _create_connection(self):
+        self.stats.increment('connects')
+        return super()._create_connection()
+
+
+def pool_snapshot(pool):
+    """
+    Current state of an engine's pool, plus its counters when it is instrumented
+
+    overflow is read from pool.overflow(): the connections open beyond pool_size.
+
+    Args:
+        pool: The engine's connection pool
+
+    Returns:
+        dict: Pool class, live usage, and counters and checkout latency percentiles (None for other pools)
+    """
+    stats = pool.stats.snapshot() if isinstance(pool, InstrumentedQueuePool) else None
+    return {
+        'pool_class': type(pool).__name__,
+        'size': pool.size() if hasattr(pool, 'size') else None,
+        'checked_out': pool.checkedout() if hasattr(pool, 'checkedout') else None,
+        'overflow': max(0, pool.overflow()) if hasattr(pool, 'overflow') else None,
+        'checked_in': pool.checkedin() if hasattr(pool, 'checkedin') else None,
+        'status': pool.status(),
+        'stats': stats
+    }
+
+
+def engine_pool_snapshots(engines):
+    """
+    Pool snapshots for the primary and each replica engine
+
+    Args:
+        engines (dict): Flask-SQLAlchemy db.engines, keyed by bind key (None for the primary)
+
+    Returns:
+        dict: 'primary' and one entry per replica bind key
+    """
+    return {key or 'primary': pool_snapshot(engine.pool) for key, engine in engines.items()}
+
+
+def _env_bool(name, default):
+    return os.environ.get(name, str(default)).lower() in ('1', 'true', 'yes')
+
+
+def build_engine_options(database_uri):
+    """
+    SQLAlchemy engine options from the environment
+
+    Pool sizing only applies to server databases (SQLite gets sqlite_engine_options):
+        DB_POOL_SIZE: persistent connections per process, roughly the worker's thread count (default 5)
+        DB_MAX_OVERFLOW: extra connections allowed under bursts (default 10)
+        DB_POOL_TIMEOUT: seconds to wait for a free connection (default 30)
+        DB_POOL_RECYCLE: reconnect connections older than this, below MySQL's wait_timeout (default 1800)
+        DB_POOL_PRE_PING: test connections on checkout to survive idle disconnects (default true)
+
+    Returns:
+        dict: Value for SQLALCHEMY_ENGINE_OPTIONS
+    """
+    if database_uri.startswith('sqlite'):
+        return sqlite_engine_options(database_uri)
+
+    return {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': _env_bool('DB_POOL_PRE_PING', True)
+    }
@@ -0,0 +1,270 @@
+#app/utils/db_routing.py
+
+import hashlib
+import logging
+import os
+import random
+import threading
+import time
+from functools import wraps
+from flask import g, has_app_context, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from app.utils.cache_backends import MemoryBackend, create_cache_backend
+from app.utils.db_pool import build_engine_options
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND_PREFIX = 'replica_'
+LAG_CHECK_INTERVAL = 5.0  # seconds between replication lag probes per replica
+
+
+def build_replica_binds():
+    """
+    SQLALCHEMY_BINDS entries for the read replicas in DATABASE_REPLICA_URLS (comma-separated)
+
+    Each replica gets the same pool settings as the primary.
+
+    Returns:
+        dict: replica_0, replica_1, ... -> engine options including the url
+    """
+    urls = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    return {f'{REPLICA_BIND_PREFIX}{i}': {'url': url, **build_engine_options(url)} for i, url in enumerate(urls)}
+
+
+def _probe_replication_lag(engine):
+    """
+    Replication lag reported by a MySQL replica
+
+    Returns:
+        float or None: Seconds behind the primary, inf when replication is
+        stopped, or None when the database does not report lag (SQLite, or a
+        server that is not configured as a replica)
+    """
+    if engine.dialect.name != 'mysql':
+        return None
+
+    from sqlalchemy import text
+    with engine.connect() as connection:
+        for statement, column in (('SHOW REPLICA STATUS', 'Seconds_Behind_Source'),
+                                  ('SHOW SLAVE STATUS', 'Seconds_Behind_Master')):
+            try:
+                row = connection.execute(text(statement)).mappings().first()
+            except Exception:
+                continue
+            if row is None:
+                return None
+            lag = row.get(column)
+            return float('inf') if lag is None else float(lag)
+    return None
+
+
+class ReplicaRouter:
+    """
+    Chooses where a request's reads go.
+
+    Handlers decorated with read_replica send SELECTs to one replica whose
+    reported lag is within max_lag, picked at random once per request so every
+    query of the request sees the same data. Everything else stays on the
+    primary: writes, reads after a write in the same request, and every read by
+    a client for max_lag seconds after it wrote, so clients always see their
+    own writes. Clients are keyed by user id when a valid token is sent, and by
+    address and user agent otherwise (see client_key). Write marks live in the
+    STOCK_CACHE_BACKEND store, so with sqlite or redis a write handled by one
+    worker pins the client's reads on every worker.
+    """
+    _lock = threading.Lock()
+    max_lag = 5.0
+    _sticky = MemoryBackend(max_size=4096)  # client key -> True until max_lag after its last write
+    _lag = {}  # bind key -> (lag seconds or None, checked_at)
+    _counters = {'replica_reads': 0, 'primary_reads': 0, 'sticky_requests': 0, 'lagging_skips': 0}
+
+    @classmethod
+    def configure(cls, max_lag=None, backend=None):
+        if max_lag is not None:
+            cls.max_lag = max_lag
+        if backend is not None:
+            cls._sticky = backend
+
+    @classmethod
+    def configure_from_config(cls, config):
+        """Configure from Flask app config, keeping write marks in the StockCache backend kind"""
+        backend = create_cache_backend(
+            config.get('STOCK_CACHE_BACKEND', 'memory'),
+            max_size=4096,
+            path=config.get('STOCK_CACHE_PATH'),
+            url=config.get('STOCK_CACHE_URL'),
+            namespace='replica_sticky'
+        )
+        cls.configure(max_lag=config.get('DB_REPLICA_MAX_LAG_SECONDS'), backend=backend)
+
+    @classmethod
+    def mark_write(cls, key):
+        if key is None or cls.max_lag <= 0:
+            return
+        try:
+            cls._sticky.set(key, True, cls.max_lag)
+        except Exception as e:
+            # The write itself succeeded; only read-your-writes on other workers is lost
+            logger.warning(f"Could not record write for {key}: {str(e)}")
+
+    @classmethod
+    def is_sticky(cls, key):
+        if key is None:
+            return False
+        try:
+            return cls._sticky.get(key) is not None
+        except Exception as e:
+            logger.warning(f"Could not read write marks for {key}: {str(e)}")
+            return True  # Unknown, so read from the primary
+
+    @classmethod
+    def _lag_for(cls, key, engine):
+        now = time.monotonic()
+        with cls._lock:
+            cached = cls._lag.get(key)
+        if cached and now - cached[1] < LAG_CHECK_INTERVAL:
+            return cached[0]
+
+        try:
+            lag = _probe_replication_lag(engine)
+        except Exception as e:
+            logger.warning(f"Replication lag probe failed for {key}: {str(e)}")
+            lag = float('inf')
+        with cls._lock:
+            cls._lag[key] = (lag, now)
+        return lag
+
+    @classmethod
+    def choose(cls, engines):
+        """
+        Pick a replica engine within the lag tolerance
+
+        Returns:
+            Engine or None: None when no replica is configured or healthy
+        """
+        healthy = []
+        for key, engine in engines.items():
+            if not (key or '').startswith(REPLICA_BIND_PREFIX):
+                continue
+            lag = cls._lag_for(key, engine)
+            if lag is not None and lag > cls.max_lag:
+                cls._count('lagging_skips')
+                continue
+            healthy.append(engine)
+        return random.choice(healthy) if healthy else None
+
+    @classmethod
+    def _count(cls, counter):
+        with cls._lock:
+            cls._counters[counter] += 1
+
+    @classmethod
+    def stats(cls, engines):
+        with cls._lock:
+            stats = dict(cls._counters)
+            lag = dict(cls._lag)
+        stats.update({
+            'max_lag_seconds': cls.max_lag,
+            'replicas': {
+                key: {'url': engine.url.render_as_string(hide_password=True), 'lag_seconds': lag.get(key, (None,))[0]}
+                for key, engine in engines.items() if (key or '').startswith(REPLICA_BIND_PREFIX)
+            }
+        })
+        return stats
+
+    @classmethod
+    def reset_stats(cls):
+        with cls._lock:
+            cls._counters = dict.fromkeys(cls._counters, 0)
+            cls._lag.clear()
+        cls._sticky.clear()
+
+
+class RoutingSession(Session):
+    """db.session that sends reads from read_replica handlers to a replica"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and getattr(clause, 'is_select', False) and _replica_reads_allowed():
+            if 'db_replica_engine' not in g:
+                g.db_replica_engine = ReplicaRouter.choose(self._db.engines)  # None: no healthy replica
+            engine = g.db_replica_engine
+            if engine is not None:
+                ReplicaRouter._count('replica_reads')
+                return engine
+            ReplicaRouter._count('primary_reads')
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _replica_reads_allowed():
+    return has_app_context() and g.get('db_read_replica', False) and not g.get('db_wrote', False)
+
+
+def client_key():
+    """
+    Key a client's write marks are stored under
+
+    The user id when token_required has run or the request carries a valid
+    bearer token, so a user's reads from endpoints without token_required stay
+    sticky too. Anonymous clients are keyed by a hash of their address and
+    user agent.
+
+    Returns:
+        str or None: None outside a request
+    """
+    from app.utils.auth import bearer_token_user_id
+    current_user = g.get('current_user') if has_app_context() else None
+    if current_user is not None:
+        return f'user:{current_user.id}'
+    if not has_request_context():
+        return None
+    user_id = bearer_token_user_id()
+    if user_id is not None:
+        return f'user:{user_id}'
+    client = f"{request.remote_addr}|{request.headers.get('User-Agent', '')}"
+    return 'client:' + hashlib.sha1(client.encode('utf-8')).hexdigest()
+
+
+def _record_write():
+    """Pin the rest of the request, and the client's next max_lag seconds, to the primary"""
+    if not has_app_context():
+        return
+    g.db_wrote = True
+    ReplicaRouter.mark_write(client_key())
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _after_flush(session, flush_context):
+    _record_write()
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _on_execute(orm_execute_state):
+    # Core INSERT/UPDATE/DELETE through db.session.execute() never flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _record_write()
+
+
+def use_primary():
+    """Send the rest of this request's reads to the primary"""
+    if has_app_context():
+        g.db_read_replica = False
+
+
+def read_replica(f):
+    """
+    Decorator letting a read-only GET handler's queries go to a read replica
+
+    Works with or without token_required (see client_key). Requests from a
+    client that wrote within the lag tolerance stay on the primary.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        sticky = ReplicaRouter.is_sticky(client_key())
+        if sticky:
+            ReplicaRouter._count('sticky_requests')
+        g.db_read_replica = not sticky
+        g.pop('db_replica_engine', None)  # Chosen on the first read
+        return f(*args, **kwargs)
+
+    return decorated
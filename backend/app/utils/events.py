@@ -0,0 +1,98 @@
+#app/utils/events.py
+
+import logging
+import threading
+from collections import defaultdict
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Change events published after a successful commit
+STOCK_CREATED = 'stock.created'
+STOCK_UPDATED = 'stock.updated'
+STOCK_DELETED = 'stock.deleted'
+SENTIMENT_INSERTED = 'sentiment.inserted'
+RECOMMENDATION_CREATED = 'recommendation.created'
+USER_UPDATED = 'user.updated'
+USER_DELETED = 'user.deleted'
+
+_subscribers = defaultdict(list)
+_lock = threading.Lock()
+
+def subscribe(event_name, handler=None):
+    """
+    Register a handler for an event. Usable as a decorator.
+
+    Handlers are called as handler(event_name, payload) in the publishing
+    thread, after the database commit that caused the event.
+    """
+    def register(fn):
+        with _lock:
+            if fn not in _subscribers[event_name]:
+                _subscribers[event_name].append(fn)
+        return fn
+
+    return register(handler) if handler else register
+
+def unsubscribe(event_name, handler):
+    """Remove a previously registered handler"""
+    with _lock:
+        if handler in _subscribers[event_name]:
+            _subscribers[event_name].remove(handler)
+
+def publish(event_name, **payload):
+    """Deliver an event to every subscriber; a failing handler never breaks the publisher"""
+    with _lock:
+        handlers = list(_subscribers[event_name])
+
+    for handler in handlers:
+        try:
+            handler(event_name, payload)
+        except Exception as e:
+            logger.error(f"Error handling {event_name} in {getattr(handler, '__name__', handler)}: {str(e)}")
+
+# Model class -> (created_event, updated_event, deleted_event, payload_fn)
+_tracked_models = {}
+
+def track_model(model, created=None, updated=None, deleted=None, payload=None):
+    """
+    Publish change events for a model whenever its rows are written through the ORM session
+
+    Args:
+        model: SQLAlchemy model class
+        created/updated/deleted (str, optional): Event names for each kind of change
+        payload (callable): Builds the event payload dict from an instance
+    """
+    _tracked_models[model] = (created, updated, deleted, payload or (lambda obj: {'id': obj.id}))
+
+def _queue(session, event_name, obj):
+    payload_fn = _tracked_models[type(obj)][3]
+    session.info.setdefault('pending_change_events', []).append((event_name, payload_fn(obj)))
+
+@event.listens_for(Session, 'after_flush')
+def _collect_change_events(session, flush_context):
+    for obj in session.new:
+        events = _tracked_models.get(type(obj))
+        if events and events[0]:
+            _queue(session, events[0], obj)
+
+    for obj in session.dirty:
+        events = _tracked_models.get(type(obj))
+        if events and events[1] and session.is_modified(obj, include_collections=False):
+            _queue(session, events[1], obj)
+
+    for obj in session.deleted:
+        events = _tracked_models.get(type(obj))
+        if events and events[2]:
+            _queue(session, events[2], obj)
+
+@event.listens_for(Session, 'after_commit')
+def _publish_change_events(session):
+    pending = session.info.pop('pending_change_events', [])
+    for event_name, payload in pending:
+        publish(event_name, **payload)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_change_events(session):
+    session.info.pop('pending_change_events', None)
@@ -0,0 +1,62 @@
+#app/utils/http_cache.py
+
+from flask import request, make_response
+from datetime import timezone
+import hashlib
+
+def make_etag(*parts):
+    """
+    Build a strong ETag from cheap resource validators
+
+    Args:
+        *parts: Values that change whenever the response would change
+            (e.g. row count, max timestamp, max id, query parameters)
+
+    Returns:
+        str: Hex digest usable as an ETag value
+    """
+    raw = '|'.join('' if part is None else str(part) for part in parts)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def _as_utc(value):
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)  # Timestamps are stored as naive UTC
+    return value.replace(microsecond=0)
+
+def not_modified(etag, last_modified=None):
+    """
+    Check the request's conditional headers against the current validators
+
+    If-None-Match takes precedence over If-Modified-Since, as in RFC 9110.
+    Only pass last_modified for a single row. For collections, deletes and
+    rows leaving a time window do not advance max(timestamp), so a date-only
+    match could return a wrong 304. Those endpoints validate by ETag alone.
+
+    Returns:
+        Response or None: A 304 response with the validators set, or None if
+        the client's copy is out of date and the full body must be built
+    """
+    last_modified = _as_utc(last_modified)
+
+    if request.if_none_match:
+        matched = request.if_none_match.contains(etag)
+    elif request.if_modified_since and last_modified:
+        matched = last_modified <= request.if_modified_since
+    else:
+        matched = False
+
+    if not matched:
+        return None
+
+    response = make_response('', 304)
+    return with_validators(response, etag, last_modified)
+
+def with_validators(response, etag, last_modified=None):
+    """Attach ETag/Last-Modified so clients can revalidate instead of refetching"""
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = _as_utc(last_modified)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
@@ -0,0 +1,78 @@
+#app/utils/query_plans.py
+
+from datetime import datetime, timedelta
+
+def sample_parameters(db):
+    """
+    Pick realistic filter values for the hot queries from the loaded data
+
+    Uses the stock with the most sentiment rows and one of its headlines, so the
+    plans are checked against the busiest index ranges.
+
+    Returns:
+        dict: symbol, stock_id, source, title and url
+    """
+    from app.models.sentiment import SentimentData
+
+    symbol, stock_id = db.session.query(SentimentData.stock_symbol, SentimentData.stock_id).group_by(
+        SentimentData.stock_symbol, SentimentData.stock_id
+    ).order_by(db.func.count(SentimentData.id).desc()).first()
+    headline = SentimentData.query.filter_by(stock_symbol=symbol).first()
+    return {'symbol': symbol, 'stock_id': stock_id, 'source': headline.source,
+            'title': headline.title, 'url': headline.url}
+
+def hot_queries(db, params):
+    """(name, query, acceptable index names) for every checked query"""
+    from app.models.sentiment import SentimentData
+    from app.models.recommendation import Recommendation
+
+    since = datetime.utcnow() - timedelta(days=7)
+    published = db.func.coalesce(SentimentData.published_at, SentimentData.created_at)
+    symbol = params['symbol']
+
+    return [
+        ('sentiment list', SentimentData.query.filter_by(stock_symbol=symbol).filter(
+            SentimentData.created_at >= since
+        ).order_by(SentimentData.created_at.desc()),
+         {'ix_sentiment_data_symbol_created_at', 'ix_sentiment_data_symbol_source_created_at'}),
+        ('sentiment aggregate', SentimentData.query.filter_by(stock_symbol=symbol).filter(
+            SentimentData.created_at >= since
+        ).with_entities(db.func.count(SentimentData.id), db.func.max(SentimentData.created_at)),
+         {'ix_sentiment_data_symbol_created_at', 'ix_sentiment_data_symbol_source_created_at'}),
+        ('sentiment by source', SentimentData.query.filter_by(stock_symbol=symbol, source=params['source']).filter(
+            SentimentData.created_at >= since
+        ).order_by(SentimentData.created_at.desc()),
+         {'ix_sentiment_data_symbol_source_created_at'}),
+        ('stored recommendation window', db.session.query(
+            SentimentData.id, SentimentData.compound_score, published
+        ).filter(
+            SentimentData.stock_symbol == symbol, SentimentData.created_at >= since
+        ).order_by(published, SentimentData.id),
+         {'ix_sentiment_data_symbol_created_at', 'ix_sentiment_data_symbol_source_created_at'}),
+        ('headline dedup', SentimentData.query.filter_by(
+            stock_id=params['stock_id'], title=params['title'], url=params['url']
+        ), {'ix_sentiment_data_stock_title_url'}),
+        ('latest recommendation', Recommendation.query.filter_by(stock_id=params['stock_id']).order_by(
+            Recommendation.created_at.desc(), Recommendation.id.desc()
+        ).limit(1), {'ix_recommendations_stock_id_created_at'}),
+    ]
+
+def analyze(db):
+    """Refresh planner statistics so plans reflect the loaded data"""
+    if db.engine.dialect.name == 'sqlite':
+        db.session.execute(db.text('ANALYZE'))
+    else:
+        db.session.execute(db.text('ANALYZE TABLE sentiment_data, recommendations'))
+
+def explain(db, query):
+    """Return (plan text, names of the indexes the plan uses)"""
+    sql = str(query.statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+    if db.engine.dialect.name == 'sqlite':
+        rows = db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+        plan = '\n'.join(row[-1] for row in rows)
+        used = {word for row in rows for word in row[-1].replace('(', ' ').split() if word.startswith('ix_')}
+    else:
+        rows = db.session.execute(db.text(f"EXPLAIN {sql}")).mappings().fetchall()
+        plan = '\n'.join(str(dict(row)) for row in rows)
+        used = {row['key'] for row in rows if row.get('key')}
+    return plan, used
@@ -0,0 +1,30 @@
+#app/utils/scheduler.py
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+def start_periodic_job(app, name, interval_seconds, job):
+    """
+    Run job() every interval_seconds in a daemon thread inside an app context
+
+    Every process that calls this runs its own copy of the job, so with
+    several gunicorn workers prefer running the job from cron instead.
+
+    Returns:
+        threading.Event: Set it to stop the job
+    """
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(interval_seconds):
+            try:
+                with app.app_context():
+                    job()
+            except Exception as e:
+                logger.error(f"Periodic job {name} failed: {str(e)}")
+
+    threading.Thread(target=loop, name=f"periodic-{name}", daemon=True).start()
+    logger.info(f"Started periodic job {name} every {interval_seconds}s")
+    return stop
@@ -0,0 +1,35 @@
+#app/utils/streaming.py
+
+from flask import Response, stream_with_context
+import json
+
+STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'sse': 'text/event-stream'
+}
+
+def _encode(event_name, data, stream_format):
+    payload = json.dumps(data, default=str)
+    if stream_format == 'sse':
+        return f"event: {event_name}\ndata: {payload}\n\n"
+    return json.dumps({'event': event_name, 'data': data}, default=str) + "\n"
+
+def stream_events(events, stream_format):
+    """
+    Stream (event_name, data) pairs to the client as they are produced
+
+    Args:
+        events: Iterable of (event_name, data) tuples, consumed inside the request context
+        stream_format (str): 'ndjson' (one JSON object per line) or 'sse' (Server-Sent Events)
+
+    Returns:
+        Response: A streamed response that is not buffered by proxies
+    """
+    def generate():
+        for event_name, data in events:
+            yield _encode(event_name, data, stream_format)
+
+    response = Response(stream_with_context(generate()), mimetype=STREAM_FORMATS[stream_format])
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Disable nginx buffering so events arrive immediately
+    return response
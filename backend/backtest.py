@@ -0,0 +1,90 @@
+#backend/backtest.py
+
+"""
+Backtest the recommendation rules over stored sentiment and local price history.
+
+Prices come from a directory of per-symbol CSV files (Date, Open, ..., Close)
+or from market data recordings (MARKET_DATA_PROVIDER=record). Sentiment is
+read from the sentiment_data table of the configured database.
+
+    python backtest.py --prices data/ohlcv --start 2022-01-01 --horizon 5
+"""
+
+import argparse
+import json
+import os
+import time
+
+from app.factory import create_app
+from app.services.backtest_service import (
+    load_price_history, load_sentiment_rows, run_backtest, sweep_momentum_thresholds
+)
+
+
+def print_report(summary):
+    print(f"{summary['start']} to {summary['end']}: {summary['trading_days']} trading days, "
+          f"{summary['symbols']} symbols, {summary['days']}d sentiment, {summary['horizon']}d horizon")
+    print(f"{'branch':>20} {'signals':>9} {'mean ret':>9} {'hit rate':>9} {'turnover':>9}")
+    for name, stats in summary['branches'].items():
+        if not stats['signals']:
+            continue
+        print(f"{name:>20} {stats['signals']:>9} {stats['mean_forward_return'] * 100:>8.2f}% "
+              f"{stats['hit_rate'] * 100:>8.1f}% {stats['turnover'] * 100:>8.1f}%")
+
+    strategy = summary['strategy']
+    if strategy['signals']:
+        print(f"Buy/sell signals: {strategy['signals']}, mean signed return "
+              f"{strategy['mean_signed_return'] * 100:.2f}%, hit rate {strategy['hit_rate'] * 100:.1f}%, "
+              f"daily turnover {strategy['mean_daily_turnover'] * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--prices', default=os.environ.get('MARKET_DATA_DIR', 'market_data_recordings'),
+                        help='Directory of per-symbol CSV files or market data recordings')
+    parser.add_argument('--start', help='First date to replay (YYYY-MM-DD)')
+    parser.add_argument('--end', help='Last date to replay (YYYY-MM-DD)')
+    parser.add_argument('--days', type=int, default=7, help='Sentiment window in days')
+    parser.add_argument('--horizon', type=int, default=5, help='Holding period in trading days')
+    parser.add_argument('--lookback', type=int, default=21, help='Closes used for the price change')
+    parser.add_argument('--hold-band', type=float, default=0.02, help='Max absolute return for a hold to count as a hit')
+    parser.add_argument('--thresholds', help='Comma-separated momentum sentiment thresholds to compare, e.g. 0.1,0.25,0.4')
+    parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+    args = parser.parse_args()
+
+    bars_by_symbol = load_price_history(args.prices)
+    if not bars_by_symbol:
+        parser.error(f"No price history found in {args.prices}")
+
+    app = create_app()
+    with app.app_context():
+        sentiment_rows = load_sentiment_rows(sorted(bars_by_symbol), start=args.start, end=args.end, days=args.days)
+
+    if args.thresholds:
+        sweep = sweep_momentum_thresholds(bars_by_symbol, sentiment_rows,
+                                          [float(value) for value in args.thresholds.split(',')],
+                                          hold_band=args.hold_band, days=args.days, horizon=args.horizon,
+                                          lookback=args.lookback, start=args.start, end=args.end)
+        if args.json:
+            print(json.dumps(sweep, indent=2))
+        else:
+            print(f"{'threshold':>10} {'signals':>9} {'mean ret':>9} {'hit rate':>9}")
+            for result in sweep['results']:
+                if not result['signals']:
+                    print(f"{result['threshold']:>10} {0:>9}")
+                    continue
+                print(f"{result['threshold']:>10} {result['signals']:>9} {result['mean_signed_return'] * 100:>8.2f}% "
+                      f"{result['hit_rate'] * 100:>8.1f}%")
+            print(f"Best momentum threshold: {sweep['best_threshold']}")
+        raise SystemExit(0)
+
+    started = time.perf_counter()
+    summary = run_backtest(bars_by_symbol, sentiment_rows, days=args.days, horizon=args.horizon,
+                           lookback=args.lookback, hold_band=args.hold_band, start=args.start, end=args.end)
+    summary['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_report(summary)
+        print(f"Backtest ran in {summary['elapsed_ms']}ms ({len(sentiment_rows[2])} sentiment rows)")
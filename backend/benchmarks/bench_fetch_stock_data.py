@@ -0,0 +1,52 @@
+#backend/benchmarks/bench_fetch_stock_data.py
+
+"""
+Compare per-call latency of fetch_stock_data() in full and quote-only modes.
+
+Runs against whichever market data provider is configured, e.g. offline:
+
+    MARKET_DATA_PROVIDER=replay MARKET_DATA_DIR=recordings MARKET_DATA_LATENCY_MS=80 \
+        python benchmarks/bench_fetch_stock_data.py AAPL MSFT
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.stock_service import fetch_stock_data
+
+
+def time_calls(symbols, fields, iterations):
+    timings = []
+    for _ in range(iterations):
+        for symbol in symbols:
+            start = time.perf_counter()
+            fetch_stock_data(symbol, fields=fields)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1] if len(timings) >= 20 else timings[-1]
+    print(f"{label:>6}: calls={len(timings)} mean={statistics.mean(timings):.1f}ms "
+          f"p50={statistics.median(timings):.1f}ms p95={p95:.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('symbols', nargs='*', default=["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA"])
+    parser.add_argument('--iterations', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Provider: {os.environ.get('MARKET_DATA_PROVIDER', 'yahoo')}")
+    full = time_calls(args.symbols, 'full', args.iterations)
+    quote = time_calls(args.symbols, 'quote', args.iterations)
+
+    report('full', full)
+    report('quote', quote)
+    print(f"Quote-only saves {statistics.mean(full) - statistics.mean(quote):.1f}ms per call on average")
@@ -0,0 +1,47 @@
+#backend/benchmarks/bench_recommendation_engine.py
+
+"""
+Time the vectorized recommendation rules over a synthetic stock universe.
+
+Needs no database or network: sentiment rows and price changes are random.
+
+    python benchmarks/bench_recommendation_engine.py --stocks 5000 --rows 20
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.recommendation_engine import BRANCH_NAMES, classify, sentiment_features
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--stocks', type=int, default=5000)
+    parser.add_argument('--rows', type=int, default=20, help='Average sentiment rows per stock')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    counts = rng.poisson(args.rows, args.stocks)
+    group_index = np.repeat(np.arange(args.stocks), counts)
+    scores = rng.uniform(-1, 1, len(group_index))
+    price_change_pct = rng.normal(0, 5, args.stocks)
+    current_price = rng.uniform(5, 500, args.stocks)
+    has_price = rng.random(args.stocks) > 0.05
+
+    start = time.perf_counter()
+    features = sentiment_features(group_index, scores, args.stocks)
+    result = classify(features['avg'], features['trend'], price_change_pct, current_price,
+                      has_price, features['counts'] > 0)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"{args.stocks} stocks, {len(scores)} sentiment rows: {elapsed:.1f}ms")
+    branches, totals = np.unique(result['branch'], return_counts=True)
+    for branch, total in zip(branches, totals):
+        print(f"  {BRANCH_NAMES[branch]:>20}: {total}")
@@ -0,0 +1,71 @@
+#backend/benchmarks/bench_startup.py
+
+"""
+Measure worker boot time: importing wsgi.py (which builds the app) in a fresh interpreter.
+
+Each run uses `python -X importtime`, so besides wall time it reports the
+slowest top-level imports and fails if a dependency that should load lazily
+(pandas, numpy, yfinance, vaderSentiment, alembic) was imported at startup.
+
+    python benchmarks/bench_startup.py --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAZY_MODULES = ('numpy', 'pandas', 'yfinance', 'vaderSentiment', 'alembic')
+
+
+def boot(entry):
+    """
+    Boot the app once in a fresh interpreter
+
+    Returns:
+        tuple: (wall seconds, {module: cumulative import microseconds} for the top two
+        nesting levels, set of all imported top-level packages)
+    """
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', entry],
+                            cwd=BACKEND_DIR, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    outer, modules = {}, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        modules.add(name.strip().split('.')[0])
+        depth = (len(name) - len(name.lstrip()) - 1) // 2  # Nested imports are indented two spaces per level
+        if depth <= 1:
+            outer[name.strip()] = int(cumulative)
+    return elapsed, outer, modules
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--entry', default='import wsgi', help='Python statement to time')
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports to list')
+    args = parser.parse_args()
+
+    boot(args.entry)  # Warm the filesystem and bytecode caches
+    runs = [boot(args.entry) for _ in range(args.runs)]
+    walls = sorted(run[0] * 1000 for run in runs)
+    print(f"boot: runs={len(walls)} median={statistics.median(walls):.0f}ms min={walls[0]:.0f}ms max={walls[-1]:.0f}ms")
+
+    _, outer, modules = runs[-1]
+    print("slowest imports (cumulative, last run):")
+    for name, micros in sorted(outer.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{micros / 1000:>9.1f}ms  {name}")
+
+    eager = [name for name in LAZY_MODULES if name in modules]
+    if eager:
+        print(f"FAIL: imported at startup: {', '.join(eager)}")
+    sys.exit(1 if eager else 0)
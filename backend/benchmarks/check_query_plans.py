@@ -0,0 +1,55 @@
+#backend/benchmarks/check_query_plans.py
+
+"""
+Check that the hot sentiment and recommendation queries use their indexes.
+
+Seeds a large synthetic dataset into a scratch database, then runs EXPLAIN
+(EXPLAIN QUERY PLAN on SQLite) for each query and fails if the expected
+index is not chosen. Never point --database-url at a database you care about.
+tests/test_query_plans.py runs the same checks on a small dataset.
+
+    python benchmarks/check_query_plans.py --sentiment-rows 200000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='Scratch database (default: a temporary SQLite file)')
+    parser.add_argument('--stocks', type=int, default=200)
+    parser.add_argument('--sentiment-rows', type=int, default=200000)
+    parser.add_argument('--recommendation-rows', type=int, default=50000)
+    parser.add_argument('--verbose', action='store_true', help='Print every plan')
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/query_plans.db"
+    from app.factory import create_app
+
+    app = create_app()
+
+    from app.models.db import db
+    from app.services.synthetic_data import generate_dataset
+    from app.utils.query_plans import sample_parameters, hot_queries, analyze, explain
+
+    with app.app_context():
+        db.create_all()
+        print(f"Seeding {args.sentiment_rows} sentiment and {args.recommendation_rows} recommendation rows...")
+        generate_dataset(db, args.stocks, 0, args.sentiment_rows, args.recommendation_rows)
+        analyze(db)
+
+        failures = 0
+        for name, query, expected in hot_queries(db, sample_parameters(db)):
+            plan, used = explain(db, query)
+            ok = bool(used & expected)
+            failures += not ok
+            print(f"{'ok' if ok else 'FAIL':>4}  {name}: {', '.join(sorted(used)) or 'no index'}")
+            if args.verbose or not ok:
+                print('      ' + plan.replace('\n', '\n      '))
+
+    sys.exit(1 if failures else 0)
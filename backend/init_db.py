@@ -23,17 +23,17 @@ from app.routes.auth_routes import auth_bp
 from app.routes.stock_routes import stock_bp
 from app.routes.sentiment_routes import sentiment_bp
 from app.routes.recommendation_routes import recommendation_bp
+from app.utils.database import build_database_uri
+from app.utils.db_pool import build_engine_options
 
 def create_app_for_init():
     """Create a Flask app instance specifically for database initialization"""
     app = Flask(__name__)
     
     # Configure database
-    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get(
-        'DATABASE_URL', 
-        f"mysql+pymysql://{os.environ.get('DB_USER', 'root')}:{os.environ.get('DB_PASSWORD', '')}@{os.environ.get('DB_HOST', 'localhost')}/{os.environ.get('DB_NAME', 'stock_sentiment')}"
-    )
+    app.config['SQLALCHEMY_DATABASE_URI'] = build_database_uri()
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = build_engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-key-change-in-production')
     
     # Initialize database
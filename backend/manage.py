@@ -0,0 +1,29 @@
+#backend/manage.py
+
+"""
+Flask CLI entry point, including the Flask-Migrate `db` commands:
+
+    python manage.py db upgrade
+    python manage.py db migrate -m "describe the change"
+
+Create the tables of a new database first with `python manage.py create-schema`.
+`flask --app manage:create_cli_app` works as well.
+"""
+
+from flask.cli import FlaskGroup
+
+from app.factory import create_app
+from app.models.db import init_migrations
+
+
+def create_cli_app():
+    """The app plus Flask-Migrate, which web workers do not load"""
+    app = create_app()
+    init_migrations(app)
+    return app
+
+
+cli = FlaskGroup(create_app=create_cli_app)
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,33 @@
+"""Add recommendations.input_fingerprint
+
+Revision ID: 3f1c2a9d7b10
+Revises: 
+Create Date: 2026-10-19 10:12:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _has_column(table, column):
+    inspector = sa.inspect(op.get_bind())
+    return column in [col['name'] for col in inspector.get_columns(table)]
+
+
+def upgrade():
+    # Tables are created by db.create_all(); databases created after this change already have the column
+    if not _has_column('recommendations', 'input_fingerprint'):
+        with op.batch_alter_table('recommendations', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('input_fingerprint', sa.String(length=40), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('recommendations', schema=None) as batch_op:
+        batch_op.drop_column('input_fingerprint')
@@ -0,0 +1,39 @@
+"""Add composite indexes for sentiment and recommendation lookups
+
+Revision ID: 8b2e6d41c5a7
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-19 11:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e6d41c5a7'
+down_revision = '3f1c2a9d7b10'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('sentiment_data', 'ix_sentiment_data_symbol_created_at', ['stock_symbol', 'created_at']),
+    ('sentiment_data', 'ix_sentiment_data_symbol_source_created_at', ['stock_symbol', 'source', 'created_at']),
+    ('sentiment_data', 'ix_sentiment_data_stock_title_url', ['stock_id', 'title', 'url']),
+    ('recommendations', 'ix_recommendations_stock_id_created_at', ['stock_id', 'created_at']),
+]
+
+
+def _index_names(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    # db.create_all() already creates these on fresh databases
+    for table, name, columns in INDEXES:
+        if name not in _index_names(table):
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for table, name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,51 @@
+"""Add recommendation_snapshots
+
+Revision ID: c4d9e2f7a318
+Revises: 8b2e6d41c5a7
+Create Date: 2026-10-19 14:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d9e2f7a318'
+down_revision = '8b2e6d41c5a7'
+branch_labels = None
+depends_on = None
+
+TABLE = 'recommendation_snapshots'
+INDEX = 'ix_recommendation_snapshots_computed_at_rank'
+
+
+def _inspector():
+    return sa.inspect(op.get_bind())
+
+
+def upgrade():
+    # db.create_all() already creates the table and index on fresh databases
+    if not _inspector().has_table(TABLE):
+        op.create_table(
+            TABLE,
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('computed_at', sa.DateTime(), nullable=False),
+            sa.Column('rank', sa.Integer(), nullable=False),
+            sa.Column('stock_id', sa.Integer(), nullable=False),
+            sa.Column('type', sa.String(length=20), nullable=False),
+            sa.Column('confidence_score', sa.Float(), nullable=False),
+            sa.Column('reason', sa.Text(), nullable=False),
+            sa.Column('price_target', sa.Float(), nullable=True),
+            sa.Column('time_frame', sa.String(length=50), nullable=True),
+            sa.Column('inputs', sa.Text(), nullable=True),
+            sa.ForeignKeyConstraint(['stock_id'], ['stocks.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if INDEX not in {index['name'] for index in _inspector().get_indexes(TABLE)}:
+        op.create_index(INDEX, TABLE, ['computed_at', 'rank'], unique=False)
+
+
+def downgrade():
+    op.drop_index(INDEX, table_name=TABLE)
+    op.drop_table(TABLE)
@@ -0,0 +1,33 @@
+"""Add recommendations.details
+
+Revision ID: d7a1b3c9e542
+Revises: c4d9e2f7a318
+Create Date: 2026-10-19 15:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7a1b3c9e542'
+down_revision = 'c4d9e2f7a318'
+branch_labels = None
+depends_on = None
+
+
+def _has_column(table, column):
+    inspector = sa.inspect(op.get_bind())
+    return column in [col['name'] for col in inspector.get_columns(table)]
+
+
+def upgrade():
+    # db.create_all() already creates the column on fresh databases
+    if not _has_column('recommendations', 'details'):
+        with op.batch_alter_table('recommendations', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('details', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('recommendations', schema=None) as batch_op:
+        batch_op.drop_column('details')
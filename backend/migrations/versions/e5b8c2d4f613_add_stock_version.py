@@ -0,0 +1,33 @@
+"""Add stocks.version
+
+Revision ID: e5b8c2d4f613
+Revises: d7a1b3c9e542
+Create Date: 2026-10-19 18:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b8c2d4f613'
+down_revision = 'd7a1b3c9e542'
+branch_labels = None
+depends_on = None
+
+
+def _has_column(table, column):
+    inspector = sa.inspect(op.get_bind())
+    return column in [col['name'] for col in inspector.get_columns(table)]
+
+
+def upgrade():
+    # db.create_all() already creates the column on fresh databases
+    if not _has_column('stocks', 'version'):
+        with op.batch_alter_table('stocks', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    with op.batch_alter_table('stocks', schema=None) as batch_op:
+        batch_op.drop_column('version')
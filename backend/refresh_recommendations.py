@@ -0,0 +1,19 @@
+#backend/refresh_recommendations.py
+
+"""
+Recompute the ranked recommendation snapshot served by /api/recommendations/top.
+
+Run it from cron (or any scheduler) so web workers only ever read the snapshot:
+
+    */15 * * * * cd /path/to/backend && python refresh_recommendations.py
+"""
+
+from app.factory import create_app
+from app.services.recommendation_service import refresh_recommendation_snapshot
+
+if __name__ == "__main__":
+    app = create_app()
+    
+    with app.app_context():
+        computed_at, coverage = refresh_recommendation_snapshot()
+        print(f"Snapshot computed at {computed_at.isoformat()}: {coverage}")
@@ -8,16 +8,14 @@ import hashlib
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from dotenv import load_dotenv
+from app.utils.database import build_database_uri
 
 # Load environment variables
 load_dotenv()
 
 # Create a direct connection for database initialization
 app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get(
-    'DATABASE_URL', 
-    f"mysql+pymysql://{os.environ.get('DB_USER', 'root')}:{os.environ.get('DB_PASSWORD', '')}@{os.environ.get('DB_HOST', 'localhost')}/{os.environ.get('DB_NAME', 'stock_sentiment')}"
-)
+app.config['SQLALCHEMY_DATABASE_URI'] = build_database_uri()
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db = SQLAlchemy(app)
 
@@ -242,6 +240,7 @@ def create_sample_data():
                     # Create a sentiment record
                     sentiment_record = SentimentData(
                         stock_id=stock.id,
+                        stock_symbol=stock.symbol,
                         source=random.choice(sources),
                         title=f"Sample news about {stock.name}",
                         content=f"This is sample sentiment data for {stock.symbol} with a {sentiment_label} sentiment.",
@@ -0,0 +1,48 @@
+#backend/tests/conftest.py
+
+import pytest
+
+from app.factory import create_app
+from app.models.db import db, create_schema
+from app.services import market_data
+from app.services.indicator_service import IndicatorCache
+from app.utils.cache import StockCache, NotFoundCache, PrincipalCache, RecommendationCache
+from app.utils.db_routing import ReplicaRouter
+from tests.helpers import FakeProvider
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.delenv('DATABASE_REPLICA_URLS', raising=False)
+    monkeypatch.setenv('STOCK_CACHE_BACKEND', 'memory')
+    monkeypatch.setenv('RECOMMENDATION_SNAPSHOT_INTERVAL', '0')
+
+    flask_app = create_app()
+    flask_app.config['TESTING'] = True
+    create_schema(flask_app)
+
+    for cache in (StockCache, NotFoundCache, PrincipalCache, RecommendationCache, IndicatorCache):
+        cache.clear()
+    ReplicaRouter.reset_stats()
+
+    yield flask_app
+
+    with flask_app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def provider():
+    fake = FakeProvider()
+    previous = market_data._provider
+    market_data.set_provider(fake)
+    yield fake
+    market_data.set_provider(previous)
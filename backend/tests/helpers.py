@@ -0,0 +1,94 @@
+#backend/tests/helpers.py
+
+from datetime import datetime, timedelta
+
+from app.models.db import db
+from app.services import market_data
+
+
+class FakeProvider(market_data.MarketDataProvider):
+    """Offline market data: a rising daily series for every symbol in `bars`, recording each call"""
+
+    name = 'fake'
+
+    def __init__(self, symbols=(), days=25, news=None, listed=()):
+        self.bars = {symbol: self.make_bars(days) for symbol in symbols}
+        self.listed = set(listed)  # Known symbols that have no bars (e.g. rate limited)
+        self.news = news or {}
+        self.calls = []
+
+    @staticmethod
+    def make_bars(days, start=100.0, step=1.0):
+        first = datetime(2026, 9, 1)
+        return [{
+            'date': (first + timedelta(days=i)).strftime('%Y-%m-%d'),
+            'open': start + i * step,
+            'high': start + i * step + 1,
+            'low': start + i * step - 1,
+            'close': start + i * step,
+            'volume': 1000 + i
+        } for i in range(days)]
+
+    def history(self, symbol, period='1mo'):
+        self.calls.append(('history', symbol))
+        return list(self.bars.get(symbol, []))
+
+    def quote(self, symbol):
+        self.calls.append(('quote', symbol))
+        bars = self.bars.get(symbol)
+        if not bars:
+            return None
+        return {'current_price': bars[-1]['close'], 'previous_close': bars[-2]['close'], 'open': bars[-1]['open'],
+                'high': bars[-1]['high'], 'low': bars[-1]['low'], 'volume': bars[-1]['volume'],
+                'date': bars[-1]['date']}
+
+    def info(self, symbol):
+        self.calls.append(('info', symbol))
+        return {'shortName': f'{symbol} Inc'} if symbol in self.bars else {}
+
+    def search_news(self, symbol, limit=5):
+        self.calls.append(('search_news', symbol))
+        return list(self.news.get(symbol, []))[:limit]
+
+    def symbol_exists(self, symbol):
+        self.calls.append(('symbol_exists', symbol))
+        return symbol in self.bars or symbol in self.listed
+
+
+def make_user(username='admin', role='admin'):
+    """Create a user and return (user id, Authorization headers); needs an app context"""
+    from app.models.user import User
+    from app.utils.auth import generate_token
+
+    user = User(username=username, email=f'{username}@example.com', role=role)
+    user.password = 'secret123'
+    db.session.add(user)
+    db.session.commit()
+    return user.id, {'Authorization': f'Bearer {generate_token(user.id)}'}
+
+
+def make_stocks(*symbols):
+    """Create stocks and return their ids in order; needs an app context"""
+    from app.models.stock import Stock
+
+    stocks = [Stock(symbol=symbol, name=f'{symbol} Inc', current_price=100.0, previous_close=99.0) for symbol in symbols]
+    db.session.add_all(stocks)
+    db.session.commit()
+    return [stock.id for stock in stocks]
+
+
+def make_sentiment(symbol, stock_id, scores, hours_ago=1):
+    """Store one sentiment row per score, newest last; needs an app context"""
+    from app.models.sentiment import SentimentData
+
+    now = datetime.utcnow()
+    for i, score in enumerate(scores):
+        published = now - timedelta(hours=hours_ago + len(scores) - i)
+        db.session.add(SentimentData(
+            stock_id=stock_id, stock_symbol=symbol, source='Reuters', title=f'{symbol} headline {i}',
+            url=f'https://news.example.com/{symbol}/{i}', compound_score=score,
+            positive_score=max(score, 0), neutral_score=1 - abs(score), negative_score=max(-score, 0),
+            sentiment_label='positive' if score >= 0.05 else 'negative' if score <= -0.05 else 'neutral',
+            published_at=published, created_at=published
+        ))
+    db.session.commit()
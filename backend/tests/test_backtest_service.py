@@ -0,0 +1,105 @@
+#backend/tests/test_backtest_service.py
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.services.backtest_service import run_backtest, sweep_momentum_thresholds
+
+FIRST_DAY = date(2026, 3, 2)
+DAYS = 8
+
+
+def bars(closes):
+    """Daily bars that open at the previous close, so a next-open to next-close trade earns close[i+1] / close[i]"""
+    return [{
+        'date': (FIRST_DAY + timedelta(days=i)).isoformat(),
+        'open': closes[i - 1] if i else closes[0],
+        'close': close
+    } for i, close in enumerate(closes)]
+
+
+def daily_sentiment(scores):
+    """One headline per symbol at noon every day from a week before the first bar to the last"""
+    epoch = datetime(1970, 1, 1)
+    rows = [(index, int((datetime.combine(FIRST_DAY + timedelta(days=day), datetime.min.time())
+                         + timedelta(hours=12) - epoch).total_seconds()), score)
+            for index, score in enumerate(scores) for day in range(-7, DAYS)]
+    symbol_index, seconds, values = zip(*rows)
+    return np.array(symbol_index), np.array(seconds), np.array(values, dtype=float)
+
+
+@pytest.fixture
+def market():
+    prices = {
+        'AAA': [100 * 1.01 ** i for i in range(DAYS)],  # Steady +1% a day
+        'BBB': [100 * 0.99 ** i for i in range(DAYS)],  # Steady -1% a day
+        'CCC': [100.0, 102.0] * (DAYS // 2),  # +2% then -1.96%, alternating
+    }
+    return {symbol: bars(closes) for symbol, closes in prices.items()}
+
+
+def test_returns_and_hit_rates_per_branch(market):
+    # Flat sentiment: trend 0, AAA and CCC at 0.5, BBB at -0.5
+    summary = run_backtest(market, daily_sentiment([0.5, -0.5, 0.5]), horizon=1, lookback=2, hold_band=0.03)
+    branches = summary['branches']
+    ccc_loss = 100 / 102 - 1
+
+    # Day 0 has no lookback yet, so only the sentiment-only rules apply
+    assert branches['buy_sentiment_only']['signals'] == 2  # AAA +1%, CCC +2%
+    assert branches['buy_sentiment_only']['mean_forward_return'] == pytest.approx(0.015)
+    assert branches['sell_sentiment_only']['signals'] == 1
+    assert branches['sell_sentiment_only']['hit_rate'] == 1.0
+
+    # Days 1-6: AAA buys and wins every day; CCC buys after each rise and then loses
+    buy = branches['buy_momentum']
+    assert buy['signals'] == 9
+    assert buy['hit_rate'] == pytest.approx(6 / 9)
+    assert buy['mean_forward_return'] == pytest.approx((6 * 0.01 + 3 * ccc_loss) / 9)
+    assert buy['turnover'] == pytest.approx(4 / 9)  # AAA enters once, CCC flips every day
+
+    sell = branches['sell_momentum']
+    assert (sell['signals'], sell['hit_rate']) == (6, 1.0)
+    assert sell['mean_forward_return'] == pytest.approx(-0.01)
+
+    # CCC after each fall: positive sentiment with a falling price is a hold, then +2%
+    hold = branches['hold_mixed']
+    assert (hold['signals'], hold['hit_rate']) == (3, 1.0)
+    assert hold['mean_forward_return'] == pytest.approx(0.02)
+
+    strategy = summary['strategy']
+    assert strategy['signals'] == 18
+    assert strategy['hit_rate'] == pytest.approx(15 / 18)
+    assert strategy['mean_signed_return'] == pytest.approx((15 * 0.01 + 0.02 - 0.02 + 3 * ccc_loss + 0.01) / 18)
+    assert summary['trading_days'] == DAYS
+
+
+def test_last_day_without_a_forward_return_is_not_scored(market):
+    summary = run_backtest(market, daily_sentiment([0.5, -0.5, 0.5]), horizon=3, lookback=2)
+
+    assert sum(stats['signals'] for stats in summary['branches'].values()) == 3 * (DAYS - 3)
+
+
+def test_grid_picks_the_known_best_threshold(market):
+    # CCC's weaker sentiment (0.375, exact in binary) only clears the lower thresholds, and its buys lose money.
+    # Above 0.5 neither AAA nor BBB trades. Day 0 (sentiment-only rules) is excluded via start.
+    sweep = sweep_momentum_thresholds(market, daily_sentiment([0.5, -0.5, 0.375]), [0.1, 0.25, 0.4, 0.6],
+                                      horizon=1, lookback=2, start=(FIRST_DAY + timedelta(days=1)).isoformat())
+    results = {result['threshold']: result for result in sweep['results']}
+
+    assert sweep['best_threshold'] == 0.4
+    assert results[0.4]['mean_signed_return'] == pytest.approx(0.01)
+    assert results[0.4]['signals'] == 12
+    assert results[0.25]['signals'] == results[0.1]['signals'] == 15
+    assert results[0.25]['mean_signed_return'] < results[0.4]['mean_signed_return']
+    assert results[0.6]['signals'] == 0 and results[0.6]['mean_signed_return'] is None
+
+
+def test_default_threshold_matches_the_live_rules(market):
+    rows = daily_sentiment([0.5, -0.5, 0.375])
+    default = run_backtest(market, rows, horizon=1, lookback=2)
+    sweep = sweep_momentum_thresholds(market, rows, [0.25], horizon=1, lookback=2)
+
+    assert sweep['results'][0]['mean_signed_return'] == pytest.approx(default['strategy']['mean_signed_return'])
+    assert default['momentum_threshold'] == 0.25
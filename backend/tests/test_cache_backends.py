@@ -0,0 +1,124 @@
+#backend/tests/test_cache_backends.py
+
+from datetime import datetime
+
+import pytest
+
+from app.utils import cache_backends
+from app.utils.cache_backends import MemoryBackend, SQLiteBackend, encode_entry, decode_entry
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time: injected into the memory backend, patched in for the sqlite wall clock"""
+    now = [1000.0]
+    monkeypatch.setattr(cache_backends.time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def backend(request, tmp_path, clock):
+    if request.param == 'memory':
+        return MemoryBackend(max_size=3, clock=lambda: clock[0])
+    return SQLiteBackend(path=str(tmp_path / 'cache.sqlite3'), max_size=3)
+
+
+def test_round_trip(backend, clock):
+    value = {'symbol': 'AAPL', 'prices': [1.5, 2, None], 'active': True, 'meta': {'sector': 'Tech'}}
+    backend.set('AAPL', value, 60)
+    clock[0] += 5
+
+    cached, age = backend.get('AAPL')
+    assert cached == value
+    assert age == pytest.approx(5)
+    assert backend.get('MSFT') is None
+
+    backend.delete('AAPL')
+    assert backend.get('AAPL') is None
+
+
+def test_ttl_expiry(backend, clock):
+    backend.set('AAPL', 1, 10)
+    backend.set('MSFT', 2, 100)
+    clock[0] += 10
+
+    assert backend.get('AAPL') is None
+    assert backend.get('MSFT') == (2, 10)
+    assert backend.stats()['expirations'] == 1
+
+    clock[0] += 100
+    assert backend.purge_expired() == 1
+    assert backend.stats()['size'] == 0
+
+
+def test_max_size_evicts_oldest_on_set(backend, clock):
+    for i, symbol in enumerate(['A', 'B', 'C', 'D']):
+        clock[0] += 1
+        backend.set(symbol, i, 60)
+
+    stats = backend.stats()
+    assert stats['size'] == 3
+    assert stats['evictions'] == 1
+    assert backend.get('A') is None
+    assert [backend.get(symbol)[0] for symbol in ('B', 'C', 'D')] == [1, 2, 3]
+
+
+def test_resize_evicts(backend, clock):
+    for symbol in ('A', 'B', 'C'):
+        clock[0] += 1
+        backend.set(symbol, symbol, 60)
+
+    backend.resize(1)
+    assert backend.stats()['size'] == 1
+    assert backend.get('C') == ('C', 0)
+
+
+def test_sqlite_version_mismatch_is_a_miss(tmp_path, clock):
+    backend = SQLiteBackend(path=str(tmp_path / 'cache.sqlite3'))
+    backend.set('AAPL', {'price': 1.0}, 60)
+    conn = backend._connection()
+    blob = conn.execute("SELECT value FROM stock_cache WHERE key = 'AAPL'").fetchone()[0]
+    conn.execute("UPDATE stock_cache SET value = ? WHERE key = 'AAPL'",
+                 (bytes([cache_backends.CACHE_FORMAT_VERSION + 1]) + blob[1:],))
+
+    assert backend.get('AAPL') is None
+    assert backend.stats()['size'] == 0  # The unreadable entry is dropped
+
+
+def test_sqlite_shared_between_instances(tmp_path, clock):
+    path = str(tmp_path / 'cache.sqlite3')
+    SQLiteBackend(path=path).set('AAPL', [1, 2], 60)
+    assert SQLiteBackend(path=path).get('AAPL') == ([1, 2], 0)
+
+
+def test_encode_decode_compresses_large_values():
+    value = {'bars': [{'close': float(i)} for i in range(200)]}
+    blob = encode_entry(value, 123.0)
+    assert blob[0] == cache_backends.CACHE_FORMAT_VERSION
+    assert blob[1] & cache_backends._FLAG_ZLIB
+    assert decode_entry(blob) == (value, 123.0)
+
+
+def test_decode_rejects_other_versions():
+    blob = encode_entry({'a': 1}, 1.0)
+    with pytest.raises(ValueError):
+        decode_entry(bytes([cache_backends.CACHE_FORMAT_VERSION - 1]) + blob[1:])
+
+
+@pytest.mark.parametrize('value', [
+    (1, 2),
+    {'bars': [(1, 2)]},
+    {1: 'integer key'},
+    object(),
+    {'when': datetime(2026, 1, 1)},
+])
+def test_encode_rejects_values_that_do_not_round_trip(value):
+    with pytest.raises(TypeError):
+        encode_entry(value, 1.0)
+
+
+def test_sqlite_set_rejects_unencodable_value(tmp_path):
+    backend = SQLiteBackend(path=str(tmp_path / 'cache.sqlite3'))
+    with pytest.raises(TypeError):
+        backend.set('AAPL', ('tuple',), 60)
+    assert backend.get('AAPL') is None
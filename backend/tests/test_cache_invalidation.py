@@ -0,0 +1,86 @@
+#backend/tests/test_cache_invalidation.py
+
+from datetime import datetime, timedelta
+
+from app.models.db import db
+from app.models.recommendation import Recommendation
+from app.models.stock import Stock
+from app.services.indicator_service import IndicatorCache
+from app.services.recommendation_service import get_fresh_recommendations
+from app.utils.cache import StockCache, RecommendationCache
+from tests.helpers import make_stocks, make_sentiment
+
+
+def add_recommendation(stock_id, created_at=None):
+    recommendation = Recommendation(stock_id=stock_id, type='buy', confidence_score=0.7, reason='test',
+                                    created_at=created_at or datetime.utcnow())
+    db.session.add(recommendation)
+    db.session.commit()
+    return recommendation
+
+
+def test_sentiment_commit_ends_reuse_of_fresh_recommendation(app):
+    with app.app_context():
+        stock_id, other_id = make_stocks('AAA', 'BBB')
+        add_recommendation(stock_id, datetime.utcnow() - timedelta(seconds=30))
+        add_recommendation(other_id, datetime.utcnow() - timedelta(seconds=30))
+        assert set(get_fresh_recommendations([stock_id, other_id], 300)) == {stock_id, other_id}
+
+        make_sentiment('AAA', stock_id, [0.6])
+
+        assert set(get_fresh_recommendations([stock_id, other_id], 300)) == {other_id}
+
+
+def test_uncommitted_sentiment_does_not_invalidate(app):
+    with app.app_context():
+        stock_id, = make_stocks('AAA')
+        created_at = datetime.utcnow() - timedelta(seconds=30)
+        add_recommendation(stock_id, created_at)
+
+        from app.models.sentiment import SentimentData
+        db.session.add(SentimentData(stock_id=stock_id, stock_symbol='AAA', source='Reuters', compound_score=0.5,
+                                     positive_score=0.5, neutral_score=0.5, negative_score=0.0,
+                                     sentiment_label='positive'))
+        db.session.flush()
+        db.session.rollback()
+
+        assert RecommendationCache.is_fresh(stock_id, created_at)
+
+
+def test_new_recommendation_settles_the_change(app):
+    with app.app_context():
+        stock_id, = make_stocks('AAA')
+        make_sentiment('AAA', stock_id, [0.6])
+        assert not RecommendationCache.is_fresh(stock_id, datetime.utcnow() - timedelta(seconds=1))
+
+        add_recommendation(stock_id)
+
+        assert RecommendationCache.stats()['size'] == 0
+        assert set(get_fresh_recommendations([stock_id], 300)) == {stock_id}
+
+
+def test_price_update_invalidates_indicators_and_recommendations(app):
+    with app.app_context():
+        stock_id, = make_stocks('AAA')
+        created_at = datetime.utcnow() - timedelta(seconds=30)
+        add_recommendation(stock_id, created_at)
+        IndicatorCache.set('AAA', '2026-10-19', 20, {'price_change_pct': 1.0})
+        StockCache.set('AAA', {'symbol': 'AAA'})
+
+        db.session.get(Stock, stock_id).current_price = 123.0
+        db.session.commit()
+
+        assert IndicatorCache.latest('AAA') is None
+        assert StockCache.get('AAA') is None
+        assert not RecommendationCache.is_fresh(stock_id, created_at)
+
+
+def test_stock_delete_drops_indicators(app):
+    with app.app_context():
+        stock_id, = make_stocks('AAA')
+        IndicatorCache.set('AAA', '2026-10-19', 20, {'price_change_pct': 1.0})
+
+        db.session.delete(db.session.get(Stock, stock_id))
+        db.session.commit()
+
+        assert IndicatorCache.latest('AAA') is None
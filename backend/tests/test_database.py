@@ -0,0 +1,31 @@
+#backend/tests/test_database.py
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.models.db import db
+from app.models.stock import user_stocks
+from app.utils.database import insert_ignore
+from tests.helpers import make_user, make_stocks
+
+
+def test_insert_ignore_skips_only_duplicate_keys(app):
+    with app.app_context():
+        user_id, _ = make_user()
+        stock_id, = make_stocks('AAA')
+        row = {'user_id': user_id, 'stock_id': stock_id, 'added_at': datetime.utcnow()}
+
+        assert insert_ignore(db.session, user_stocks, row) == 1
+        assert insert_ignore(db.session, user_stocks, [row, row]) == 0
+        db.session.commit()
+
+        with pytest.raises(IntegrityError):  # Unknown stock: a foreign key error, not a duplicate
+            insert_ignore(db.session, user_stocks, {'user_id': user_id, 'stock_id': 999})
+        db.session.rollback()
+
+        with pytest.raises(IntegrityError):
+            insert_ignore(db.session, user_stocks, {'user_id': None, 'stock_id': stock_id})
+        db.session.rollback()
+        assert db.session.query(user_stocks).count() == 1
@@ -0,0 +1,57 @@
+#backend/tests/test_db_pool.py
+
+import sqlalchemy as sa
+
+from app.utils.db_pool import InstrumentedQueuePool, engine_pool_snapshots, pool_snapshot
+from tests.helpers import make_user
+
+
+def test_checkouts_beyond_pool_size_count_as_overflow(tmp_path):
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool,
+                              pool_size=2, max_overflow=2)
+    connections = [engine.connect() for _ in range(3)]
+
+    snapshot = pool_snapshot(engine.pool)
+    assert (snapshot['size'], snapshot['checked_out'], snapshot['overflow']) == (2, 3, 1)
+    assert snapshot['stats']['checkouts'] == 3
+    assert snapshot['stats']['overflow_checkouts'] == 1
+    assert snapshot['stats']['connects'] == 3
+
+    connections[0].close()
+    connections.append(engine.connect())  # Reuses the returned connection, no new overflow
+    snapshot = pool_snapshot(engine.pool)
+    assert (snapshot['checked_out'], snapshot['overflow']) == (3, 1)
+    assert snapshot['stats']['overflow_checkouts'] == 1
+    assert snapshot['stats']['connects'] == 3
+
+    connections[1].invalidate()
+    for connection in connections:
+        connection.close()
+    engine.dispose()
+    stats = pool_snapshot(engine.pool)['stats']  # Counters survive the recreated pool
+    assert (stats['checkouts'], stats['invalidations']) == (4, 1)
+
+
+def test_each_engine_keeps_its_own_counters(tmp_path):
+    engines = {
+        key: sa.create_engine(f"sqlite:///{tmp_path / name}", poolclass=InstrumentedQueuePool,
+                              pool_size=1, max_overflow=1)
+        for key, name in ((None, 'primary.db'), ('replica_0', 'replica.db'))
+    }
+    with engines['replica_0'].connect(), engines['replica_0'].connect():
+        snapshots = engine_pool_snapshots(engines)
+
+    assert set(snapshots) == {'primary', 'replica_0'}
+    assert snapshots['primary']['stats']['checkouts'] == 0
+    assert snapshots['replica_0']['stats']['checkouts'] == 2
+    assert snapshots['replica_0']['overflow'] == 1
+
+
+def test_admin_route_reports_every_engine(app, client):
+    with app.app_context():
+        _, headers = make_user()
+
+    pools = client.get('/api/admin/db/pool', headers=headers).get_json()['pools']
+
+    assert list(pools) == ['primary']
+    assert pools['primary']['stats'] is None  # The test database keeps SQLite's default pool
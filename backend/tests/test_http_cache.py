@@ -0,0 +1,100 @@
+#backend/tests/test_http_cache.py
+
+from datetime import datetime, timedelta
+
+from app.models.db import db
+from app.models.stock import Stock
+from tests.helpers import make_user, make_stocks, make_sentiment
+
+FUTURE = (datetime.utcnow() + timedelta(days=1)).strftime('%a, %d %b %Y %H:%M:%S GMT')
+
+
+def test_single_stock_revalidates_by_date(app, client):
+    with app.app_context():
+        stock_id, = make_stocks('AAA')
+
+    response = client.get(f'/api/stocks/{stock_id}')
+    assert response.last_modified is not None
+    assert client.get(f'/api/stocks/{stock_id}', headers={'If-Modified-Since': FUTURE}).status_code == 304
+
+
+def test_stock_list_is_not_fooled_by_a_delete(app, client):
+    with app.app_context():
+        _, admin = make_user()
+        first_id, _ = make_stocks('AAA', 'BBB')
+
+    response = client.get('/api/stocks/')
+    etag = response.headers['ETag']
+    assert 'Last-Modified' not in response.headers
+    assert client.get('/api/stocks/', headers={'If-None-Match': etag}).status_code == 304
+
+    assert client.delete(f'/api/stocks/{first_id}', headers=admin).status_code == 200
+
+    # A date-only revalidation must not be answered with 304 after the delete
+    response = client.get('/api/stocks/', headers={'If-Modified-Since': FUTURE})
+    assert response.status_code == 200
+    assert [stock['symbol'] for stock in response.get_json()['stocks']] == ['BBB']
+    assert client.get('/api/stocks/', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_sentiment_window_uses_etag_only(app, client):
+    with app.app_context():
+        _, headers = make_user()
+        stock_id, = make_stocks('AAA')
+        make_sentiment('AAA', stock_id, [0.4, 0.1])
+
+    response = client.get('/api/sentiment/stock/AAA', headers=headers)
+    assert 'Last-Modified' not in response.headers
+    conditional = dict(headers, **{'If-Modified-Since': FUTURE})
+    assert client.get('/api/sentiment/stock/AAA', headers=conditional).status_code == 200
+    conditional = dict(headers, **{'If-None-Match': response.headers['ETag']})
+    assert client.get('/api/sentiment/stock/AAA', headers=conditional).status_code == 304
+
+
+def test_recommendation_list_uses_etag_only(app, client):
+    with app.app_context():
+        _, headers = make_user()
+
+    response = client.get('/api/recommendations/', headers=headers)
+    assert response.status_code == 200
+    assert 'Last-Modified' not in response.headers
+    conditional = dict(headers, **{'If-Modified-Since': FUTURE})
+    assert client.get('/api/recommendations/', headers=conditional).status_code == 200
+
+
+def test_updates_within_one_second_change_the_etag(app, client):
+    same_second = datetime(2026, 10, 1, 12, 0, 0)  # What DATETIME(0) keeps of two quick updates
+    with app.app_context():
+        stock_id, = make_stocks('AAA')
+
+    etags = []
+    for price in (101.0, 102.0):
+        with app.app_context():
+            stock = db.session.get(Stock, stock_id)
+            stock.current_price = price
+            stock.last_updated = same_second
+            db.session.commit()
+        etags.append((client.get('/api/stocks/').headers['ETag'],
+                      client.get(f'/api/stocks/{stock_id}').headers['ETag']))
+
+    assert etags[0][0] != etags[1][0]
+    assert etags[0][1] != etags[1][1]
+    response = client.get('/api/stocks/', headers={'If-None-Match': etags[0][0]})
+    assert response.status_code == 200
+    assert response.get_json()['stocks'][0]['current_price'] == 102.0
+
+
+def test_version_counts_row_updates_only(app, client):
+    with app.app_context():
+        _, headers = make_user('reader', 'user')
+        stock_id, = make_stocks('AAA')
+        assert db.session.get(Stock, stock_id).version == 1
+
+        stock = db.session.get(Stock, stock_id)
+        stock.current_price = 150.0
+        db.session.commit()
+        assert db.session.get(Stock, stock_id).version == 2
+
+    assert client.post(f'/api/stocks/watchlist/{stock_id}', headers=headers).status_code == 201
+    with app.app_context():
+        assert db.session.get(Stock, stock_id).version == 2
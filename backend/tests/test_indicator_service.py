@@ -0,0 +1,91 @@
+#backend/tests/test_indicator_service.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import indicator_service as ind
+from app.services.indicator_service import IndicatorCache, compute_indicators
+from tests.helpers import FakeProvider
+
+# Twenty daily closes from Wilder's RSI worked example
+CLOSES = np.array([[44.34, 44.09, 44.15, 43.61, 44.33, 44.83, 45.10, 45.42, 45.84, 46.08,
+                    45.89, 46.03, 45.61, 46.28, 46.28, 46.00, 46.03, 46.41, 46.22, 45.64]])
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    IndicatorCache.clear()
+    yield
+    IndicatorCache.clear()
+
+
+def test_fixed_series_reference_values():
+    assert ind.sma(CLOSES, 5)[0, -1] == pytest.approx(46.06)  # (46.00 + 46.03 + 46.41 + 46.22 + 45.64) / 5
+    assert np.isnan(ind.sma(CLOSES, 5)[0, :4]).all()
+    assert ind.rolling_std(CLOSES, 5)[0, -1] == pytest.approx(0.286793, abs=1e-6)
+    assert ind.ema(CLOSES, span=12)[0, -1] == pytest.approx(45.840796, abs=1e-6)
+    assert ind.rsi(CLOSES)[0, 14] == pytest.approx(50.657415, abs=1e-6)
+    assert ind.rsi(CLOSES)[0, -1] == pytest.approx(43.196520, abs=1e-6)
+    assert np.isnan(ind.rsi(CLOSES)[0, :14]).all()  # Undefined until 14 changes are available
+
+    line, signal, hist = ind.macd(CLOSES)
+    assert line[0, -1] == pytest.approx(0.438293, abs=1e-6)
+    assert signal[0, -1] == pytest.approx(0.426806, abs=1e-6)
+    assert hist[0, -1] == pytest.approx(line[0, -1] - signal[0, -1])
+
+
+def test_small_hand_computed_cases():
+    assert ind.ema(np.array([[1.0, 2.0, 3.0]]), span=3)[0].tolist() == [1.0, 1.5, 2.25]
+    assert ind.rolling_std(np.array([[2.0, 4.0, 4.0, 4.0, 5.0, 5.0, 7.0, 9.0]]), 3)[0, -1] == pytest.approx(2.0)
+    assert ind.rsi(np.arange(1.0, 20.0).reshape(1, -1))[0, -1] == 100.0  # No losses
+    assert np.allclose(ind.macd(np.full((1, 40), 50.0))[0], 0.0)
+    assert ind.price_change_pct(np.array([[np.nan, np.nan, 100.0, 110.0]]))[0] == pytest.approx(10.0)
+
+
+def test_matches_pandas_across_rows_of_different_lengths():
+    rng = np.random.default_rng(7)
+    series = [100 + np.cumsum(rng.normal(0, 1, length)) for length in (60, 45)]
+    closes = np.full((2, 60), np.nan)
+    for row, values in enumerate(series):
+        closes[row, 60 - len(values):] = values  # Right-aligned like build_bar_matrix
+
+    for row, values in enumerate(series):
+        s = pd.Series(values)
+        tail = slice(60 - len(values), None)
+        delta = s.diff()
+        gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+        loss = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False).mean()
+        macd_line = s.ewm(span=12, adjust=False).mean() - s.ewm(span=26, adjust=False).mean()
+
+        expected = {
+            'sma': (ind.sma(closes, 20), s.rolling(20).mean()),
+            'std': (ind.rolling_std(closes, 20), s.rolling(20).std()),
+            'ema': (ind.ema(closes, span=12), s.ewm(span=12, adjust=False).mean()),
+            'rsi': (ind.rsi(closes), (100 - 100 / (1 + gain / loss)).where(delta.notna().cumsum() >= 14)),
+            'macd': (ind.macd(closes)[0], macd_line),
+            'macd_signal': (ind.macd(closes)[1], macd_line.ewm(span=9, adjust=False).mean()),
+        }
+        for name, (actual, reference) in expected.items():
+            np.testing.assert_allclose(actual[row, tail], reference.to_numpy(), rtol=1e-9, atol=1e-9,
+                                       equal_nan=True, err_msg=name)
+
+
+def test_cache_misses_when_a_bar_is_appended():
+    bars = FakeProvider.make_bars(30)
+    first = compute_indicators({'AAA': bars})['AAA']
+    assert compute_indicators({'AAA': bars})['AAA'] is first  # Same last bar date and count: cached
+
+    extended = bars + FakeProvider.make_bars(31)[-1:]
+    second = compute_indicators({'AAA': extended})['AAA']
+    assert second is not first
+    assert (second['last_bar_date'], second['bar_count']) == (extended[-1]['date'], 31)
+    assert IndicatorCache.get('AAA', extended[-1]['date'], 31) is second
+    assert IndicatorCache.get('AAA', bars[-1]['date'], 30) is None  # Only the latest is kept
+
+
+def test_cache_misses_when_history_is_revised_under_the_same_last_date():
+    bars = FakeProvider.make_bars(30)
+    first = compute_indicators({'AAA': bars})['AAA']
+
+    assert compute_indicators({'AAA': bars[1:]})['AAA'] is not first  # Same last date, fewer bars
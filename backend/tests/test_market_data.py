@@ -0,0 +1,69 @@
+#backend/tests/test_market_data.py
+
+import os
+
+import pytest
+
+from app.services.market_data import RecordingProvider, ReplayProvider, recording_path
+from tests.helpers import FakeProvider
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    upstream = FakeProvider(symbols=('AAA',), days=5, news={'AAA': [{'title': 'AAA beats estimates'}]})
+    recorder = RecordingProvider(upstream, str(tmp_path))
+    results = {
+        'history': recorder.history('AAA', period='1mo'),
+        'quote': recorder.quote('AAA'),
+        'info': recorder.info('AAA'),
+        'search_news': recorder.search_news('AAA', limit=5),
+        'symbol_exists': recorder.symbol_exists('AAA'),
+    }
+    return str(tmp_path), upstream, results
+
+
+def replay_all(replay):
+    return {
+        'history': replay.history('AAA', period='1mo'),
+        'quote': replay.quote('AAA'),
+        'info': replay.info('AAA'),
+        'search_news': replay.search_news('AAA', limit=5),
+        'symbol_exists': replay.symbol_exists('AAA'),
+    }
+
+
+def test_replay_returns_what_was_recorded(recorded):
+    directory, upstream, results = recorded
+    assert len(upstream.calls) == 5
+
+    assert replay_all(ReplayProvider(directory)) == results
+    assert len(upstream.calls) == 5  # Replay never reaches the upstream
+
+
+def test_replay_serves_from_memory_after_the_first_read(recorded):
+    directory, _, results = recorded
+    replay = ReplayProvider(directory)
+    replay.history('AAA', period='1mo')
+
+    os.remove(recording_path(directory, 'history', 'AAA', {'period': '1mo'}))
+    assert replay.history('AAA', period='1mo') == results['history']
+
+
+def test_missing_recordings_return_the_empty_value(recorded):
+    directory, _, _ = recorded
+    replay = ReplayProvider(directory)
+
+    assert replay.history('AAA', period='1y') == []
+    assert replay.quote('ZZZ') is None
+    assert replay.info('ZZZ') == {}
+    assert replay.search_news('ZZZ') == []
+    assert replay.symbol_exists('ZZZ') is None
+
+
+def test_recording_path_is_stable(tmp_path):
+    path = recording_path(str(tmp_path), 'history', 'brk/b', {'period': '1mo', 'interval': '1d'})
+
+    assert path == recording_path(str(tmp_path), 'history', 'BRK/B', {'interval': '1d', 'period': '1mo'})
+    assert os.path.dirname(path) == str(tmp_path)
+    assert os.path.basename(path).startswith('history__BRK_B__')
+    assert path != recording_path(str(tmp_path), 'history', 'BRK/B', {'period': '1y', 'interval': '1d'})
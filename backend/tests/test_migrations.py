@@ -0,0 +1,51 @@
+#backend/tests/test_migrations.py
+
+import os
+
+import flask_migrate
+import sqlalchemy as sa
+
+from app.models.db import db, init_migrations
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+SNAPSHOT_INDEX = 'ix_recommendation_snapshots_computed_at_rank'
+
+
+def snapshot_indexes():
+    inspector = sa.inspect(db.engine)
+    if not inspector.has_table('recommendation_snapshots'):
+        return None
+    return {index['name']: index['column_names'] for index in inspector.get_indexes('recommendation_snapshots')}
+
+
+def test_upgrade_creates_snapshot_table_on_older_database(app):
+    init_migrations(app)
+    with app.app_context():
+        db.session.execute(sa.text('DROP TABLE recommendation_snapshots'))
+        db.session.commit()
+        assert snapshot_indexes() is None
+
+        flask_migrate.upgrade(directory=MIGRATIONS_DIR)
+        assert snapshot_indexes() == {SNAPSHOT_INDEX: ['computed_at', 'rank']}
+
+        flask_migrate.downgrade(directory=MIGRATIONS_DIR, revision='8b2e6d41c5a7')
+        assert snapshot_indexes() is None
+
+
+def test_upgrade_is_a_no_op_on_a_fresh_schema(app):
+    init_migrations(app)
+    with app.app_context():
+        flask_migrate.upgrade(directory=MIGRATIONS_DIR)
+        assert snapshot_indexes() == {SNAPSHOT_INDEX: ['computed_at', 'rank']}
+
+
+def test_stock_version_column_round_trips(app):
+    init_migrations(app)
+    with app.app_context():
+        flask_migrate.upgrade(directory=MIGRATIONS_DIR)
+        flask_migrate.downgrade(directory=MIGRATIONS_DIR, revision='d7a1b3c9e542')
+        assert 'version' not in {column['name'] for column in sa.inspect(db.engine).get_columns('stocks')}
+
+        flask_migrate.upgrade(directory=MIGRATIONS_DIR)
+        columns = {column['name']: column for column in sa.inspect(db.engine).get_columns('stocks')}
+        assert columns['version']['nullable'] is False
@@ -0,0 +1,88 @@
+#backend/tests/test_principal_cache.py
+
+import pytest
+
+from app.models.db import db
+from app.models.user import User
+from app.utils.cache import PrincipalCache
+from app.utils.cache_backends import MemoryBackend, SQLiteBackend
+from tests.helpers import make_user
+from tests.test_query_counts import count_queries
+
+
+@pytest.fixture
+def user(app):
+    with app.app_context():
+        user_id, headers = make_user('reader', role='user')
+        engine = db.engine
+    return user_id, headers, engine
+
+
+def user_queries(statements):
+    return [statement for statement in statements if 'FROM users' in statement]
+
+
+def test_token_required_serves_repeat_requests_from_the_cache(client, user):
+    _, headers, engine = user
+    client.get('/api/auth/profile', headers=headers)
+    hits = PrincipalCache.stats()['hits']
+
+    with count_queries(engine) as statements:
+        response = client.get('/api/auth/profile', headers=headers)
+
+    assert response.get_json()['user']['username'] == 'reader'
+    assert user_queries(statements) == []
+    assert PrincipalCache.stats()['hits'] == hits + 1
+
+
+def test_role_change_invalidates_cached_tokens(app, client, user):
+    user_id, headers, _ = user
+    assert client.get('/api/admin/cache/stats', headers=headers).status_code == 403
+    invalidations = PrincipalCache.stats()['invalidations']
+
+    with app.app_context():
+        db.session.get(User, user_id).role = 'admin'
+        db.session.commit()
+
+    assert client.get('/api/auth/profile', headers=headers).get_json()['user']['role'] == 'admin'
+    assert client.get('/api/admin/cache/stats', headers=headers).status_code == 200
+    assert PrincipalCache.stats()['invalidations'] == invalidations + 1
+
+
+def test_password_change_invalidates_cached_tokens(client, user):
+    _, headers, engine = user
+    client.get('/api/auth/profile', headers=headers)
+    invalidations = PrincipalCache.stats()['invalidations']
+
+    assert client.put('/api/auth/profile', json={'password': 'changed456'}, headers=headers).status_code == 200
+    with count_queries(engine) as statements:
+        client.get('/api/auth/profile', headers=headers)
+
+    assert PrincipalCache.stats()['invalidations'] == invalidations + 1
+    assert len(user_queries(statements)) == 1  # Reloaded once, then cached under the new generation
+
+
+def test_invalidation_reaches_workers_sharing_the_generation_store(app, tmp_path, monkeypatch):
+    path = str(tmp_path / 'cache.sqlite3')
+    for attribute in ('_backend', '_generations'):
+        monkeypatch.setattr(PrincipalCache, attribute, getattr(PrincipalCache, attribute))
+    PrincipalCache.configure(generations=SQLiteBackend(path=path, table='principal_generation'))
+    PrincipalCache.set(1, 1000, 'snapshot')
+    assert PrincipalCache.get(1, 1000) == 'snapshot'
+
+    other_worker = SQLiteBackend(path=path, table='principal_generation')
+    other_worker.set('1', 'bumped-elsewhere', PrincipalCache.ttl * 2)
+
+    assert PrincipalCache.get(1, 1000) is None
+
+
+def test_generations_are_bounded_and_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(PrincipalCache, '_generations', MemoryBackend(max_size=4, clock=lambda: now[0]))
+    for user_id in range(10):
+        PrincipalCache.invalidate(user_id)
+    assert PrincipalCache.stats()['generations']['size'] == 4
+
+    now[0] += PrincipalCache.ttl * 2
+    PrincipalCache.set(9, 1000, 'snapshot')
+    assert PrincipalCache.get(9, 1000) == 'snapshot'  # Expired generations fall back to the default
@@ -0,0 +1,70 @@
+#backend/tests/test_query_counts.py
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.models.db import db
+from app.models.recommendation import Recommendation
+from tests.helpers import make_user, make_stocks
+
+
+@contextmanager
+def count_queries(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def seed(stock_count, recommendations_per_stock=3):
+    stock_ids = make_stocks(*[f'S{i:03d}' for i in range(stock_count)])
+    now = datetime.utcnow()
+    db.session.add_all([
+        Recommendation(stock_id=stock_id, type='buy', confidence_score=0.6, reason='test',
+                       created_at=now - timedelta(minutes=10 * (recommendations_per_stock - n)))  # Newest last
+        for stock_id in stock_ids for n in range(recommendations_per_stock)
+    ])
+    db.session.commit()
+
+
+def recommendations_request_queries(app, client, stock_count):
+    with app.app_context():
+        _, headers = make_user()
+        seed(stock_count)
+        engine = db.engine
+
+    client.get('/api/recommendations/', headers=headers)  # Warm the principal cache
+    with count_queries(engine) as statements:
+        response = client.get('/api/recommendations/', headers=headers)
+    assert response.status_code == 200
+    assert len(response.get_json()['recommendations']) == stock_count
+    return len(statements)
+
+
+@pytest.mark.parametrize('stock_count', [1, 25])
+def test_recommendation_list_query_count_is_constant(app, client, stock_count):
+    # Two validator aggregates plus one windowed query, whatever the number of stocks
+    assert recommendations_request_queries(app, client, stock_count) == 3
+
+
+def test_recommendation_list_returns_latest_per_stock(app, client):
+    with app.app_context():
+        _, headers = make_user()
+        seed(3)
+        latest = {
+            stock_id: rec_id for stock_id, rec_id in db.session.query(
+                Recommendation.stock_id, db.func.max(Recommendation.id)
+            ).group_by(Recommendation.stock_id)
+        }
+
+    entries = client.get('/api/recommendations/', headers=headers).get_json()['recommendations']
+    assert {entry['stock']['id']: entry['recommendation']['id'] for entry in entries} == latest
@@ -0,0 +1,21 @@
+#backend/tests/test_query_plans.py
+
+import pytest
+
+from app.models.db import db
+from app.services.synthetic_data import generate_dataset
+from app.utils.query_plans import sample_parameters, hot_queries, analyze, explain
+
+
+@pytest.fixture
+def seeded(app):
+    with app.app_context():
+        generate_dataset(db, stocks=40, users=0, sentiment_rows=5000, recommendation_rows=2000, span_days=30)
+        analyze(db)
+        yield sample_parameters(db)
+
+
+def test_hot_queries_use_their_indexes(seeded):
+    for name, query, expected in hot_queries(db, seeded):
+        plan, used = explain(db, query)
+        assert used & expected, f"{name} uses {sorted(used) or 'no index'}:\n{plan}"
@@ -0,0 +1,92 @@
+#backend/tests/test_recommendation_engine.py
+
+import time
+
+import pytest
+
+from app.services.indicator_service import IndicatorCache
+from app.services.recommendation_engine import generate_recommendations_batch, load_price_changes
+from app.services.recommendation_service import generate_recommendation
+from tests.helpers import make_stocks, make_sentiment
+
+# symbol -> (sentiment scores oldest first, price step per bar or None for no price data)
+SCENARIOS = {
+    'BUYM': ([0.5, 0.5, 0.6, 0.6], 1.0),  # buy_momentum
+    'SELLM': ([-0.5, -0.5, -0.6, -0.6], -1.0),  # sell_momentum
+    'IMPR': ([-0.6, -0.6, 0.0, 0.0], 1.0),  # buy_improving
+    'WORS': ([0.6, 0.6, 0.0, 0.0], 1.0),  # sell_worsening
+    'MIXD': ([0.1, 0.1, 0.1], -1.0),  # hold_mixed, no trend below four rows
+    'SBUY': ([0.5, 0.5, 0.5, 0.5], None),  # buy_sentiment_only
+    'SSEL': ([-0.5, -0.4, -0.5], None),  # sell_sentiment_only
+    'SHLD': ([0.1, 0.0, 0.1], None),  # hold_sentiment_only
+}
+FIELDS = ('type', 'confidence_score', 'reason', 'time_frame', 'price_target')
+
+
+@pytest.fixture
+def universe(app, provider):
+    with app.app_context():
+        ids = make_stocks(*SCENARIOS)
+        for (symbol, (scores, step)), stock_id in zip(SCENARIOS.items(), ids):
+            make_sentiment(symbol, stock_id, scores)
+            if step is not None:
+                provider.bars[symbol] = provider.make_bars(25, step=step)
+    return dict(zip(SCENARIOS, ids))
+
+
+def test_batch_matches_generate_recommendation(app, provider, universe):
+    with app.app_context():
+        batch = {rec['stock_id']: rec for rec in generate_recommendations_batch(fetch_missing_prices=True)}
+        assert {rec['branch'] for rec in batch.values()} == {
+            'buy_momentum', 'sell_momentum', 'buy_improving', 'sell_worsening', 'hold_mixed',
+            'buy_sentiment_only', 'sell_sentiment_only', 'hold_sentiment_only'
+        }
+
+        for symbol, stock_id in universe.items():
+            scalar = generate_recommendation(stock_id, source='stored')
+            for field in FIELDS:
+                assert batch[stock_id].get(field) == pytest.approx(scalar.get(field)), (symbol, field)
+
+
+def test_batch_reuses_cached_indicators(app, provider, universe):
+    with app.app_context():
+        first = generate_recommendations_batch(fetch_missing_prices=True)
+        provider.calls.clear()
+        assert generate_recommendations_batch() == first
+        assert provider.calls == []
+
+
+def test_missing_prices_are_fetched_in_parallel(app, provider, monkeypatch):
+    symbols = ['A', 'B', 'C', 'D']
+    for symbol in symbols:
+        provider.bars[symbol] = provider.make_bars(25)
+    history = provider.history
+
+    def slow_history(symbol, period='1mo'):
+        time.sleep(0.2)
+        return history(symbol, period)
+    monkeypatch.setattr(provider, 'history', slow_history)
+
+    with app.app_context():
+        IndicatorCache.clear()
+        started = time.monotonic()
+        changes = load_price_changes(symbols, fetch_missing=True, max_workers=4)
+
+    assert time.monotonic() - started < 0.6  # Serial fetching would take 0.8s
+    assert set(changes) == set(symbols)
+
+
+def test_timed_out_fetches_leave_symbols_without_prices(app, provider, monkeypatch):
+    provider.bars['FAST'] = provider.make_bars(25)
+    provider.bars['SLOW'] = provider.make_bars(25)
+    history = provider.history
+
+    def history_with_latency(symbol, period='1mo'):
+        time.sleep(1.0 if symbol == 'SLOW' else 0)
+        return history(symbol, period)
+    monkeypatch.setattr(provider, 'history', history_with_latency)
+
+    with app.app_context():
+        changes = load_price_changes(['FAST', 'SLOW'], fetch_missing=True, per_stock_timeout=0.2)
+
+    assert set(changes) == {'FAST'}
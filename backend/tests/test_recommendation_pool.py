@@ -0,0 +1,65 @@
+#backend/tests/test_recommendation_pool.py
+
+import time
+
+from app.services.recommendation_service import iter_recommendations
+
+
+def sleeping_task(durations):
+    def task(stock_id):
+        time.sleep(durations[stock_id])
+        return {'stock_id': stock_id}
+    return task
+
+
+def collect(**options):
+    started = time.monotonic()
+    results = {stock_id: status for stock_id, _, status in iter_recommendations(**options)}
+    return results, time.monotonic() - started
+
+
+def test_budget_is_enforced_while_waiting(app):
+    with app.app_context():
+        results, elapsed = collect(stock_ids=[1, 2], task=sleeping_task({1: 0.01, 2: 1.0}),
+                                   max_workers=2, per_stock_timeout=0.2, deadline=5)
+
+    assert results == {1: 'completed', 2: 'timed_out'}
+    assert elapsed < 0.6  # Not held until the slow worker returns
+
+
+def test_results_within_budget_are_kept(app):
+    with app.app_context():
+        results, _ = collect(stock_ids=[1, 2, 3], task=sleeping_task({1: 0.05, 2: 0.15, 3: 0.1}),
+                             max_workers=3, per_stock_timeout=0.5, deadline=5)
+
+    assert results == {1: 'completed', 2: 'completed', 3: 'completed'}
+
+
+def test_queued_stocks_start_their_budget_when_picked_up(app):
+    with app.app_context():
+        # One worker: each stock waits for the previous ones but only its own run counts
+        results, _ = collect(stock_ids=[1, 2, 3], task=sleeping_task({1: 0.1, 2: 0.1, 3: 0.1}),
+                             max_workers=1, per_stock_timeout=0.25, deadline=5)
+
+    assert results == {1: 'completed', 2: 'completed', 3: 'completed'}
+
+
+def test_overall_deadline_times_out_the_rest(app):
+    with app.app_context():
+        results, elapsed = collect(stock_ids=[1, 2, 3], task=sleeping_task({1: 0.01, 2: 1.0, 3: 1.0}),
+                                   max_workers=1, per_stock_timeout=5, deadline=0.2)
+
+    assert results == {1: 'completed', 2: 'timed_out', 3: 'timed_out'}
+    assert elapsed < 0.6
+
+
+def test_failures_are_reported(app):
+    def task(stock_id):
+        if stock_id == 2:
+            raise RuntimeError('boom')
+        return None if stock_id == 3 else {'stock_id': stock_id}
+
+    with app.app_context():
+        results, _ = collect(stock_ids=[1, 2, 3], task=task, max_workers=3, per_stock_timeout=1, deadline=5)
+
+    assert results == {1: 'completed', 2: 'failed', 3: 'failed'}
@@ -0,0 +1,188 @@
+#backend/tests/test_recommendation_reuse.py
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.models.db import db
+from app.models.recommendation import Recommendation
+from app.models.stock import Stock
+from app.services import recommendation_service
+from app.services.indicator_service import compute_indicators
+from tests.helpers import make_user, make_stocks, make_sentiment
+
+ENTRY_KEYS = {'stock', 'recommendation', 'details', 'is_cached'}
+
+
+@pytest.fixture
+def stock(app, provider):
+    provider.bars['AAA'] = provider.make_bars(25)
+    with app.app_context():
+        _, headers = make_user()
+        stock_id, = make_stocks('AAA')
+        make_sentiment('AAA', stock_id, [0.5, 0.5, 0.6, 0.6])
+    return stock_id, headers
+
+
+def history_calls(provider):
+    return [call for call in provider.calls if call[0] in ('history', 'search_news')]
+
+
+def test_fresh_recommendation_is_reused_without_fetching(app, client, provider, stock):
+    _, headers = stock
+
+    first = client.get('/api/recommendations/stock/AAA', headers=headers).get_json()
+    assert first['is_cached'] is False
+    assert history_calls(provider) == [('history', 'AAA')]
+
+    provider.calls.clear()
+    second = client.get('/api/recommendations/stock/AAA', headers=headers).get_json()
+    assert second['is_cached'] is True
+    assert history_calls(provider) == []
+
+    # Same shape and details whether computed or reused
+    assert set(first) == set(second) == ENTRY_KEYS
+    assert second['recommendation'] == first['recommendation']
+    assert second['details'] == first['details']
+    assert first['details']['sentiment_data']['avg_sentiment'] == pytest.approx(0.55)
+    assert first['details']['price_data']['price_change_pct'] > 0
+
+
+def test_stale_recommendation_is_reused_when_stored_inputs_match(app, client, provider, stock):
+    _, headers = stock
+    app.config['RECOMMENDATION_FRESH_SECONDS'] = 0
+
+    client.get('/api/recommendations/stock/AAA', headers=headers)
+    provider.calls.clear()
+    response = client.get('/api/recommendations/stock/AAA', headers=headers).get_json()
+
+    assert response['is_cached'] is True
+    assert history_calls(provider) == []  # The fingerprint comes from stored rows only
+
+
+def test_new_sentiment_forces_a_recompute(app, client, provider, stock):
+    stock_id, headers = stock
+    first = client.get('/api/recommendations/stock/AAA', headers=headers).get_json()
+
+    with app.app_context():
+        make_sentiment('AAA', stock_id, [-0.9], hours_ago=0)
+    provider.calls.clear()
+    second = client.get('/api/recommendations/stock/AAA', headers=headers).get_json()
+
+    assert second['is_cached'] is False
+    assert second['recommendation']['id'] != first['recommendation']['id']
+    assert history_calls(provider) == [('history', 'AAA')]
+
+
+def test_price_update_forces_a_recompute(app, client, provider, stock):
+    stock_id, headers = stock
+    app.config['RECOMMENDATION_FRESH_SECONDS'] = 0
+    client.get('/api/recommendations/stock/AAA', headers=headers)
+
+    with app.app_context():
+        db.session.get(Stock, stock_id).current_price = 150.0
+        db.session.commit()
+
+    assert client.get('/api/recommendations/stock/AAA', headers=headers).get_json()['is_cached'] is False
+
+
+def test_new_trading_day_forces_a_recompute_when_only_the_price_moved(app, client, provider, stock, monkeypatch):
+    _, headers = stock
+    app.config['RECOMMENDATION_FRESH_SECONDS'] = 0
+    first = client.get('/api/recommendations/stock/AAA', headers=headers).get_json()
+
+    # The market moves to a new bar; nothing stored for the stock changes
+    provider.bars['AAA'] = provider.make_bars(26, start=200)
+    assert client.get('/api/recommendations/stock/AAA', headers=headers).get_json()['is_cached'] is True
+
+    next_day = recommendation_service.current_trading_date() + timedelta(days=1)
+    monkeypatch.setattr(recommendation_service, 'current_trading_date', lambda: next_day)
+    provider.calls.clear()
+    second = client.get('/api/recommendations/stock/AAA', headers=headers).get_json()
+
+    assert second['is_cached'] is False
+    assert history_calls(provider) == [('history', 'AAA')]
+    assert second['details']['price_data']['end_price'] != first['details']['price_data']['end_price']
+    assert second['details']['price_data']['indicators']['last_bar_date'] == provider.bars['AAA'][-1]['date']
+
+
+def test_newer_bars_seen_by_the_worker_force_a_recompute(app, client, provider, stock):
+    _, headers = stock
+    app.config['RECOMMENDATION_FRESH_SECONDS'] = 0
+    client.get('/api/recommendations/stock/AAA', headers=headers)
+
+    # Another request (e.g. a /top refresh) computed indicators on a newer bar
+    provider.bars['AAA'] = provider.make_bars(26, start=200)
+    compute_indicators({'AAA': provider.bars['AAA']})
+
+    assert client.get('/api/recommendations/stock/AAA', headers=headers).get_json()['is_cached'] is False
+
+
+def test_fingerprint_reuse_is_bounded_by_age(app, client, provider, stock):
+    stock_id, headers = stock
+    app.config['RECOMMENDATION_FRESH_SECONDS'] = 0
+    client.get('/api/recommendations/stock/AAA', headers=headers)
+
+    with app.app_context():
+        latest = Recommendation.query.filter_by(stock_id=stock_id).one()
+        latest.created_at = datetime.utcnow() - timedelta(seconds=app.config['RECOMMENDATION_MAX_REUSE_SECONDS'] + 1)
+        db.session.commit()
+
+    assert client.get('/api/recommendations/stock/AAA', headers=headers).get_json()['is_cached'] is False
+
+
+@pytest.mark.parametrize('today, trading_day', [
+    (date(2026, 10, 16), date(2026, 10, 16)),  # Friday
+    (date(2026, 10, 17), date(2026, 10, 16)),  # Saturday
+    (date(2026, 10, 18), date(2026, 10, 16)),  # Sunday
+    (date(2026, 10, 19), date(2026, 10, 19)),  # Monday
+])
+def test_weekends_roll_back_to_friday(today, trading_day):
+    now = datetime.combine(today, datetime.min.time())
+    assert recommendation_service.current_trading_date(now) == trading_day
+
+
+def test_compare_entries_have_one_shape(app, client, provider, stock):
+    stock_id, headers = stock
+    provider.bars['BBB'] = provider.make_bars(25, step=-1.0)
+    with app.app_context():
+        other_id, = make_stocks('BBB')
+        make_sentiment('BBB', other_id, [-0.5, -0.5, -0.6])
+
+    client.get('/api/recommendations/stock/AAA', headers=headers)  # AAA is now fresh, BBB is computed
+    entries = client.post('/api/recommendations/compare', json={'stock_ids': [stock_id, other_id]},
+                          headers=headers).get_json()['recommendations']
+
+    assert {entry['stock']['symbol']: entry['is_cached'] for entry in entries} == {'AAA': True, 'BBB': False}
+    for entry in entries:
+        assert set(entry) == ENTRY_KEYS
+        assert set(entry['details']) == {'sentiment_data', 'price_data'}
+
+
+@pytest.mark.parametrize('stock_ids', [[{}], [[1]], ['1'], [1.5], [True], [1, None]])
+def test_compare_rejects_non_integer_ids(client, stock, stock_ids):
+    _, headers = stock
+    response = client.post('/api/recommendations/compare', json={'stock_ids': stock_ids}, headers=headers)
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Stock IDs must be integers'}
+
+
+@pytest.mark.parametrize('days', [0, -1, 91, 1.5, '7', True, None])
+def test_compare_rejects_invalid_days(client, stock, days):
+    stock_id, headers = stock
+    response = client.post('/api/recommendations/compare', json={'stock_ids': [stock_id], 'days': days},
+                           headers=headers)
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'days must be an integer between 1 and 90'}
+
+
+def test_compare_reports_coverage_and_stores_results(app, client, provider, stock):
+    stock_id, headers = stock
+    body = client.post('/api/recommendations/compare', json={'stock_ids': [stock_id, 999], 'days': 90},
+                       headers=headers).get_json()
+
+    assert (body['coverage']['total'], body['coverage']['completed'], body['coverage']['failed']) == (2, 1, 1)
+    with app.app_context():
+        assert Recommendation.query.filter_by(stock_id=stock_id).count() == 1
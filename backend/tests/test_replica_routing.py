@@ -0,0 +1,185 @@
+#backend/tests/test_replica_routing.py
+
+import sqlite3
+import time
+
+import pytest
+
+from app.factory import create_app
+from app.models.db import db, create_schema
+from app.models.stock import Stock
+from app.utils import db_routing
+from app.utils.cache_backends import create_cache_backend
+from app.utils.db_routing import ReplicaRouter
+from app.utils.http_cache import make_etag
+from tests.helpers import make_user
+
+MAX_LAG = 0.5
+
+
+def count_rows(path, table):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def replicated(tmp_path, monkeypatch):
+    """
+    An app whose replica is a copy of the primary taken before one more stock was added
+
+    Write marks go to a SQLite cache file, as they would with several workers on one host.
+    """
+    primary, replica = tmp_path / 'primary.db', tmp_path / 'replica.db'
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{primary}")
+    monkeypatch.setenv('DATABASE_REPLICA_URLS', f"sqlite:///{replica}")
+    monkeypatch.setenv('DB_REPLICA_MAX_LAG_SECONDS', str(MAX_LAG))
+    monkeypatch.setenv('STOCK_CACHE_BACKEND', 'sqlite')
+    monkeypatch.setenv('STOCK_CACHE_PATH', str(tmp_path / 'cache.db'))
+    monkeypatch.setenv('RECOMMENDATION_SNAPSHOT_INTERVAL', '0')
+
+    app = create_app()
+    app.config['TESTING'] = True
+    create_schema(app)
+
+    with app.app_context():
+        _, writer = make_user('writer', 'user')
+        _, reader = make_user('reader', 'user')
+        db.session.add_all([Stock(symbol='AAA', name='AAA Corp'), Stock(symbol='BBB', name='BBB Corp')])
+        db.session.commit()
+
+        source, target = sqlite3.connect(primary), sqlite3.connect(replica)
+        source.backup(target)
+        source.close()
+        target.close()
+        db.engines['replica_0'].dispose()
+
+        lagging = Stock(symbol='LAG', name='Not replicated yet')
+        db.session.add(lagging)
+        db.session.commit()
+        lagging_id = lagging.id
+
+    ReplicaRouter.reset_stats()
+    yield app, {'writer': writer, 'reader': reader}, lagging_id, (str(primary), str(replica))
+
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def test_reads_go_to_the_replica(replicated):
+    app, _, _, _ = replicated
+    symbols = {stock['symbol'] for stock in app.test_client().get('/api/stocks/').get_json()['stocks']}
+
+    assert symbols == {'AAA', 'BBB'}
+    with app.app_context():
+        assert ReplicaRouter.stats(db.engines)['replica_reads'] > 0
+
+
+def test_writer_reads_its_own_writes_until_the_lag_tolerance_passes(replicated):
+    app, headers, lagging_id, (primary, replica) = replicated
+    client = app.test_client()
+    history = f'/api/recommendations/history/{lagging_id}'
+
+    assert client.post(f'/api/stocks/watchlist/{lagging_id}', headers=headers['writer']).status_code == 201
+    assert (count_rows(primary, 'user_stocks'), count_rows(replica, 'user_stocks')) == (1, 0)
+
+    watchlist = client.get('/api/stocks/watchlist', headers=headers['writer']).get_json()['watchlist']
+    assert [stock['id'] for stock in watchlist] == [lagging_id]
+    assert client.get(history, headers=headers['reader']).status_code == 404
+    assert client.get(history, headers=headers['writer']).status_code == 200
+
+    time.sleep(MAX_LAG + 0.1)
+    assert client.get(history, headers=headers['writer']).status_code == 404
+
+    with app.app_context():
+        assert ReplicaRouter.stats(db.engines)['sticky_requests'] == 2
+
+
+def test_write_marks_are_shared_between_workers(replicated, tmp_path):
+    app, headers, lagging_id, _ = replicated
+    client = app.test_client()
+    assert client.post(f'/api/stocks/watchlist/{lagging_id}', headers=headers['writer']).status_code == 201
+
+    # Another worker opens the same store with an empty process memory
+    ReplicaRouter.configure(backend=create_cache_backend('sqlite', path=str(tmp_path / 'cache.db'),
+                                                         namespace='replica_sticky'))
+
+    assert client.get(f'/api/recommendations/history/{lagging_id}', headers=headers['writer']).status_code == 200
+
+
+def test_stock_reads_without_token_required_still_follow_the_writer(replicated):
+    app, headers, lagging_id, _ = replicated
+    client = app.test_client()
+    assert client.post(f'/api/stocks/watchlist/{lagging_id}', headers=headers['writer']).status_code == 201
+
+    # GET /api/stocks/<id> has no token_required; the bearer token still identifies the writer
+    assert client.get(f'/api/stocks/{lagging_id}', headers=headers['writer']).status_code == 200
+    assert client.get(f'/api/stocks/{lagging_id}', headers=headers['reader']).status_code == 404
+    assert client.get(f'/api/stocks/{lagging_id}').status_code == 404
+
+
+class Alternating:
+    """Stands in for the random module: each choice() takes the next replica"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def choice(self, engines):
+        self.calls += 1
+        return engines[self.calls % len(engines)]
+
+
+@pytest.fixture
+def two_replicas(tmp_path, monkeypatch):
+    """An app with two replicas that have caught up to different points: two and three stocks"""
+    primary, first, second = tmp_path / 'primary.db', tmp_path / 'replica_0.db', tmp_path / 'replica_1.db'
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{primary}")
+    monkeypatch.setenv('DATABASE_REPLICA_URLS', f"sqlite:///{first},sqlite:///{second}")
+    monkeypatch.setenv('STOCK_CACHE_BACKEND', 'memory')
+    monkeypatch.setenv('RECOMMENDATION_SNAPSHOT_INTERVAL', '0')
+
+    app = create_app()
+    app.config['TESTING'] = True
+    create_schema(app)
+
+    with app.app_context():
+        for symbols, replica in ((('AAA', 'BBB'), first), (('CCC',), second)):
+            db.session.add_all([Stock(symbol=symbol, name=f'{symbol} Corp') for symbol in symbols])
+            db.session.commit()
+            source, target = sqlite3.connect(primary), sqlite3.connect(replica)
+            source.backup(target)
+            source.close()
+            target.close()
+        for engine in db.engines.values():
+            engine.dispose()
+
+    chooser = Alternating()
+    monkeypatch.setattr(db_routing, 'random', chooser)
+    ReplicaRouter.reset_stats()
+    yield app, chooser
+
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def test_one_request_reads_from_a_single_replica(two_replicas):
+    app, chooser = two_replicas
+    client = app.test_client()
+    seen = set()
+
+    for request_number in range(1, 5):
+        response = client.get('/api/stocks/')
+        stocks = response.get_json()['stocks']
+        # The ETag query and the list query must have seen the same replica
+        expected = make_etag('stocks', len(stocks), sum(stock['id'] for stock in stocks), len(stocks), None, None)
+        assert response.get_etag()[0] == expected
+        assert chooser.calls == request_number  # One pick per request, not per SELECT
+        seen.add(len(stocks))
+
+    assert seen == {2, 3}  # Both replicas served requests
@@ -0,0 +1,129 @@
+#backend/tests/test_stock_cache.py
+
+import threading
+import time
+
+import pytest
+
+from app.utils.cache import StockCache
+from app.utils.cache_backends import MemoryBackend
+
+TTL = 10
+STALE = 5
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """StockCache on a memory backend and a hand-driven clock"""
+    now = [1000.0]
+    for attribute in ('_backend', 'default_ttl', 'stale_ttl', 'refresh_ahead_hits', 'refresh_ahead_ratio', 'clock',
+                      '_last_purge', '_access_window_start'):
+        monkeypatch.setattr(StockCache, attribute, getattr(StockCache, attribute))
+    StockCache.configure(backend=MemoryBackend(max_size=16, clock=lambda: now[0]), default_ttl=TTL,
+                         stale_ttl=STALE, refresh_ahead_hits=0, refresh_ahead_ratio=0.8, clock=lambda: now[0])
+    StockCache.reset_stats()
+    yield now
+    wait_for_refreshes()
+
+
+class Loader:
+    """Counts calls and, when gated, blocks until released so a refresh can be observed in flight"""
+
+    def __init__(self, value, gated=False):
+        self.value = value
+        self.calls = 0
+        self.release = threading.Event()
+        if not gated:
+            self.release.set()
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        assert self.release.wait(5)
+        return self.value
+
+
+def wait_for_refreshes():
+    deadline = time.monotonic() + 5
+    while StockCache.stats()['refreshing'] and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert StockCache.stats()['refreshing'] == 0
+
+
+def test_stale_value_is_served_while_one_refresh_runs(clock):
+    StockCache.set('AAA', {'price': 1})
+    clock[0] += TTL + 1  # Past the TTL, inside the stale window
+    loader = Loader({'price': 2}, gated=True)
+
+    for _ in range(3):
+        assert StockCache.get_or_load('AAA', loader) == ({'price': 1}, True)
+    assert StockCache.stats()['refreshing'] == 1
+
+    loader.release.set()
+    wait_for_refreshes()
+    assert loader.calls == 1
+    assert StockCache.get_or_load('AAA', loader) == ({'price': 2}, True)
+    assert StockCache.stats()['stale_hits'] == 3
+    assert StockCache.stats()['refreshes'] == 1
+
+
+def test_concurrent_stale_reads_start_a_single_refresh(clock):
+    StockCache.set('AAA', {'price': 1})
+    clock[0] += TTL + 1
+    loader = Loader({'price': 2}, gated=True)
+    barrier = threading.Barrier(16)
+    results = []
+
+    def read():
+        barrier.wait()
+        results.append(StockCache.get_or_load('AAA', loader))
+
+    threads = [threading.Thread(target=read) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    loader.release.set()
+    wait_for_refreshes()
+
+    assert results == [({'price': 1}, True)] * 16
+    assert loader.calls == 1
+
+
+def test_past_the_stale_window_loads_synchronously(clock):
+    StockCache.set('AAA', {'price': 1})
+    clock[0] += TTL + STALE
+    loader = Loader({'price': 2})
+
+    assert StockCache.get_or_load('AAA', loader) == ({'price': 2}, False)
+    assert loader.calls == 1
+    assert StockCache.stats()['refreshing'] == 0
+
+
+def test_refresh_ahead_starts_once_a_key_is_hot(clock):
+    StockCache.configure(refresh_ahead_hits=3)
+    StockCache.set('AAA', {'price': 1})
+    loader = Loader({'price': 2})
+
+    clock[0] += TTL * 0.5  # Counted, but not yet near expiry
+    StockCache.get_or_load('AAA', loader)
+    clock[0] += TTL * 0.35  # Past refresh_ahead_ratio; second and third accesses in the window
+    StockCache.get_or_load('AAA', loader)
+    assert loader.calls == 0  # Two accesses: below the threshold
+
+    assert StockCache.get_or_load('AAA', loader) == ({'price': 1}, True)
+    wait_for_refreshes()
+    assert loader.calls == 1
+    assert StockCache.stats()['refresh_ahead'] == 1
+    assert StockCache.get_or_load('AAA', loader) == ({'price': 2}, True)
+
+
+def test_refresh_ahead_is_disabled_by_default(clock):
+    StockCache.set('AAA', {'price': 1})
+    loader = Loader({'price': 2})
+    clock[0] += TTL * 0.9
+
+    for _ in range(10):
+        StockCache.get_or_load('AAA', loader)
+    assert loader.calls == 0
@@ -0,0 +1,52 @@
+#backend/tests/test_stock_service.py
+
+from app.services.stock_service import fetch_stock_data, fetch_stock_quote
+from app.utils.cache import NotFoundCache
+from app.utils.cache_backends import SQLiteBackend
+
+
+def test_fetch_stock_data(app, provider):
+    provider.bars['AAPL'] = provider.make_bars(5)
+
+    data = fetch_stock_data('AAPL')
+    assert data['current_price'] == 104.0
+    assert data['previous_close'] == 103.0
+    assert data['name'] == 'AAPL Inc'
+
+
+def test_unknown_symbol_is_negative_cached(app, provider):
+    assert fetch_stock_data('NOPE') is None
+    assert NotFoundCache.contains('NOPE')
+
+    provider.calls.clear()
+    assert fetch_stock_quote('NOPE') is None
+    assert provider.calls == []  # Answered from the negative cache
+
+
+def test_empty_history_for_listed_symbol_is_not_cached(app, provider):
+    provider.listed.add('MSFT')  # Listed, but the provider returns no bars (rate limit, outage)
+
+    assert fetch_stock_data('MSFT') is None
+    assert fetch_stock_quote('MSFT') is None
+    assert not NotFoundCache.contains('MSFT')
+
+
+def test_provider_error_while_confirming_is_not_cached(app, provider, monkeypatch):
+    def unreachable(symbol):
+        raise ConnectionError('search endpoint down')
+    monkeypatch.setattr(provider, 'symbol_exists', unreachable)
+
+    assert fetch_stock_quote('NOPE') is None
+    assert not NotFoundCache.contains('NOPE')
+
+
+def test_shared_backend_clear_reaches_other_workers(app, tmp_path, monkeypatch):
+    path = str(tmp_path / 'cache.sqlite3')
+    worker = SQLiteBackend(path=path, table='not_found_cache')
+    monkeypatch.setattr(NotFoundCache, '_backend', SQLiteBackend(path=path, table='not_found_cache'))
+
+    worker.set('NEWCO', True, 60)  # Another worker cached the symbol as unknown
+    assert NotFoundCache.contains('NEWCO')
+
+    NotFoundCache.clear('NEWCO')  # This worker's admin added the stock
+    assert worker.get('NEWCO') is None
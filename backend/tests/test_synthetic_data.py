@@ -0,0 +1,73 @@
+#backend/tests/test_synthetic_data.py
+
+from datetime import datetime
+
+import pytest
+import sqlalchemy as sa
+
+from app.models.db import db
+from app.models.sentiment import SentimentData
+from app.services.synthetic_data import generate_dataset
+
+END = datetime(2026, 10, 1)
+SIZES = {'stocks': 12, 'users': 9, 'sentiment_rows': 150, 'recommendation_rows': 40}
+TABLES = ('stocks', 'users', 'user_stocks', 'sentiment_data', 'recommendations')
+
+
+def generate(seed=42):
+    # A small chunk_size exercises the chunked inserts
+    return generate_dataset(db, watchlist_size=3, span_days=30, end=END, seed=seed, chunk_size=16, **SIZES)
+
+
+def table_rows():
+    return {table: db.session.execute(sa.text(f"SELECT * FROM {table} ORDER BY 1, 2")).all() for table in TABLES}
+
+
+def row_counts():
+    return {table: db.session.execute(sa.text(f"SELECT COUNT(*) FROM {table}")).scalar() for table in TABLES}
+
+
+def empty_tables():
+    for table in reversed(TABLES):
+        db.session.execute(sa.text(f"DELETE FROM {table}"))
+    db.session.commit()
+
+
+def test_generates_the_requested_rows_with_intact_foreign_keys(app):
+    with app.app_context():
+        counts = generate()
+
+        assert counts == {'stocks': 12, 'users': 9, 'watchlists': row_counts()['user_stocks'],
+                          'sentiment': 150, 'recommendations': 40}
+        assert row_counts() == {'stocks': 12, 'users': 9, 'user_stocks': counts['watchlists'],
+                                'sentiment_data': 150, 'recommendations': 40}
+        assert counts['watchlists'] > 0
+        assert db.session.execute(sa.text('PRAGMA foreign_key_check')).all() == []
+        assert db.session.execute(sa.text(
+            'SELECT COUNT(*) FROM sentiment_data s JOIN stocks t ON t.id = s.stock_id AND t.symbol = s.stock_symbol'
+        )).scalar() == 150
+        assert db.session.query(sa.func.max(SentimentData.created_at)).scalar() <= END
+
+
+def test_rerun_refuses_and_leaves_the_data_alone(app):
+    with app.app_context():
+        generate()
+        before = row_counts()
+
+        with pytest.raises(ValueError):
+            generate()
+        assert row_counts() == before
+
+
+def test_same_seed_produces_the_same_rows(app):
+    with app.app_context():
+        generate(seed=7)
+        first = table_rows()
+
+        empty_tables()
+        generate(seed=7)
+        assert table_rows() == first
+
+        empty_tables()
+        generate(seed=8)
+        assert table_rows()['sentiment_data'] != first['sentiment_data']
@@ -0,0 +1,87 @@
+#backend/tests/test_top_streaming.py
+
+import json
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.db import db
+from app.models.recommendation_snapshot import RecommendationSnapshot
+from app.services import recommendation_service
+from app.services.recommendation_service import refresh_recommendation_snapshot
+from tests.helpers import make_user, make_stocks, make_sentiment
+
+
+@pytest.fixture
+def universe(app, provider):
+    with app.app_context():
+        for symbol, scores in (('AAA', [0.5, 0.5, 0.6, 0.6]), ('BBB', [-0.5, -0.5, -0.6, -0.6])):
+            provider.bars[symbol] = provider.make_bars(25)
+            stock_id, = make_stocks(symbol)
+            make_sentiment(symbol, stock_id, scores)
+        refresh_recommendation_snapshot()
+        _, admin = make_user('admin', 'admin')
+        _, user = make_user('reader', 'user')
+    provider.calls.clear()
+    return admin, user
+
+
+def events(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_stream_replays_the_snapshot_without_evaluating(client, provider, universe):
+    _, user = universe
+    response = client.get('/api/recommendations/top?stream=ndjson', headers=user)
+
+    assert response.status_code == 200
+    streamed = events(response)
+    assert [event['event'] for event in streamed] == ['recommendation', 'recommendation', 'ranking']
+    assert streamed[-1]['data']['snapshot']['refreshed'] is False
+    assert [row['symbol'] for row in streamed[-1]['data']['ranking']] == ['AAA', 'BBB']
+    assert provider.calls == []
+
+
+def test_live_stream_requires_admin(client, provider, universe):
+    admin, user = universe
+
+    assert client.get('/api/recommendations/top?stream=ndjson&refresh=true', headers=user).status_code == 403
+    assert provider.calls == []
+
+    response = client.get('/api/recommendations/top?stream=ndjson&refresh=true', headers=admin)
+    assert response.status_code == 200
+    assert events(response)[-1]['data']['coverage']['completed'] == 2
+
+
+def latest_computed_at(app):
+    with app.app_context():
+        return db.session.query(db.func.max(RecommendationSnapshot.computed_at)).scalar()
+
+
+def test_stale_snapshot_is_served_while_it_is_recomputed(app, client, provider, universe, monkeypatch):
+    _, user = universe
+    monkeypatch.setitem(recommendation_service._snapshot_refresh, 'attempted_at', None)
+    app.config['RECOMMENDATION_SNAPSHOT_MAX_AGE'] = 60
+    with app.app_context():
+        RecommendationSnapshot.query.update({'computed_at': datetime.utcnow() - timedelta(hours=2)})
+        db.session.commit()
+    stale_at = latest_computed_at(app)
+
+    snapshot = client.get('/api/recommendations/top', headers=user).get_json()['snapshot']
+    assert (snapshot['stale'], snapshot['refreshing']) == (True, True)
+
+    deadline = time.monotonic() + 5
+    while latest_computed_at(app) == stale_at and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert latest_computed_at(app) > stale_at
+
+    snapshot = client.get('/api/recommendations/top', headers=user).get_json()['snapshot']
+    assert (snapshot['stale'], snapshot['refreshing']) == (False, False)
+
+
+def test_fresh_snapshot_does_not_refresh(client, universe):
+    _, user = universe
+    snapshot = client.get('/api/recommendations/top', headers=user).get_json()['snapshot']
+
+    assert (snapshot['stale'], snapshot['refreshing']) == (False, False)
@@ -0,0 +1,12 @@
+#backend/wsgi.py
+
+"""
+WSGI entry point: gunicorn wsgi:app
+
+The schema is not created here; run `python manage.py db upgrade` (or set
+DB_AUTO_CREATE=true) before starting workers.
+"""
+
+from app.factory import create_app
+
+app = create_app()